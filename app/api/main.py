@@ -6,12 +6,21 @@ from fastapi.middleware.gzip import GZipMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 import uvicorn
 from typing import Dict
+import asyncio
 import logging
+import os
 from datetime import datetime
 
 # Import routers
 from app.api.routes import documents, processing
 from app.api.websocket import processing_manager
+from app.core.document.store import document_store
+from app.core.document.extractors.registry import extractor_registry
+from app.core.executors import executor_pools
+from app.core.document.transfer import shared_result_stats
+from app.core.admission import admission_controller
+from app.core.job_queue import job_queue, consumer_id
+from app.api.routes.documents import resume_queued_batches
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -54,13 +63,24 @@ processing_ws_manager = processing_manager.ProcessingWebSocketManager()
 async def startup_event():
     """Initialize services on startup."""
     logger.info("Starting Library of Alexandria API")
-    # Initialize any required services here
+    # One thread and one process pool for the whole app; run_in_executor(None, ...) uses the thread pool
+    executor_pools.start()
+    asyncio.get_running_loop().set_default_executor(executor_pools.thread)
+    # Extractors load on first use; list document types to load them up front
+    preload = [t.strip() for t in os.getenv("EXTRACTOR_PRELOAD", "").split(",") if t.strip()]
+    if preload:
+        extractor_registry.preload(preload)
+    # Batches interrupted by a crash or restart continue where they stopped
+    await resume_queued_batches()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down Library of Alexandria API")
-    # Cleanup any resources here
+    document_store.close()
+    # Hand unfinished files back to the queue for the next start
+    job_queue.release(consumer_id)
+    executor_pools.shutdown()
 
 @app.get("/api/health")
 async def health_check() -> Dict:
@@ -68,7 +88,11 @@ async def health_check() -> Dict:
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "version": app.version
+        "version": app.version,
+        "extractors": extractor_registry.import_report(),
+        "executors": executor_pools.stats(),
+        "shared_results": shared_result_stats(),
+        "admission": admission_controller.stats()
     }
 
 if __name__ == "__main__":
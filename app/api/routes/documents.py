@@ -1,33 +1,132 @@
 """Routes for document upload and processing."""
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from typing import List, Dict, Any
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, BackgroundTasks, Query
+from typing import List, Dict, Any, Optional
+from pathlib import Path
+import asyncio
+import logging
+import math
 import uuid
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 from datetime import datetime
 
-from app.core.document_processor import DocumentProcessor
+from app.core.document_processor import DocumentProcessor, assemble_document
+from app.core.document.store import document_store
+from app.core.document.profiles import PROFILES, DEFAULT_PROFILE
+from app.core.document.budget import ExtractionBudget
+from app.core.document.archives import ArchiveReader, ARCHIVE_FORMATS, archive_format
+from app.core.admission import admission_controller, AdmissionRejected, BatchAdmission
+from app.core.job_queue import job_queue, consumer_id, run_queued_batch, API_CONSUMES_JOBS, BATCH_COMPLETED
 from app.api.websocket.processing_manager import manager
-from app.utils.file_utils import save_upload_file_temporarily
+from app.utils.file_utils import save_upload_file_temporarily, cleanup_temp_files
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+def _validate_options(profile: str, max_seconds: Optional[float], max_pages: Optional[int]) -> ExtractionBudget:
+    """Check the profile and budget form fields, returning the budget."""
+    if profile not in PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown profile '{profile}'; expected one of {', '.join(PROFILES)}"
+        )
+    if (max_seconds is not None and max_seconds <= 0) or (max_pages is not None and max_pages <= 0):
+        raise HTTPException(status_code=400, detail="Budget limits must be positive")
+    return ExtractionBudget(max_seconds=max_seconds, max_pages=max_pages)
+
+def _admit(batch_id: str, files: int, tenant: Optional[str]) -> BatchAdmission:
+    """Admit a batch to the shared extraction queue, or answer 429 when it is full."""
+    try:
+        return admission_controller.admit(batch_id, files, tenant)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+async def _admit_to_workers(files: int) -> int:
+    """Check the workers' backlog in the job queue; returns the files ahead of a new batch.
+
+    Answers 429 when more than ``ADMISSION_MAX_QUEUED`` files would be
+    waiting, with a ``Retry-After`` from the workers' recent finish rate.
+    """
+    backlog = await asyncio.get_running_loop().run_in_executor(None, job_queue.backlog)
+    waiting = backlog["pending"]
+    if waiting + files > admission_controller.max_queued:
+        rate = backlog["files_per_second"]
+        retry_after = math.ceil(waiting / rate) if rate else int(job_queue.lease_seconds)
+        raise HTTPException(
+            status_code=429,
+            detail=f"Extraction queue is full ({waiting} files waiting); retry in {retry_after} s",
+            headers={"Retry-After": str(retry_after)}
+        )
+    return waiting + backlog["leased"]
+
 @router.post("/upload")
 async def upload_documents(
     files: List[UploadFile] = File(...),
+    profile: str = Form(DEFAULT_PROFILE),
+    max_seconds: Optional[float] = Form(None),
+    max_pages: Optional[int] = Form(None),
+    tenant: Optional[str] = Header(None, alias="X-Tenant-ID"),
     background_tasks: BackgroundTasks = None
 ) -> Dict[str, Any]:
-    """Upload and process multiple documents."""
+    """Upload and process multiple documents.
+    
+    ``profile`` selects the extraction stages: ``fast`` (text only),
+    ``standard`` or ``full``. ``max_seconds`` and ``max_pages`` override the
+    per-document extraction budget; documents that exceed it are returned
+    as partial results.
+
+    Files are extracted through the process-wide queue, shared fairly
+    between tenants (``X-Tenant-ID``) and batches. ``queue_position`` is
+    the number of files waiting ahead of this batch; when the queue is full
+    the upload is refused with 429 and a ``Retry-After`` header. The batch
+    is recorded in the durable job queue, so it survives a restart. With
+    ``JOB_CONSUMERS=workers`` it is left there for ``app.worker`` processes
+    and its status is relayed from the queue.
+    """
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
+    budget = _validate_options(profile, max_seconds, max_pages)
     
     batch_id = str(uuid.uuid4())
-    processor = DocumentProcessor()
+    if API_CONSUMES_JOBS:
+        admission = _admit(batch_id, len(files), tenant)
+        queue_position = admission.position
+    else:
+        admission = None
+        queue_position = await _admit_to_workers(len(files))
+    options = {"profile": profile, "max_seconds": max_seconds, "max_pages": max_pages}
     
-    # Save files temporarily
+    # Keep a stored copy of each file for later page access; the durable
+    # job queue references the stored copies, so a restart resumes the batch
     temp_paths = []
-    for file in files:
-        temp_path = await save_upload_file_temporarily(file)
-        temp_paths.append(temp_path)
+    documents = []
+    try:
+        for file in files:
+            temp_path = await save_upload_file_temporarily(file)
+            temp_paths.append(temp_path)
+            documents.append({
+                "filename": file.filename,
+                "document_id": await document_store.add(temp_path, file.filename)
+            })
+        jobs = [
+            {"file_path": document_store.path_for(document["document_id"]).resolve(), **document}
+            for document in documents
+        ]
+        await asyncio.get_running_loop().run_in_executor(
+            None, job_queue.enqueue_batch, batch_id, jobs, options, tenant
+        )
+    except Exception:
+        if admission is not None:
+            admission.close()
+        raise
+    finally:
+        await cleanup_temp_files(temp_paths)
     
     # Initialize processing status
     status = {
@@ -36,22 +135,276 @@ async def upload_documents(
         "processed_files": 0,
         "success_count": 0,
         "error_count": 0,
+        "partial_count": 0,
+        "queue_position": queue_position,
         "start_time": datetime.utcnow().isoformat()
     }
     await manager.broadcast_status(batch_id, status)
     
-    # Start processing in background
-    background_tasks.add_task(
-        processor.process_batch,
-        temp_paths,
-        batch_id,
-        manager.broadcast_status
-    )
+    # Start processing in background, or follow the workers' progress
+    if admission is not None:
+        background_tasks.add_task(_run_queued_batch, batch_id, options, admission)
+    else:
+        background_tasks.add_task(_relay_queued_batch, batch_id)
     
     return {
         "batch_id": batch_id,
         "message": "Processing started",
-        "total_files": len(files)
+        "total_files": len(files),
+        "profile": profile,
+        "queue_position": queue_position,
+        "documents": documents
+    }
+
+async def _run_queued_batch(batch_id: str, options: Dict[str, Any], admission: BatchAdmission):
+    """Process the files of a queued batch that are not finished yet."""
+    processor = DocumentProcessor()
+
+    async def report_progress(batch_status):
+        await manager.broadcast_status(batch_id, batch_status.to_dict())
+
+    try:
+        await run_queued_batch(
+            job_queue,
+            batch_id,
+            consumer_id,
+            processor.process_batch,
+            assemble=assemble_document,
+            progress_callback=report_progress,
+            profile=options["profile"],
+            budget=ExtractionBudget(max_seconds=options["max_seconds"], max_pages=options["max_pages"]),
+            admission=admission
+        )
+    except Exception as e:
+        logger.error(f"Error processing batch {batch_id}: {str(e)}")
+
+async def _relay_queued_batch(batch_id: str, interval: float = 1.0):
+    """Broadcast a batch's status from the job queue until the workers finish it."""
+    loop = asyncio.get_running_loop()
+    while True:
+        status = await loop.run_in_executor(None, job_queue.batch_status, batch_id)
+        if status is None:
+            return
+        await manager.broadcast_status(batch_id, status)
+        if status["status"] == BATCH_COMPLETED:
+            return
+        await asyncio.sleep(interval)
+
+# Resumed batches, kept referenced until they finish
+_resumed_batches = set()
+
+async def resume_queued_batches() -> int:
+    """Restart every batch left unfinished in the job queue, e.g. by a crash.
+
+    Files that completed before the restart are not processed again.
+    Returns the number of batches resumed; none when workers consume the
+    queue instead.
+    """
+    if not API_CONSUMES_JOBS:
+        return 0
+    batches = await asyncio.get_running_loop().run_in_executor(None, job_queue.unfinished_batches)
+    resumed = 0
+    for batch in batches:
+        try:
+            admission = admission_controller.admit(batch["batch_id"], 0, batch["tenant"])
+        except AdmissionRejected as e:
+            logger.warning(f"Not resuming batch {batch['batch_id']}: {str(e)}")
+            continue
+        task = asyncio.create_task(_run_queued_batch(batch["batch_id"], batch["options"], admission))
+        _resumed_batches.add(task)
+        task.add_done_callback(_resumed_batches.discard)
+        resumed += 1
+    if resumed:
+        logger.info(f"Resumed {resumed} unfinished batches from the job queue")
+    return resumed
+
+@router.post("/upload-archive")
+async def upload_archive(
+    archive: UploadFile = File(...),
+    profile: str = Form(DEFAULT_PROFILE),
+    max_seconds: Optional[float] = Form(None),
+    max_pages: Optional[int] = Form(None),
+    tenant: Optional[str] = Header(None, alias="X-Tenant-ID"),
+    background_tasks: BackgroundTasks = None
+) -> Dict[str, Any]:
+    """Upload a ZIP, TAR or WARC archive and process its members as they are read.
+
+    Members are unpacked one at a time and handed to ``process_batch``;
+    each one's temporary file is deleted once it has been processed.
+    Besides the usual batch status, the websocket receives a ``member``
+    event when a member is extracted, skipped, processed or fails.
+    Members go through the same shared queue as direct uploads. The batch
+    is admitted with its member count, listed from a ZIP's central
+    directory and estimated from the size of other archives, and never
+    more than the queue holds; ``estimated_files`` reports it.
+    """
+    format_name = archive_format(archive.filename or "")
+    if format_name is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported archive; expected one of {', '.join(ARCHIVE_FORMATS)}"
+        )
+    budget = _validate_options(profile, max_seconds, max_pages)
+
+    batch_id = str(uuid.uuid4())
+    processor = DocumentProcessor()
+    reader = ArchiveReader(
+        archive.file, format_name, accept=lambda name: processor.supports(Path(name))
+    )
+    try:
+        estimated_files = await asyncio.get_running_loop().run_in_executor(None, reader.estimate_members)
+        # Members are read as slots free up, so a batch larger than the queue still drains
+        admission = _admit(batch_id, min(estimated_files, admission_controller.max_queued), tenant)
+    except Exception:
+        reader.close()
+        raise
+
+    await manager.broadcast_status(batch_id, {
+        "status": "initializing",
+        "archive": archive.filename,
+        "total_files": 0,
+        "estimated_files": estimated_files,
+        "processed_files": 0,
+        "queue_position": admission.position,
+        "start_time": datetime.utcnow().isoformat()
+    })
+    background_tasks.add_task(_ingest_archive, processor, reader, batch_id, profile, budget, admission)
+
+    return {
+        "batch_id": batch_id,
+        "message": "Processing started",
+        "archive": archive.filename,
+        "format": format_name,
+        "profile": profile,
+        "estimated_files": estimated_files,
+        "queue_position": admission.position
+    }
+
+async def _ingest_archive(
+    processor: DocumentProcessor,
+    reader: ArchiveReader,
+    batch_id: str,
+    profile: str,
+    budget: ExtractionBudget,
+    admission: BatchAdmission
+):
+    """Feed archive members into ``process_batch``, reporting each over the websocket."""
+    document_ids: Dict[Path, str] = {}
+
+    async def report_progress(batch_status):
+        await manager.broadcast_status(batch_id, batch_status.to_dict())
+
+    async def report_skipped(skipped: Dict[str, str]):
+        await manager.broadcast_event(batch_id, {"type": "member", "state": "skipped", **skipped})
+
+    async def members():
+        async for member in reader.members(report_skipped):
+            # Keep a stored copy for later page access, as for direct uploads
+            document_ids[member.path] = await document_store.add(member.path, member.path.name)
+            await manager.broadcast_event(batch_id, {
+                "type": "member",
+                "state": "extracted",
+                "name": member.name,
+                "size": member.size,
+                "document_id": document_ids[member.path]
+            })
+            yield member.path
+
+    async def member_done(file_path: Path, result: Optional[Dict], error: Optional[Exception]):
+        member = reader.member_for(file_path)
+        if error is not None:
+            state = "failed"
+        else:
+            state = "partial" if result and result.get("partial") else "processed"
+        event = {
+            "type": "member",
+            "state": state,
+            "name": member.name if member else file_path.name,
+            "document_id": document_ids.pop(file_path, None)
+        }
+        if error is not None:
+            event["error"] = str(error)
+        reader.release(file_path)
+        await manager.broadcast_event(batch_id, event)
+
+    try:
+        await processor.process_batch(
+            members(),
+            batch_id,
+            report_progress,
+            profile=profile,
+            budget=budget,
+            done_callback=member_done,
+            admission=admission
+        )
+    except Exception as e:
+        logger.error(f"Error ingesting archive for batch {batch_id}: {str(e)}")
+    finally:
+        reader.close()
+
+    status = processor.get_batch_status(batch_id).to_dict()
+    status["skipped_count"] = len(reader.skipped)
+    await manager.broadcast_status(batch_id, status)
+
+@asynccontextmanager
+async def _stored_pdf(document_id: str):
+    """Check out a stored PDF, opened off the event loop, or raise the matching HTTP error."""
+    loop = asyncio.get_running_loop()
+    try:
+        document = await loop.run_in_executor(None, document_store.open_pdf, document_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Document not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        yield document
+    finally:
+        document_store.release(document)
+
+@router.get("/{document_id}/pages/{page_number}")
+async def get_document_page(document_id: str, page_number: int) -> Dict[str, Any]:
+    """Get the text and layout blocks of a single page of a stored PDF."""
+    async with _stored_pdf(document_id) as document:
+        if not 1 <= page_number <= document.page_count:
+            raise HTTPException(status_code=404, detail="Page not found")
+        # Decoding a page parses its content stream; keep it off the event loop
+        return await asyncio.get_running_loop().run_in_executor(
+            None, document.get_page, page_number - 1
+        )
+
+@router.get("/{document_id}/pages")
+async def get_document_pages(
+    document_id: str,
+    start: int = Query(1, ge=1),
+    end: int = Query(None, ge=1)
+) -> Dict[str, Any]:
+    """Get an inclusive range of pages of a stored PDF."""
+    if end is not None and end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    async with _stored_pdf(document_id) as document:
+        if start > document.page_count:
+            raise HTTPException(status_code=404, detail="Page not found")
+        end = min(end or start, document.page_count)
+        pages = await asyncio.get_running_loop().run_in_executor(
+            None, document.get_pages, start - 1, end
+        )
+        return {
+            "document_id": document_id,
+            "total_pages": document.page_count,
+            "pages": pages
+        }
+
+@router.get("/queue")
+async def get_queue_status() -> Dict[str, Any]:
+    """Get the load of the shared extraction queue."""
+    return admission_controller.stats()
+
+@router.get("/profiles")
+async def get_extraction_profiles() -> Dict[str, Any]:
+    """Get the available extraction profiles and their stages."""
+    return {
+        "default": DEFAULT_PROFILE,
+        "profiles": {name: asdict(profile) for name, profile in PROFILES.items()}
     }
 
 @router.get("/types")
@@ -64,5 +417,6 @@ async def get_supported_types() -> Dict[str, List[str]]:
             "md",
             "txt",
             "html"
-        ]
+        ],
+        "archive_types": [suffix.lstrip(".") for suffix in ARCHIVE_FORMATS]
     } 
\ No newline at end of file
@@ -2,7 +2,9 @@
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 from app.api.websocket.processing_manager import manager
-from typing import Dict, Any
+from app.core.job_queue import job_queue
+from typing import Dict, Any, List
+import asyncio
 import uuid
 
 router = APIRouter(prefix="/processing", tags=["processing"])
@@ -24,8 +26,25 @@ async def websocket_endpoint(websocket: WebSocket, batch_id: str):
 
 @router.get("/status/{batch_id}")
 async def get_processing_status(batch_id: str) -> Dict[str, Any]:
-    """Get the current status of a processing batch."""
-    return manager.get_status(batch_id)
+    """Get the current status of a processing batch.
+
+    Batches without live status, e.g. after a restart, are reported from
+    the durable job queue.
+    """
+    status = manager.get_status(batch_id)
+    if status["status"] == "not_found":
+        queued = await asyncio.get_running_loop().run_in_executor(None, job_queue.batch_status, batch_id)
+        if queued is not None:
+            return queued
+    return status
+
+@router.get("/results/{batch_id}")
+async def get_processing_results(batch_id: str) -> List[Dict[str, Any]]:
+    """Get the state and stored result of every file of a queued batch."""
+    results = await asyncio.get_running_loop().run_in_executor(None, job_queue.batch_results, batch_id)
+    if not results:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return results
 
 @router.post("/cancel/{batch_id}")
 async def cancel_processing(batch_id: str):
@@ -43,6 +43,22 @@ class ProcessingManager:
         for dead in dead_connections:
             self.active_connections[batch_id].remove(dead)
 
+    async def broadcast_event(self, batch_id: str, event: dict):
+        """Send a one-off event (e.g. per archive member) without replacing the batch status."""
+        if batch_id not in self.active_connections:
+            return
+
+        event["timestamp"] = datetime.utcnow().isoformat()
+        dead_connections = set()
+        for connection in self.active_connections[batch_id]:
+            try:
+                await connection.send_json(event)
+            except:
+                dead_connections.add(connection)
+
+        for dead in dead_connections:
+            self.active_connections[batch_id].remove(dead)
+
     def get_status(self, batch_id: str) -> dict:
         """Get the current processing status for a batch."""
         return self.processing_statuses.get(batch_id, {
@@ -0,0 +1,186 @@
+"""Process-wide admission control for document extraction.
+
+Every upload's batch is admitted here before it is accepted and then takes
+a global slot for each file it extracts, so concurrent uploads share one
+bounded pool of extraction slots instead of each running ``max_workers``
+files of its own. Free slots go round-robin across tenants and, within a
+tenant, across that tenant's batches, so a large batch cannot hold back a
+small one submitted after it. When more files are waiting than the queue
+allows, new batches are rejected with an estimate of when to retry.
+"""
+
+from typing import Dict, Any, Optional, Deque, AsyncIterator
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import math
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+
+def default_max_active() -> int:
+    """ADMISSION_MAX_ACTIVE, or one extraction per core plus one."""
+    size = os.getenv("ADMISSION_MAX_ACTIVE")
+    return int(size) if size else (os.cpu_count() or 1) + 1
+
+def default_max_queued() -> int:
+    """ADMISSION_MAX_QUEUED, or 1000 files waiting across all batches."""
+    size = os.getenv("ADMISSION_MAX_QUEUED")
+    return int(size) if size else 1000
+
+class AdmissionRejected(Exception):
+    """The queue is full; ``retry_after`` is a rough wait in seconds."""
+
+    def __init__(self, retry_after: int, queued: int):
+        super().__init__(f"Extraction queue is full ({queued} files waiting); retry in {retry_after} s")
+        self.retry_after = retry_after
+        self.queued = queued
+
+class BatchAdmission:
+    """One admitted batch; its files take global slots through ``slot()``."""
+
+    def __init__(self, controller: "AdmissionController", tenant: str, batch_id: str, reserved: int):
+        self.controller = controller
+        self.tenant = tenant
+        self.batch_id = batch_id
+        self.reserved = reserved  # files counted as queued but not started yet
+        self.position = 0  # files queued ahead of this batch when it was admitted
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one global extraction slot for the duration of a file."""
+        await self.controller._acquire(self)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.controller._release(time.monotonic() - started)
+
+    def close(self):
+        """Return reservations for files that never started, e.g. after an error."""
+        self.controller._unreserve(self, self.reserved)
+
+class AdmissionController:
+    """Bounded, fair queue of file extractions shared by every batch.
+
+    ``max_active`` files are extracted at once across the process and at
+    most ``max_queued`` more may wait. Waiting counts files reserved by
+    admitted batches as well as files blocked on a slot, so a batch is
+    either admitted as a whole or rejected before its files are stored.
+    """
+
+    def __init__(self, max_active: Optional[int] = None, max_queued: Optional[int] = None):
+        self.max_active = max_active or default_max_active()
+        self.max_queued = max_queued or default_max_queued()
+        self._active = 0
+        self._queued = 0
+        # tenant -> batch id -> waiting slot requests, both in round-robin order
+        self._waiters: "OrderedDict[str, OrderedDict[str, Deque[asyncio.Future]]]" = OrderedDict()
+        self._mean_file_seconds = 1.0
+        self._completed = 0
+        self._rejected = 0
+
+    def admit(self, batch_id: str, files: int = 0, tenant: Optional[str] = None) -> BatchAdmission:
+        """Admit a batch of ``files`` files or raise ``AdmissionRejected``.
+
+        Batches that stream their files (archives) are admitted with their
+        expected file count; files beyond it count as queued while they
+        wait for a slot, and ``close()`` returns reservations left unused.
+        """
+        if self._queued + max(files, 1) > self.max_queued:
+            self._rejected += 1
+            raise AdmissionRejected(self.retry_after(), self._queued)
+        admission = BatchAdmission(self, tenant or DEFAULT_TENANT, batch_id, files)
+        admission.position = self._queued
+        self._queued += files
+        return admission
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is likely to have drained."""
+        backlog = self._queued + self._active
+        return max(1, math.ceil(backlog / self.max_active * self._mean_file_seconds))
+
+    async def _acquire(self, admission: BatchAdmission):
+        if admission.reserved > 0:
+            admission.reserved -= 1
+        else:
+            self._queued += 1
+        if self._active < self.max_active and not self._waiters:
+            self._queued -= 1
+            self._active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        batches = self._waiters.setdefault(admission.tenant, OrderedDict())
+        batches.setdefault(admission.batch_id, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted as we were cancelled; hand it on
+                self._release(None)
+            else:
+                self._discard(admission, waiter)
+                self._queued -= 1
+            raise
+
+    def _discard(self, admission: BatchAdmission, waiter: asyncio.Future):
+        batches = self._waiters.get(admission.tenant)
+        queue = batches.get(admission.batch_id) if batches else None
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        if not queue:
+            del batches[admission.batch_id]
+        if not batches:
+            del self._waiters[admission.tenant]
+
+    def _release(self, elapsed: Optional[float]):
+        self._active -= 1
+        if elapsed is not None:
+            self._completed += 1
+            # Smoothed so the retry estimate follows the current workload
+            self._mean_file_seconds += 0.1 * (elapsed - self._mean_file_seconds)
+        self._grant()
+
+    def _grant(self):
+        """Hand free slots round-robin: next tenant, then that tenant's next batch."""
+        while self._active < self.max_active and self._waiters:
+            tenant, batches = self._waiters.popitem(last=False)
+            batch_id, queue = batches.popitem(last=False)
+            waiter = queue.popleft()
+            if queue:
+                batches[batch_id] = queue
+            if batches:
+                self._waiters[tenant] = batches
+            if waiter.cancelled():
+                # Its task is unwinding and drops the queued count itself
+                continue
+            self._queued -= 1
+            self._active += 1
+            waiter.set_result(None)
+
+    def _unreserve(self, admission: BatchAdmission, files: int):
+        self._queued -= files
+        admission.reserved -= files
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load of the shared queue."""
+        return {
+            "max_active": self.max_active,
+            "max_queued": self.max_queued,
+            "active": self._active,
+            "queued": self._queued,
+            "waiting_batches": sum(len(batches) for batches in self._waiters.values()),
+            "tenants_waiting": len(self._waiters),
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "mean_file_seconds": round(self._mean_file_seconds, 3),
+            "retry_after_seconds": self.retry_after() if self._queued else 0
+        }
+
+# Global admission controller instance
+admission_controller = AdmissionController()
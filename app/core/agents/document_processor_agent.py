@@ -51,7 +51,8 @@ class DocumentProcessorAgent(BaseAgent):
             # Process the document
             result = await self.processor.process_single_file(file_path, batch_id)
             
-            if result["success"]:
+            # Near-duplicates skipped by the dedup stage are not extracted again
+            if result["success"] and not result.get("skipped"):
                 # Extract knowledge and create entities
                 await self.extract_and_store_knowledge(result)
                 
@@ -64,6 +65,8 @@ class DocumentProcessorAgent(BaseAgent):
                     "success": result["success"],
                     "file_path": str(file_path),
                     "processing_time": result.get("processing_time"),
+                    "content_sha256": result.get("content_sha256"),
+                    "duplicate_of": result.get("duplicate_of"),
                     "error": result.get("error")
                 },
                 msg_type="document_processed",
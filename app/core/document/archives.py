@@ -0,0 +1,343 @@
+"""Streaming extraction of ZIP, TAR and WARC archive members."""
+
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, BinaryIO, Iterator, AsyncIterator, Callable, Tuple
+from dataclasses import dataclass
+from urllib.parse import urlsplit, unquote
+import asyncio
+import gzip
+import logging
+import shutil
+import tarfile
+import tempfile
+import zipfile
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Longest suffixes first so ".tar.gz" wins over ".gz"
+ARCHIVE_FORMATS = {
+    ".warc.gz": "warc.gz",
+    ".tar.gz": "tar",
+    ".tar.bz2": "tar",
+    ".tar.xz": "tar",
+    ".warc": "warc",
+    ".zip": "zip",
+    ".tar": "tar",
+    ".tgz": "tar",
+}
+
+# File suffixes for WARC payloads by served content type
+WARC_CONTENT_SUFFIXES = {
+    "text/html": ".html",
+    "application/xhtml+xml": ".html",
+    "application/pdf": ".pdf",
+    "text/plain": ".txt",
+    "text/markdown": ".md",
+}
+
+READ_SIZE = 64 * 1024
+
+# Archive bytes per member when the members cannot be listed without reading them
+ESTIMATED_MEMBER_BYTES = 256 * 1024
+
+def archive_format(filename: str) -> Optional[str]:
+    """Get the archive format for a file name, or None if it is not an archive."""
+    name = filename.lower()
+    for suffix, format_name in ARCHIVE_FORMATS.items():
+        if name.endswith(suffix):
+            return format_name
+    return None
+
+@dataclass
+class ArchiveMember:
+    """A member written to its own temporary file."""
+    name: str  # path inside the archive, or target URI for WARC records
+    path: Path
+    size: int
+
+class MemberTooLarge(Exception):
+    """Raised when a member expands past the size limit."""
+    pass
+
+class _LimitedReader:
+    """Reads at most ``length`` bytes of an underlying stream."""
+
+    def __init__(self, stream: BinaryIO, length: int):
+        self.stream = stream
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.stream.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def readline(self) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        line = self.stream.readline(self.remaining)
+        self.remaining -= len(line)
+        return line
+
+    def skip(self):
+        while self.read(READ_SIZE):
+            pass
+
+def _read_headers(stream) -> Dict[str, str]:
+    """Read ``Name: value`` lines up to a blank line; names are lowercased."""
+    headers = {}
+    while True:
+        line = stream.readline()
+        if not line.strip():
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+def _iter_chunked(stream) -> Iterator[bytes]:
+    """Decode an HTTP chunked transfer-encoded body."""
+    while True:
+        size_line = stream.readline()
+        if not size_line:
+            return
+        size = int(size_line.split(b";")[0].strip() or b"0", 16)
+        if size == 0:
+            return
+        remaining = size
+        while remaining:
+            data = stream.read(min(remaining, READ_SIZE))
+            if not data:
+                return
+            remaining -= len(data)
+            yield data
+        stream.readline()  # CRLF after each chunk
+
+def _iter_decoded(chunks: Iterator[bytes], encoding: str) -> Iterator[bytes]:
+    """Undo a gzip or deflate Content-Encoding."""
+    if encoding not in ("gzip", "x-gzip", "deflate"):
+        yield from chunks
+        return
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)  # auto-detect gzip or zlib header
+    for data in chunks:
+        yield decompressor.decompress(data)
+    yield decompressor.flush()
+
+def _read_chunks(stream) -> Iterator[bytes]:
+    return iter(lambda: stream.read(READ_SIZE), b"")
+
+class ArchiveReader:
+    """Reads archive members one at a time into temporary files.
+
+    The archive itself is read as a stream: TAR and WARC members are taken
+    in order and ZIP members through the central directory, so only the
+    members handed out and not yet released are ever on disk. Members whose
+    names ``accept`` rejects, directories, links and members over
+    ``max_member_size`` are skipped and listed in ``skipped``.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        format_name: str,
+        accept: Callable[[str], bool],
+        max_member_size: int = 256 * 1024 * 1024,
+        max_members: int = 100_000
+    ):
+        if format_name not in set(ARCHIVE_FORMATS.values()):
+            raise ValueError(f"Unsupported archive format: {format_name}")
+        self.fileobj = fileobj
+        self.format_name = format_name
+        self.accept = accept
+        self.max_member_size = max_member_size
+        self.max_members = max_members
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="archive_"))
+        self.member_count = 0
+        self.skipped: List[Dict[str, str]] = []
+        self._members: Dict[Path, ArchiveMember] = {}
+
+    def estimate_members(self) -> int:
+        """Count the members that will be extracted, without extracting them.
+
+        ZIP members are counted from the central directory, applying the
+        same name, size and count checks as extraction. TAR and WARC
+        archives would have to be read in full to be listed, so their count
+        is estimated as one member per ``ESTIMATED_MEMBER_BYTES`` of archive.
+        Either way the result is at most ``max_members``. Blocks, and
+        leaves the archive at its start.
+        """
+        if self.format_name == "zip":
+            try:
+                with zipfile.ZipFile(self.fileobj) as archive:
+                    count = sum(
+                        1 for info in archive.infolist()
+                        if not info.is_dir()
+                        and not info.flag_bits & 0x1
+                        and info.file_size <= self.max_member_size
+                        and self.accept(PurePosixPath(info.filename).name)
+                    )
+            except zipfile.BadZipFile:
+                count = 0  # reported as unreadable when extracted
+        else:
+            self.fileobj.seek(0, 2)
+            count = -(-self.fileobj.tell() // ESTIMATED_MEMBER_BYTES)
+        self.fileobj.seek(0)
+        return min(count, self.max_members)
+
+    def _iter_entries(self) -> Iterator[Tuple[str, str, Optional[int], Iterator[bytes]]]:
+        """Yield ``(name, file name, declared size, chunks)`` for every regular member."""
+        if self.format_name == "zip":
+            yield from self._iter_zip()
+        elif self.format_name == "tar":
+            yield from self._iter_tar()
+        else:
+            stream = self.fileobj
+            if self.format_name == "warc.gz":
+                # Each record is its own gzip member; GzipFile reads them back to back
+                stream = gzip.GzipFile(fileobj=self.fileobj, mode="rb")
+            yield from self._iter_warc(stream)
+
+    def _iter_zip(self):
+        # The central directory is at the end; uploads are spooled to a seekable file
+        with zipfile.ZipFile(self.fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                if info.flag_bits & 0x1:
+                    self.skipped.append({"name": info.filename, "reason": "encrypted"})
+                    continue
+                with archive.open(info) as member:
+                    filename = PurePosixPath(info.filename).name
+                    yield info.filename, filename, info.file_size, _read_chunks(member)
+
+    def _iter_tar(self):
+        # "r|*" reads members strictly in order and never seeks
+        with tarfile.open(fileobj=self.fileobj, mode="r|*") as archive:
+            for info in archive:
+                if not info.isfile():
+                    continue
+                filename = PurePosixPath(info.name).name
+                yield info.name, filename, info.size, _read_chunks(archive.extractfile(info))
+
+    def _iter_warc(self, stream):
+        while True:
+            line = stream.readline()
+            if not line:
+                return
+            if not line.strip():
+                continue  # blank lines between records
+            if not line.startswith(b"WARC/"):
+                raise ValueError(f"Malformed WARC record header: {line[:40]!r}")
+            headers = _read_headers(stream)
+            body = _LimitedReader(stream, int(headers.get("content-length", "0")))
+            if headers.get("warc-type") in ("response", "resource"):
+                entry = self._warc_payload(headers, body)
+                if entry:
+                    yield entry
+            body.skip()
+
+    def _warc_payload(self, headers: Dict[str, str], body: _LimitedReader):
+        """Get the payload of a response or resource record as an entry."""
+        uri = headers.get("warc-target-uri", "").strip("<>")
+        content_type = headers.get("content-type", "")
+        chunks = _read_chunks(body)
+        if headers["warc-type"] == "response" and content_type.startswith("application/http"):
+            status_line = body.readline()
+            http_headers = _read_headers(body)
+            status = status_line.split()
+            if len(status) < 2 or status[1] != b"200":
+                self.skipped.append({"name": uri, "reason": status_line.decode("latin-1").strip()})
+                return None
+            content_type = http_headers.get("content-type", "")
+            if "chunked" in http_headers.get("transfer-encoding", "").lower():
+                chunks = _iter_chunked(body)
+            else:
+                chunks = _read_chunks(body)
+            chunks = _iter_decoded(chunks, http_headers.get("content-encoding", "").lower())
+
+        # The served content type decides the suffix; URIs often have none or ".php"
+        path = PurePosixPath(unquote(urlsplit(uri).path))
+        suffix = WARC_CONTENT_SUFFIXES.get(content_type.split(";")[0].strip().lower())
+        filename = (path.stem or "index") + suffix if suffix else path.name or "index"
+        return uri, filename, None, chunks
+
+    def _write_member(self, name: str, filename: str, chunks: Iterator[bytes]) -> ArchiveMember:
+        """Write a member to ``<temp_dir>/<n>/<filename>``, enforcing the size limit.
+
+        Only the base name of the member is used, so archive paths such as
+        ``../../etc/passwd`` cannot escape the temporary directory.
+        """
+        directory = self.temp_dir / str(self.member_count)
+        directory.mkdir()
+        path = directory / filename
+        size = 0
+        try:
+            with open(path, "wb") as f:
+                for data in chunks:
+                    size += len(data)
+                    if size > self.max_member_size:
+                        raise MemberTooLarge(name)
+                    f.write(data)
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        return ArchiveMember(name=name, path=path, size=size)
+
+    def _iter_members(self) -> Iterator[ArchiveMember]:
+        for name, filename, size, chunks in self._iter_entries():
+            if not filename or filename in (".", "..") or not self.accept(filename):
+                self.skipped.append({"name": name, "reason": "unsupported type"})
+                continue
+            if size is not None and size > self.max_member_size:
+                self.skipped.append({"name": name, "reason": "too large"})
+                continue
+            if self.member_count >= self.max_members:
+                self.skipped.append({"name": name, "reason": "member limit reached"})
+                continue
+            try:
+                member = self._write_member(name, filename, chunks)
+            except MemberTooLarge:
+                self.skipped.append({"name": name, "reason": "too large"})
+                continue
+            except (OSError, EOFError, zlib.error, zipfile.BadZipFile) as e:
+                self.skipped.append({"name": name, "reason": f"unreadable: {str(e)}"})
+                continue
+            self.member_count += 1
+            yield member
+
+    async def members(self, skip_callback: Optional[Callable] = None) -> AsyncIterator[ArchiveMember]:
+        """Yield members as they are read, without blocking the event loop.
+
+        The next member is only read once the consumer asks for it, so a
+        consumer that waits for a free worker slot throttles extraction.
+        ``skip_callback`` is awaited with each skipped entry.
+        """
+        loop = asyncio.get_running_loop()
+        iterator = self._iter_members()
+        reported = 0
+        while True:
+            member = await loop.run_in_executor(None, next, iterator, None)
+            if skip_callback:
+                for skipped in self.skipped[reported:]:
+                    await skip_callback(skipped)
+            reported = len(self.skipped)
+            if member is None:
+                return
+            self._members[member.path] = member
+            yield member
+
+    def member_for(self, path: Path) -> Optional[ArchiveMember]:
+        return self._members.get(path)
+
+    def release(self, path: Path):
+        """Delete a member's temporary file once it has been processed."""
+        member = self._members.pop(path, None)
+        if member is not None:
+            shutil.rmtree(member.path.parent, ignore_errors=True)
+
+    def close(self):
+        """Delete any remaining member files."""
+        self._members.clear()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
@@ -0,0 +1,117 @@
+"""Per-document time and page budgets for extraction."""
+
+from typing import Dict, Any, Optional, Awaitable, TypeVar
+from dataclasses import dataclass
+import asyncio
+import os
+import time
+
+T = TypeVar('T')
+
+TIME_BUDGET_EXCEEDED = "time_budget_exceeded"
+PAGE_BUDGET_EXCEEDED = "page_budget_exceeded"
+
+def deadline_passed(deadline: Optional[float]) -> bool:
+    """Whether a ``BudgetTracker.deadline()`` has passed; checked by pool work between pages."""
+    return deadline is not None and time.time() >= deadline
+
+class BudgetExceeded(Exception):
+    """Raised when an extraction stage runs out of budget."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+@dataclass(frozen=True)
+class ExtractionBudget:
+    """Limits applied to the extraction of a single document."""
+    max_seconds: Optional[float] = None
+    max_pages: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "ExtractionBudget":
+        """Build the global default budget from EXTRACTION_TIMEOUT and EXTRACTION_MAX_PAGES."""
+        max_seconds = os.getenv("EXTRACTION_TIMEOUT")
+        max_pages = os.getenv("EXTRACTION_MAX_PAGES")
+        return cls(
+            max_seconds=float(max_seconds) if max_seconds else None,
+            max_pages=int(max_pages) if max_pages else None
+        )
+
+    def merge(self, override: Optional["ExtractionBudget"]) -> "ExtractionBudget":
+        """Apply the limits set on ``override`` on top of this budget."""
+        if override is None:
+            return self
+        return ExtractionBudget(
+            max_seconds=override.max_seconds if override.max_seconds is not None else self.max_seconds,
+            max_pages=override.max_pages if override.max_pages is not None else self.max_pages
+        )
+
+    def start(self) -> "BudgetTracker":
+        """Start tracking this budget for one document."""
+        return BudgetTracker(self)
+
+class BudgetTracker:
+    """Tracks elapsed time and pages for one document against its budget.
+
+    Once a limit is hit ``reason`` is set and stays set; extraction stops at
+    the next check and reports the pages completed so far as partial.
+    """
+
+    def __init__(self, budget: ExtractionBudget):
+        self.budget = budget
+        self.started = time.monotonic()
+        self.reason: Optional[str] = None
+
+    @property
+    def partial(self) -> bool:
+        return self.reason is not None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left in the time budget, or None when unlimited."""
+        if self.budget.max_seconds is None:
+            return None
+        return max(0.0, self.budget.max_seconds - (time.monotonic() - self.started))
+
+    def deadline(self) -> Optional[float]:
+        """Wall-clock time at which the time budget runs out, or None when unlimited.
+
+        Pool work gets this instead of the tracker, since it may run in
+        another process, and stops at its next page or table boundary once
+        it has passed.
+        """
+        remaining = self.remaining()
+        return None if remaining is None else time.time() + remaining
+
+    def check(self, pages_done: int = 0) -> Optional[str]:
+        """Check the budget before starting more work; returns the stop reason, if any."""
+        if self.reason is None:
+            if self.budget.max_pages is not None and pages_done >= self.budget.max_pages:
+                self.reason = PAGE_BUDGET_EXCEEDED
+            elif self.remaining() == 0:
+                self.reason = TIME_BUDGET_EXCEEDED
+        return self.reason
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """Await a stage within the remaining time budget.
+
+        On timeout the awaiting side is cancelled immediately, so the caller
+        can release its worker slot. This does not stop work already handed
+        to a pool: it keeps its worker until it returns. PDF page and table
+        work is given ``deadline()`` and returns early at its next page or
+        table group; whole-file stages (Markdown, HTML, text, code) run to
+        completion in the background.
+        """
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining())
+        except asyncio.TimeoutError:
+            self.reason = TIME_BUDGET_EXCEEDED
+            raise BudgetExceeded(self.reason)
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the partial-result markers for extraction output."""
+        return {
+            "partial": self.partial,
+            "partial_reason": self.reason,
+            "elapsed_seconds": round(time.monotonic() - self.started, 3)
+        }
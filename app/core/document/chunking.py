@@ -0,0 +1,246 @@
+"""Retrieval-sized chunking of extracted text, stored as offsets."""
+
+from typing import Dict, List, Any, Optional, Iterator, Tuple, NamedTuple
+from dataclasses import dataclass
+from array import array
+import bisect
+import os
+import re
+
+BOUNDARY_HEADING = "heading"
+BOUNDARY_PARAGRAPH = "paragraph"
+BOUNDARY_SENTENCE = "sentence"
+# Coarsest first; a chunk that cannot end on its rule's boundary falls back to finer ones
+BOUNDARIES = (BOUNDARY_HEADING, BOUNDARY_PARAGRAPH, BOUNDARY_SENTENCE)
+
+PAGE_SEPARATOR = "\n\n"
+
+# Each pattern matches at the offset where a new chunk may start
+_BOUNDARY_PATTERNS = {
+    BOUNDARY_HEADING: re.compile(r"^[ \t]{0,3}#{1,6}[ \t]", re.MULTILINE),
+    # After a blank line, unless the paragraph before it is a heading line
+    BOUNDARY_PARAGRAPH: re.compile(r"^(?![ \t]{0,3}#{1,6}[ \t])[ \t]*\S[^\n]*\n(?:[ \t]*\n)+[ \t]*", re.MULTILINE),
+    BOUNDARY_SENTENCE: re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])"),
+}
+
+@dataclass(frozen=True)
+class ChunkingConfig:
+    """Chunk size and overlap in characters, and the preferred boundary."""
+    max_chars: int = 2000
+    overlap: int = 200
+    min_chars: int = 200  # shortest chunk worth ending early on a boundary
+    boundary: str = BOUNDARY_PARAGRAPH
+
+    def __post_init__(self):
+        if self.boundary not in BOUNDARIES:
+            raise ValueError(f"Chunk boundary must be one of {', '.join(BOUNDARIES)}")
+        if not 0 <= self.overlap < self.max_chars or self.min_chars > self.max_chars:
+            raise ValueError("Chunk overlap and minimum must be smaller than the chunk size")
+
+    @classmethod
+    def from_env(cls) -> "ChunkingConfig":
+        """Build the default config from CHUNK_SIZE, CHUNK_OVERLAP and CHUNK_BOUNDARY."""
+        max_chars = int(os.getenv("CHUNK_SIZE") or 2000)
+        return cls(
+            max_chars=max_chars,
+            overlap=int(os.getenv("CHUNK_OVERLAP") or min(200, max_chars // 10)),
+            min_chars=min(200, max_chars // 10),
+            boundary=os.getenv("CHUNK_BOUNDARY") or BOUNDARY_PARAGRAPH
+        )
+
+class Chunk(NamedTuple):
+    """One chunk as ``[start, end)`` character offsets into its document's text."""
+    doc: int
+    start: int
+    end: int
+    page: Optional[int]  # zero-based page the chunk starts on, if the text has pages
+
+def document_text(content: Dict[str, Any]) -> Tuple[str, Optional[List[int]]]:
+    """Get the single stored text of extractor output and its page start offsets.
+
+    Handles both processors' output: ``text_content`` page lists, ``pages``
+    with their joined ``text``, ``paragraphs``, and the ``text``,
+    ``content`` (Markdown) or ``main_content`` (HTML) strings. Pages and
+    paragraphs are joined with a blank line, as ``DocumentProcessor``
+    does for its ``text``.
+    """
+    if content.get("text_content") is not None:
+        pages = content["text_content"]
+        return PAGE_SEPARATOR.join(pages), _page_starts(pages)
+    if isinstance(content.get("pages"), list):
+        pages = [page.get("text", "") for page in content["pages"]]
+        return content.get("text") or PAGE_SEPARATOR.join(pages), _page_starts(pages)
+    if isinstance(content.get("paragraphs"), list):
+        return PAGE_SEPARATOR.join(content["paragraphs"]), None
+    return content.get("text") or content.get("content") or content.get("main_content") or "", None
+
+def _page_starts(pages: List[str]) -> List[int]:
+    starts, offset = [], 0
+    for page in pages:
+        starts.append(offset)
+        offset += len(page) + len(PAGE_SEPARATOR)
+    return starts
+
+def _boundary_offsets(text: str, boundary: str) -> Dict[str, List[int]]:
+    """Find candidate chunk starts for a rule and every finer one."""
+    levels = BOUNDARIES[BOUNDARIES.index(boundary):]
+    return {
+        level: [match.end() if level != BOUNDARY_HEADING else match.start()
+                for match in _BOUNDARY_PATTERNS[level].finditer(text)]
+        for level in levels
+    }
+
+def chunk_offsets(text: str, config: ChunkingConfig) -> Tuple[array, array]:
+    """Split a text into chunks of at most ``max_chars``, returning start and end arrays.
+
+    Each chunk ends where a new section (``heading``), paragraph or
+    sentence starts, preferring the configured rule and falling back to
+    finer ones, then to whitespace, then to a hard cut. Heading chunks end
+    at the first heading past ``min_chars`` so sections stay apart; the
+    others end at the last boundary that fits. Consecutive chunks share
+    about ``overlap`` characters, starting on a word, except after a
+    heading boundary.
+    """
+    starts, ends = array('Q'), array('Q')
+    breaks = _boundary_offsets(text, config.boundary)
+    length = len(text)
+    position = _skip_space(text, 0, length)
+
+    while position < length:
+        limit = position + config.max_chars
+        level = None
+        if limit >= length:
+            end = length
+        else:
+            end, level = _find_break(text, breaks, position + config.min_chars, limit)
+        chunk_end = _trim_end(text, position, end)
+        if chunk_end > position:
+            starts.append(position)
+            ends.append(chunk_end)
+        if end >= length:
+            break
+
+        next_position = end
+        if config.overlap and level != BOUNDARY_HEADING:
+            # Back up by the overlap, then forward to the start of a word
+            overlap_start = max(end - config.overlap, position + 1)
+            space = _next_space(text, overlap_start, end)
+            next_position = space if space is not None else end
+        position = _skip_space(text, next_position, length)
+    return starts, ends
+
+def _find_break(text: str, breaks: Dict[str, List[int]], low: int, high: int) -> Tuple[int, Optional[str]]:
+    """Find where to end a chunk within ``(low, high]`` and the boundary found there."""
+    for level, offsets in breaks.items():
+        if level == BOUNDARY_HEADING:
+            index = bisect.bisect_right(offsets, low)
+            if index < len(offsets) and offsets[index] <= high:
+                return offsets[index], level
+        else:
+            index = bisect.bisect_right(offsets, high) - 1
+            if index >= 0 and offsets[index] > low:
+                return offsets[index], level
+    space = max(text.rfind(" ", low, high), text.rfind("\n", low, high))
+    return (space + 1 if space > low else high), None
+
+def _next_space(text: str, start: int, end: int) -> Optional[int]:
+    for index in range(start, end):
+        if text[index].isspace():
+            return index
+    return None
+
+def _skip_space(text: str, position: int, length: int) -> int:
+    while position < length and text[position].isspace():
+        position += 1
+    return position
+
+def _trim_end(text: str, start: int, end: int) -> int:
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end
+
+class ChunkStore:
+    """Chunks of many documents as parallel offset arrays.
+
+    Each document's text is stored once and chunks are ``(doc, start,
+    end)`` entries in ``array`` columns (20 bytes per chunk); chunk text is
+    only sliced out when asked for. A document's chunks are contiguous.
+    """
+
+    def __init__(self, config: Optional[ChunkingConfig] = None):
+        self.config = config or ChunkingConfig()
+        self.texts: List[str] = []
+        self.labels: List[Optional[str]] = []
+        self._page_starts: List[Optional[List[int]]] = []
+        self._first_chunk = array('Q')  # per document, index of its first chunk
+        self.docs = array('I')
+        self.starts = array('Q')
+        self.ends = array('Q')
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def add(self, text: str, page_starts: Optional[List[int]] = None, label: Optional[str] = None) -> int:
+        """Chunk a document's text and return its document index."""
+        doc = len(self.texts)
+        starts, ends = chunk_offsets(text, self.config)
+        self.texts.append(text)
+        self.labels.append(label)
+        self._page_starts.append(page_starts)
+        self._first_chunk.append(len(self.starts))
+        self.docs.extend([doc] * len(starts))
+        self.starts.extend(starts)
+        self.ends.extend(ends)
+        return doc
+
+    def add_content(self, content: Dict[str, Any], label: Optional[str] = None) -> int:
+        """Chunk extractor output; see ``document_text`` for the accepted shapes."""
+        text, page_starts = document_text(content)
+        return self.add(text, page_starts, label)
+
+    def extend(self, other: "ChunkStore"):
+        """Append another store's documents; texts are shared, not copied."""
+        doc_offset, chunk_offset = len(self.texts), len(self.starts)
+        self.texts.extend(other.texts)
+        self.labels.extend(other.labels)
+        self._page_starts.extend(other._page_starts)
+        self._first_chunk.extend(first + chunk_offset for first in other._first_chunk)
+        self.docs.extend(doc + doc_offset for doc in other.docs)
+        self.starts.extend(other.starts)
+        self.ends.extend(other.ends)
+
+    def chunk(self, index: int) -> Chunk:
+        doc, start = self.docs[index], self.starts[index]
+        page_starts = self._page_starts[doc]
+        page = bisect.bisect_right(page_starts, start) - 1 if page_starts else None
+        return Chunk(doc, start, self.ends[index], page)
+
+    def text(self, index: int) -> str:
+        """Get a chunk's text, sliced from its document's stored text."""
+        return self.texts[self.docs[index]][self.starts[index]:self.ends[index]]
+
+    def chunk_range(self, doc: int) -> range:
+        """Get the indices of a document's chunks."""
+        end = self._first_chunk[doc + 1] if doc + 1 < len(self._first_chunk) else len(self.starts)
+        return range(self._first_chunk[doc], end)
+
+    def __iter__(self) -> Iterator[Chunk]:
+        for index in range(len(self)):
+            yield self.chunk(index)
+
+    def to_dict(self, doc: int) -> Dict[str, Any]:
+        """Describe a document's chunks as JSON-serializable offsets."""
+        chunks = self.chunk_range(doc)
+        return {
+            "label": self.labels[doc],
+            "count": len(chunks),
+            "boundary": self.config.boundary,
+            "offsets": [[self.starts[i], self.ends[i]] for i in chunks]
+        }
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the offset columns, excluding the stored texts."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self.docs, self.starts, self.ends, self._first_chunk)
+        )
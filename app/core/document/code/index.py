@@ -0,0 +1,255 @@
+"""Incremental symbol indexing of source repositories.
+
+Walks a repository, skips files whose size and mtime (or, failing that,
+content hash) match the manifest from the previous run, and parses the rest
+with the language parsers from ``parsers`` on a process pool.
+
+    python -m app.core.document.code.index /path/to/repo
+"""
+
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple, Set
+from dataclasses import dataclass, asdict
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+
+from app.core.document.code.parsers import parser_for
+from app.core.executors import executor_pools
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+DEFAULT_EXCLUDE_DIRS = {
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv",
+    ".tox", ".mypy_cache", ".pytest_cache", "build", "dist", ".next"
+}
+
+@dataclass
+class IndexRun:
+    """Counters for one indexing pass."""
+    files: int = 0
+    unchanged: int = 0  # size and mtime matched
+    rehashed: int = 0  # stat changed but content hash matched
+    parsed: int = 0
+    removed: int = 0
+    skipped: int = 0  # too large or unreadable
+    errors: int = 0  # parsed with a syntax error
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+def parse_source_files(items: List[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+    """Hash and parse a batch of files in a worker process.
+
+    Each item is ``(path, known_sha256)``; files whose hash matches are
+    returned without parsing.
+    """
+    results = []
+    for path, known_sha256 in items:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            results.append({"path": path, "skipped": str(e)})
+            continue
+
+        sha256 = hashlib.sha256(data).hexdigest()
+        if sha256 == known_sha256:
+            results.append({"path": path, "sha256": sha256, "unchanged": True})
+            continue
+
+        parser = parser_for(Path(path))
+        try:
+            parsed = parser.parse(data.decode("utf-8", errors="replace"))
+        except Exception as e:
+            results.append({"path": path, "skipped": f"{parser.language} parser failed: {str(e)}"})
+            continue
+        results.append({
+            "path": path,
+            "sha256": sha256,
+            "parser_version": parser.version,
+            "language": parsed.language,
+            "symbols": [asdict(symbol) for symbol in parsed.symbols],
+            "imports": parsed.imports,
+            "loc": parsed.loc,
+            "error": parsed.error
+        })
+    return results
+
+class CodeIndexer:
+    """Maintains a symbol index for one repository across runs."""
+
+    def __init__(
+        self,
+        root: Path,
+        manifest_path: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        max_file_size: int = 2 * 1024 * 1024,
+        batch_size: int = 64,
+        exclude_dirs: Optional[Set[str]] = None
+    ):
+        self.root = Path(root).resolve()
+        if manifest_path is None:
+            digest = hashlib.sha1(str(self.root).encode()).hexdigest()[:16]
+            manifest_path = Path("cache") / "code_index" / f"{self.root.name}-{digest}.json"
+        self.manifest_path = manifest_path
+        self.max_workers = max_workers
+        self.max_file_size = max_file_size
+        self.batch_size = batch_size
+        self.exclude_dirs = DEFAULT_EXCLUDE_DIRS if exclude_dirs is None else exclude_dirs
+        self.files: Dict[str, Dict[str, Any]] = self._load_manifest()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest["files"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable code index manifest {self.manifest_path}: {str(e)}")
+        return {}
+
+    def _save_manifest(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "root": str(self.root), "files": self.files}, f)
+        os.replace(temp_path, self.manifest_path)
+
+    def _walk(self) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield ``(relative path, stat)`` of every file with a registered parser."""
+        pending = [self.root]
+        while pending:
+            directory = pending.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                logger.warning(f"Cannot scan {directory}: {str(e)}")
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in self.exclude_dirs:
+                        pending.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False) and parser_for(Path(entry.name)):
+                    yield os.path.relpath(entry.path, self.root), entry.stat()
+
+    def _plan(self, run: IndexRun) -> Tuple[List[Tuple[str, Optional[str]]], Dict[str, os.stat_result]]:
+        """Walk the tree and decide which files need hashing or parsing."""
+        seen: Dict[str, os.stat_result] = {}
+        todo = []
+        for relative, stat in self._walk():
+            run.files += 1
+            if stat.st_size > self.max_file_size:
+                run.skipped += 1
+                continue
+            seen[relative] = stat
+            entry = self.files.get(relative)
+            parser = parser_for(Path(relative))
+            if entry and entry.get("parser_version") == parser.version:
+                if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                    run.unchanged += 1
+                    continue
+                todo.append((str(self.root / relative), entry["sha256"]))
+            else:
+                todo.append((str(self.root / relative), None))
+        return todo, seen
+
+    async def index(self) -> IndexRun:
+        """Bring the index up to date with the repository and save the manifest."""
+        started = time.monotonic()
+        run = IndexRun()
+        loop = asyncio.get_running_loop()
+        todo, seen = await loop.run_in_executor(None, self._plan, run)
+
+        if todo:
+            # A worker count asks for a private pool; otherwise share the application's
+            if self.max_workers and self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            executor = self._executor or executor_pools.process
+            futures = [
+                loop.run_in_executor(executor, parse_source_files, todo[i:i + self.batch_size])
+                for i in range(0, len(todo), self.batch_size)
+            ]
+            for future in asyncio.as_completed(futures):
+                for result in await future:
+                    self._apply(result, seen, run)
+
+        for relative in set(self.files) - set(seen):
+            del self.files[relative]
+            run.removed += 1
+
+        await loop.run_in_executor(None, self._save_manifest)
+        run.elapsed_seconds = round(time.monotonic() - started, 3)
+        logger.info(f"Indexed {self.root}: {run.to_dict()}")
+        return run
+
+    def _apply(self, result: Dict[str, Any], seen: Dict[str, os.stat_result], run: IndexRun):
+        relative = os.path.relpath(result["path"], self.root)
+        if "skipped" in result:
+            run.skipped += 1
+            seen.pop(relative, None)
+            return
+
+        stat = seen[relative]
+        if result.get("unchanged"):
+            run.rehashed += 1
+            entry = self.files[relative]
+        else:
+            run.parsed += 1
+            run.errors += result["error"] is not None
+            entry = {key: value for key, value in result.items() if key != "path"}
+            self.files[relative] = entry
+        entry["size"] = stat.st_size
+        entry["mtime_ns"] = stat.st_mtime_ns
+
+    def symbols(self, kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over indexed symbols, each with its file path."""
+        for relative, entry in self.files.items():
+            for symbol in entry["symbols"]:
+                if kind is None or symbol["kind"] == kind:
+                    yield {"path": relative, **symbol}
+
+    def find(self, name: str) -> List[Dict[str, Any]]:
+        """Find symbols by name or qualified name."""
+        return [
+            symbol for symbol in self.symbols()
+            if symbol["name"] == name
+            or (symbol["parent"] and f"{symbol['parent']}.{symbol['name']}" == name)
+        ]
+
+    def shutdown(self):
+        """Shut down the private worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incrementally index a source repository")
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--manifest", type=Path, help="Manifest location (default: cache/code_index/)")
+    parser.add_argument("--workers", type=int, help="Parser worker processes")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    indexer = CodeIndexer(args.root, args.manifest, args.workers)
+    try:
+        run = asyncio.run(indexer.index())
+    finally:
+        indexer.shutdown()
+        executor_pools.shutdown()
+    print(json.dumps({"manifest": str(indexer.manifest_path), **run.to_dict()}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Language-aware source parsers producing symbol tables with line spans."""
+
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field, asdict
+from abc import ABC, abstractmethod
+import ast
+import bisect
+import io
+import logging
+import re
+import tokenize
+
+logger = logging.getLogger(__name__)
+
+_BRACE_RE = re.compile(r"[{}]")
+
+@dataclass
+class CodeSymbol:
+    """A named definition and the lines it spans (1-based, inclusive)."""
+    name: str
+    kind: str  # function, method, class, ...
+    start_line: int
+    end_line: int
+    parent: Optional[str] = None  # qualified name of the enclosing symbol
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.parent}.{self.name}" if self.parent else self.name
+
+@dataclass
+class ParsedSource:
+    """Symbol table and summary of one source file."""
+    language: str
+    symbols: List[CodeSymbol] = field(default_factory=list)
+    imports: List[Dict[str, Any]] = field(default_factory=list)  # module, line
+    comments: List[Dict[str, Any]] = field(default_factory=list)  # line, text
+    loc: int = 0  # non-blank lines
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+class LanguageParser(ABC):
+    """Base class for parsers registered with ``register_parser``."""
+
+    language: str = ""
+    extensions: Tuple[str, ...] = ()
+    version = "1"  # bump to reindex files parsed by older versions
+
+    @abstractmethod
+    def parse(self, source: str) -> ParsedSource:
+        """Parse ``source`` into symbols, imports and comments."""
+
+def _count_loc(source: str) -> int:
+    return sum(1 for line in source.splitlines() if line.strip())
+
+class PythonParser(LanguageParser):
+    """Parses Python with ``ast`` for definitions and ``tokenize`` for comments."""
+
+    language = "python"
+    extensions = (".py", ".pyi")
+
+    def parse(self, source: str) -> ParsedSource:
+        result = ParsedSource(language=self.language, loc=_count_loc(source))
+        try:
+            tree = ast.parse(source)
+        except SyntaxError as e:
+            result.error = f"SyntaxError: {e.msg} (line {e.lineno})"
+            return result
+
+        self._collect(tree, None, False, result)
+        result.comments = self._comments(source)
+        return result
+
+    def _collect(self, node: ast.AST, parent: Optional[str], in_class: bool, result: ParsedSource):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                if isinstance(child, ast.ClassDef):
+                    kind = "class"
+                else:
+                    kind = "method" if in_class else "function"
+                symbol = CodeSymbol(
+                    name=child.name,
+                    kind=kind,
+                    # Spans include decorators
+                    start_line=min([child.lineno] + [d.lineno for d in child.decorator_list]),
+                    end_line=child.end_lineno or child.lineno,
+                    parent=parent
+                )
+                result.symbols.append(symbol)
+                self._collect(child, symbol.qualified_name, isinstance(child, ast.ClassDef), result)
+            elif isinstance(child, ast.Import):
+                result.imports += [
+                    {"module": alias.name, "line": child.lineno} for alias in child.names
+                ]
+            elif isinstance(child, ast.ImportFrom):
+                module = "." * child.level + (child.module or "")
+                result.imports.append({"module": module, "line": child.lineno})
+            else:
+                self._collect(child, parent, False, result)
+
+    def _comments(self, source: str) -> List[Dict[str, Any]]:
+        comments = []
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(source).readline):
+                if token.type == tokenize.COMMENT:
+                    comments.append({"line": token.start[0], "text": token.string})
+        except (tokenize.TokenError, IndentationError) as e:
+            logger.debug(f"Tokenize stopped early: {str(e)}")
+        return comments
+
+class BraceLanguageParser(LanguageParser):
+    """Regex parser for C-family languages; spans end at the matching brace.
+
+    Brace matching ignores string and comment contents that contain braces,
+    so spans are approximate.
+    """
+
+    def __init__(
+        self,
+        language: str,
+        extensions: Tuple[str, ...],
+        definitions: Dict[str, str],
+        import_pattern: Optional[str] = None
+    ):
+        self.language = language
+        self.extensions = extensions
+        self.definitions = [
+            (kind, re.compile(pattern, re.MULTILINE)) for kind, pattern in definitions.items()
+        ]
+        self.import_re = re.compile(import_pattern, re.MULTILINE) if import_pattern else None
+
+    def parse(self, source: str) -> ParsedSource:
+        result = ParsedSource(language=self.language, loc=_count_loc(source))
+        line_starts = [0] + [match.end() for match in re.finditer(r"\n", source)]
+
+        def line_of(offset: int) -> int:
+            return bisect.bisect_right(line_starts, offset)
+
+        found = {}
+        for kind, pattern in self.definitions:
+            for match in pattern.finditer(source):
+                if match.start() in found:
+                    continue
+                body = source.find("{", match.end() - 1)
+                end_offset = self._match_brace(source, body) if body != -1 else match.end()
+                found[match.start()] = (match.start(), end_offset, match.group("name"), kind)
+
+        # Nest symbols by span to fill in parents
+        found = sorted(found.values(), key=lambda item: (item[0], -item[1]))
+        stack: List[Tuple[int, CodeSymbol]] = []
+        for start, end, name, kind in found:
+            while stack and stack[-1][0] < start:
+                stack.pop()
+            symbol = CodeSymbol(
+                name=name,
+                kind=kind,
+                start_line=line_of(start),
+                end_line=line_of(end),
+                parent=stack[-1][1].qualified_name if stack else None
+            )
+            result.symbols.append(symbol)
+            stack.append((end, symbol))
+
+        if self.import_re:
+            result.imports = [
+                {"module": match.group("module"), "line": line_of(match.start())}
+                for match in self.import_re.finditer(source)
+            ]
+        result.comments = [
+            {"line": line_of(match.start()), "text": match.group().strip()}
+            for match in re.finditer(r"//[^\n]*", source)
+        ]
+        return result
+
+    @staticmethod
+    def _match_brace(source: str, open_index: int) -> int:
+        depth = 0
+        for match in _BRACE_RE.finditer(source, open_index):
+            depth += 1 if match.group() == "{" else -1
+            if depth == 0:
+                return match.start()
+        return len(source) - 1
+
+_parsers: Dict[str, LanguageParser] = {}
+
+def register_parser(parser: LanguageParser):
+    """Register a parser for each of its file extensions, replacing earlier ones."""
+    for extension in parser.extensions:
+        _parsers[extension.lower()] = parser
+
+def parser_for(file_path: Path) -> Optional[LanguageParser]:
+    """Get the parser registered for a file's extension."""
+    return _parsers.get(Path(file_path).suffix.lower())
+
+def supported_extensions() -> List[str]:
+    return sorted(_parsers)
+
+register_parser(PythonParser())
+register_parser(BraceLanguageParser(
+    "javascript",
+    (".js", ".jsx", ".mjs", ".ts", ".tsx"),
+    {
+        "class": r"^[ \t]*(?:export\s+)?(?:default\s+)?class\s+(?P<name>\w+)",
+        "function": r"^[ \t]*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*(?P<name>\w+)\s*\(",
+        "method": r"^[ \t]+(?:static\s+|async\s+|get\s+|set\s+)*(?!if\b|for\b|while\b|switch\b|catch\b|return\b)(?P<name>\w+)\s*\([^)]*\)\s*(?::[^{]+)?\{",
+    },
+    r"^[ \t]*import\s+(?:[^'\"]+\s+from\s+)?['\"](?P<module>[^'\"]+)['\"]"
+))
+register_parser(BraceLanguageParser(
+    "java",
+    (".java",),
+    {
+        "class": r"^[ \t]*(?:(?:public|private|protected|abstract|final|static)\s+)*(?:class|interface|enum|record)\s+(?P<name>\w+)",
+        "method": r"^[ \t]+(?:(?:public|private|protected|static|final|abstract|synchronized)\s+)+[\w<>\[\], \t]+?[ \t]+(?P<name>\w+)\s*\([^)]*\)\s*(?:throws\s+[\w.,\s]+)?\{",
+    },
+    r"^[ \t]*import\s+(?:static\s+)?(?P<module>[\w.*]+)\s*;"
+))
+register_parser(BraceLanguageParser(
+    "cpp",
+    (".c", ".h", ".cc", ".cpp", ".hpp", ".cxx"),
+    {
+        "class": r"^[ \t]*(?:class|struct)\s+(?P<name>\w+)[^;{]*\{",
+        "function": r"^(?![ \t]*(?:if|for|while|switch|return|else)\b)[\w:<>\*& \t]+?\b(?P<name>[\w:~]+)[ \t]*\([^;{)]*\)\s*(?:const\s*)?\{",
+    },
+    r"^[ \t]*#\s*include\s+[<\"](?P<module>[^>\"]+)[>\"]"
+))
+register_parser(BraceLanguageParser(
+    "go",
+    (".go",),
+    {
+        "type": r"^type\s+(?P<name>\w+)\s+(?:struct|interface)\s*\{",
+        "function": r"^func\s+(?:\([^)]*\)\s*)?(?P<name>\w+)\s*\(",
+    },
+    r"^[ \t]*(?:import\s+)?\"(?P<module>[\w./-]+)\"$"
+))
@@ -0,0 +1,187 @@
+"""Near-duplicate detection with MinHash signatures and LSH banding."""
+
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
+import os
+import re
+import threading
+import zlib
+import numpy as np
+
+DEDUP_OFF = "off"
+DEDUP_MARK = "mark"  # keep duplicates, flag them in the result
+DEDUP_SKIP = "skip"  # drop duplicate content and skip knowledge extraction
+DEDUP_ACTIONS = (DEDUP_OFF, DEDUP_MARK, DEDUP_SKIP)
+
+_TOKEN_RE = re.compile(r"\w+")
+_SHINGLE_BASE = np.uint64(1000003)
+_BLOCK_SIZE = 4096  # shingles hashed per step; bounds the (block, num_perm) work array
+
+@dataclass(frozen=True)
+class DedupConfig:
+    """How near-duplicates are detected and what happens to them."""
+    action: str = DEDUP_MARK
+    threshold: float = 0.9  # estimated Jaccard similarity of word shingles
+    num_perm: int = 128
+    shingle_size: int = 5
+
+    @classmethod
+    def from_env(cls) -> "DedupConfig":
+        """Build the default config from DEDUP_ACTION and DEDUP_THRESHOLD."""
+        action = os.getenv("DEDUP_ACTION") or DEDUP_MARK
+        threshold = os.getenv("DEDUP_THRESHOLD")
+        if action not in DEDUP_ACTIONS:
+            raise ValueError(f"DEDUP_ACTION must be one of {', '.join(DEDUP_ACTIONS)}")
+        return cls(action=action, threshold=float(threshold) if threshold else 0.9)
+
+@dataclass
+class DuplicateMatch:
+    """The earlier document a new one duplicates."""
+    duplicate_of: str
+    similarity: float
+
+class MinHashIndex:
+    """In-memory LSH index of MinHash signatures, shared across batches.
+
+    Signatures are ``num_perm`` 32-bit minima of multiply-shift hashes over
+    the document's word shingles. They are split into bands; documents that
+    share any band are candidates, and candidates are confirmed by comparing
+    full signatures. Each indexed document costs ``4 * num_perm`` bytes.
+    """
+
+    def __init__(self, config: Optional[DedupConfig] = None, seed: int = 1):
+        self.config = config or DedupConfig()
+        rng = np.random.default_rng(seed)
+        max_value = np.iinfo(np.uint64).max
+        self._a = rng.integers(1, max_value, self.config.num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self._b = rng.integers(0, max_value, self.config.num_perm, dtype=np.uint64, endpoint=True)
+        self.rows = self._band_rows(self.config.num_perm, self.config.threshold)
+        self.bands = self.config.num_perm // self.rows
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._signatures: List[np.ndarray] = []
+        self._labels: List[str] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _band_rows(num_perm: int, threshold: float) -> int:
+        """Pick rows per band so pairs somewhat below ``threshold`` still collide.
+
+        A pair with similarity ``s`` shares a band with probability
+        ``1 - (1 - s**rows) ** bands``; the band count is chosen so this
+        curve rises around ``0.8 * threshold`` and near-threshold pairs are
+        rarely missed. False candidates are removed by the full comparison.
+        """
+        rows = 1
+        for candidate in range(1, num_perm + 1):
+            if num_perm % candidate == 0:
+                bands = num_perm // candidate
+                if (1 / bands) ** (1 / candidate) <= 0.8 * threshold:
+                    rows = candidate
+        return rows
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        """Hash overlapping runs of ``shingle_size`` lowercased words."""
+        tokens = _TOKEN_RE.findall(text.lower())
+        if not tokens:
+            return np.empty(0, dtype=np.uint64)
+        token_hashes = {token: zlib.crc32(token.encode()) for token in set(tokens)}
+        hashes = np.fromiter((token_hashes[t] for t in tokens), dtype=np.uint64, count=len(tokens))
+
+        size = min(self.config.shingle_size, len(tokens))
+        count = len(tokens) - size + 1
+        shingles = hashes[:count].copy()
+        for offset in range(1, size):
+            # Polynomial hash; uint64 arithmetic wraps around
+            shingles = shingles * _SHINGLE_BASE + hashes[offset:offset + count]
+        return np.unique(shingles)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Compute the MinHash signature of a text, or None if it has no words."""
+        shingles = self._shingles(text)
+        if not len(shingles):
+            return None
+        signature = np.full(self.config.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        for start in range(0, len(shingles), _BLOCK_SIZE):
+            block = shingles[start:start + _BLOCK_SIZE, None]
+            hashed = ((block * self._a + self._b) >> np.uint64(32)).astype(np.uint32)
+            np.minimum(signature, hashed.min(axis=0), out=signature)
+        return signature
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def add(self, label: str, signature: np.ndarray) -> Optional[DuplicateMatch]:
+        """Index a signature, returning its best match above the threshold, if any.
+
+        Duplicates are indexed too, so later revisions can match either the
+        original or an intermediate revision.
+        """
+        keys = self._band_keys(signature)
+        with self._lock:
+            candidates = set()
+            for bucket, key in zip(self._buckets, keys):
+                candidates.update(bucket.get(key, ()))
+
+            match = None
+            if candidates:
+                indices = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                stacked = np.stack([self._signatures[i] for i in indices])
+                similarities = (stacked == signature).mean(axis=1)
+                best = int(similarities.argmax())
+                if similarities[best] >= self.config.threshold:
+                    match = DuplicateMatch(
+                        duplicate_of=self._labels[indices[best]],
+                        similarity=round(float(similarities[best]), 4)
+                    )
+
+            index = len(self._labels)
+            self._labels.append(label)
+            self._signatures.append(signature)
+            for bucket, key in zip(self._buckets, keys):
+                bucket.setdefault(key, []).append(index)
+            return match
+
+    def clear(self):
+        with self._lock:
+            self._buckets = [{} for _ in range(self.bands)]
+            self._signatures = []
+            self._labels = []
+
+def cluster_stats(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize duplicate clusters among batch results.
+
+    A cluster is a first-seen document and the documents marked as its
+    duplicates, directly or through a chain of revisions. Documents are
+    identified by ``content_sha256``, the label they were indexed under.
+    """
+    duplicates = [result for result in results if result.get("duplicate_of")]
+    parents = {
+        result["content_sha256"]: result["duplicate_of"]
+        for result in duplicates if result["content_sha256"] != result["duplicate_of"]
+    }
+
+    def root(label: str) -> str:
+        seen = set()
+        while label in parents and label not in seen:
+            seen.add(label)
+            label = parents[label]
+        return label
+
+    sizes: Dict[str, int] = {}
+    for result in duplicates:
+        cluster = root(result["duplicate_of"])
+        sizes[cluster] = sizes.get(cluster, 1) + 1
+    similarities = [result["similarity"] for result in duplicates]
+    return {
+        "duplicates": len(duplicates),
+        "skipped": sum(1 for result in results if result.get("skipped")),
+        "clusters": len(sizes),
+        "largest_cluster": max(sizes.values(), default=0),
+        "mean_similarity": round(sum(similarities) / len(similarities), 4) if similarities else None
+    }
@@ -0,0 +1,112 @@
+"""Execution backends that keep blocking extraction work off the event loop."""
+
+from typing import Dict, Any, Optional, Callable, TypeVar
+from dataclasses import dataclass
+from concurrent.futures import Future
+import asyncio
+import os
+
+from app.core.document.extractors.registry import extractor_registry
+from app.core.document.transfer import release_abandoned
+from app.core.executors import executor_pools
+
+T = TypeVar('T')
+
+EXECUTION_INLINE = "inline"  # on the event loop; for debugging and profiling
+EXECUTION_THREAD = "thread"  # shared thread pool
+EXECUTION_PROCESS = "process"  # shared process pool, results pickled back
+EXECUTION_MODES = (EXECUTION_INLINE, EXECUTION_THREAD, EXECUTION_PROCESS)
+
+@dataclass(frozen=True)
+class ExecutionBackend:
+    """Where extractors run their synchronous parsing work.
+
+    Work submitted with ``run`` goes to the configured pool; with the
+    process backend it must be a picklable module-level function with
+    picklable arguments. Work that needs state only this process has, such
+    as an open ``PDFSession`` handle, goes through ``run_local``, which
+    uses the thread pool unless the backend is inline. PDF page text is
+    extracted ``page_block`` pages per task to keep round trips few.
+    """
+    mode: str = EXECUTION_THREAD
+    page_block: int = 32
+
+    def __post_init__(self):
+        if self.mode not in EXECUTION_MODES:
+            raise ValueError(f"Execution backend must be one of {', '.join(EXECUTION_MODES)}")
+
+    @classmethod
+    def from_env(cls) -> "ExecutionBackend":
+        """Build the default backend from EXTRACTION_BACKEND and EXTRACTION_PAGE_BLOCK."""
+        page_block = os.getenv("EXTRACTION_PAGE_BLOCK")
+        return cls(
+            mode=os.getenv("EXTRACTION_BACKEND") or EXECUTION_THREAD,
+            page_block=int(page_block) if page_block else 32
+        )
+
+    @property
+    def in_process(self) -> bool:
+        return self.mode == EXECUTION_PROCESS
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Run blocking work on the configured backend."""
+        if self.mode == EXECUTION_INLINE:
+            return fn(*args)
+        executor = executor_pools.process if self.in_process else executor_pools.thread
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    def submit(self, fn: Callable[..., T], *args) -> Future:
+        """Submit blocking work and get its ``concurrent.futures`` future.
+
+        The inline backend runs ``fn`` before returning a completed future.
+        """
+        if self.mode != EXECUTION_INLINE:
+            executor = executor_pools.process if self.in_process else executor_pools.thread
+            return executor.submit(fn, *args)
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    async def run_shared(self, fn: Callable[..., T], *args) -> T:
+        """Run work whose result may be a ``transfer.SharedHandle``.
+
+        If the caller is cancelled, e.g. by a time budget, while ``fn`` is
+        still running, the shared segment it produces is freed when it
+        finishes instead of leaking.
+        """
+        future = self.submit(fn, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(release_abandoned)
+            raise
+
+    async def run_local(self, fn: Callable[..., T], *args) -> T:
+        """Run blocking work that must stay in this process."""
+        if self.mode == EXECUTION_INLINE:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(executor_pools.thread, fn, *args)
+
+    async def run_extractor(self, extractor: Any, *args) -> Dict[str, Any]:
+        """Run an extractor's synchronous ``extract_content``.
+
+        With the process backend a worker creates its own instance of the
+        extractor from the registry, so only the arguments and the result
+        cross the process boundary.
+        """
+        if self.in_process:
+            return await self.run(extract_in_worker, extractor.name, args)
+        return await self.run(extractor.extract_content, *args)
+
+# Extractors created inside worker processes, by registry document type
+_worker_extractors: Dict[str, Any] = {}
+
+def extract_in_worker(doc_type: str, args: tuple) -> Dict[str, Any]:
+    """Run ``extract_content`` of a per-process extractor instance."""
+    extractor = _worker_extractors.get(doc_type)
+    if extractor is None:
+        extractor = _worker_extractors[doc_type] = extractor_registry.create(doc_type)
+    return extractor.extract_content(*args)
@@ -1,77 +1,78 @@
 """Markdown document extraction with metadata support."""
 
 from pathlib import Path
-from typing import Dict, Any
-import markdown
+from typing import Dict, Any, Optional, Union
 import frontmatter
 import logging
-from bs4 import BeautifulSoup
+
+from app.core.document.markdown_pipeline import get_pipeline
+from app.core.document.profiles import ExtractionProfile, get_profile
+from app.core.document.execution import ExecutionBackend
 
 logger = logging.getLogger(__name__)
 
+MARKDOWN_EXTENSIONS = [
+    'extra',
+    'codehilite',
+    'tables',
+    'toc',
+    'fenced_code',
+    'sane_lists'
+]
+
 class MarkdownExtractor:
     """Handles extraction of content from Markdown documents."""
     
-    async def extract(self, file_path: Path) -> Dict[str, Any]:
-        """Extract content and metadata from a Markdown document."""
+    name = "markdown"
+    version = "2"
+    
+    def __init__(self, backend: Optional[ExecutionBackend] = None):
+        self.pipeline = get_pipeline(MARKDOWN_EXTENSIONS)
+        self.backend = backend or ExecutionBackend.from_env()
+    
+    async def extract(
+        self,
+        file_path: Path,
+        profile: Union[str, ExtractionProfile, None] = None
+    ) -> Dict[str, Any]:
+        """Extract content and metadata from a Markdown document on the execution backend."""
+        return await self.backend.run_extractor(self, file_path, get_profile(profile))
+    
+    def extract_content(self, file_path: Path, profile: ExtractionProfile) -> Dict[str, Any]:
+        """Extract content and metadata from a Markdown document.
+        
+        Front matter, headings, code blocks and links are collected by hooks
+        during the Markdown conversion, so the HTML is never parsed again.
+        """
         try:
             # Read the file content
-            content = frontmatter.load(file_path)
-            
-            # Convert markdown to HTML for structured content
-            html_content = markdown.markdown(
-                content.content,
-                extensions=[
-                    'extra',
-                    'codehilite',
-                    'tables',
-                    'toc',
-                    'fenced_code',
-                    'sane_lists'
-                ]
-            )
-            
-            # Parse HTML for structure
-            soup = BeautifulSoup(html_content, 'html.parser')
+            with open(file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
             
-            # Extract structure
-            headings = [
-                {
-                    "level": int(h.name[1]),
-                    "text": h.get_text(),
-                    "id": h.get("id", "")
+            if not (profile.structure or profile.html):
+                metadata, body = frontmatter.parse(text)
+                return {
+                    "metadata": metadata,
+                    "content": body,
+                    "html_content": None,
+                    "structure": {}
                 }
-                for h in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            ]
             
-            code_blocks = [
-                {
-                    "language": block.get("class", [""])[0].replace("language-", "")
-                    if block.get("class") else "text",
-                    "content": block.get_text()
-                }
-                for block in soup.find_all("code")
-            ]
-            
-            links = [
-                {
-                    "text": a.get_text(),
-                    "href": a.get("href", "")
-                }
-                for a in soup.find_all("a")
-            ]
-            
-            return {
-                "metadata": dict(content.metadata),
-                "content": content.content,
-                "html_content": html_content,
-                "structure": {
-                    "headings": headings,
-                    "code_blocks": code_blocks,
-                    "links": links
-                }
+            converted = self.pipeline.convert(text)
+            result = {
+                "metadata": converted.metadata,
+                "content": converted.body.strip(),
+                "html_content": converted.html if profile.html else None,
+                "structure": {}
             }
+            if profile.structure:
+                result["structure"] = {
+                    "headings": converted.headings,
+                    "code_blocks": converted.code_blocks,
+                    "links": converted.links
+                }
+            return result
             
         except Exception as e:
             logger.error(f"Markdown extraction error: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
\ No newline at end of file
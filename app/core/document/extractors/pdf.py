@@ -1,12 +1,20 @@
 """PDF document extraction with table detection."""
 
 from pathlib import Path
-from typing import Dict, List, Any
-import fitz  # PyMuPDF
-import camelot
+from typing import Dict, List, Any, Optional, Tuple, AsyncIterator, Union
+import asyncio
+import os
 import logging
 from dataclasses import dataclass
 
+from app.core.document.session import PDFSession, extract_shared_page_range, iter_page_texts
+from app.core.document.transfer import received_texts, release_abandoned
+from app.core.document.execution import ExecutionBackend
+from app.core.document.tables import TableDetector
+from app.core.document.profiles import ExtractionProfile, get_profile
+from app.core.document.budget import BudgetTracker, BudgetExceeded
+from app.core.executors import executor_pools, TrackedProcessPoolExecutor
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -17,56 +25,213 @@ class PDFTable:
     bbox: tuple  # x1, y1, x2, y2
     confidence: float
 
+def plan_page_shards(
+    page_count: int,
+    shard_size: Optional[int] = None,
+    workers: Optional[int] = None
+) -> List[Tuple[int, int]]:
+    """Split ``page_count`` pages into contiguous ``(start, end)`` ranges.
+
+    When ``shard_size`` is not given the pages are divided evenly across
+    ``workers`` (defaults to the CPU count).
+    """
+    if page_count <= 0:
+        return []
+    if not shard_size:
+        workers = workers or os.cpu_count() or 1
+        shard_size = -(-page_count // workers)
+    return [
+        (start, min(start + shard_size, page_count))
+        for start in range(0, page_count, shard_size)
+    ]
+
 class PDFExtractor:
     """Handles extraction of content from PDF documents."""
     
-    async def extract(self, file_path: Path) -> Dict[str, Any]:
+    name = "pdf"
+    version = "1"
+    
+    def __init__(
+        self,
+        parallel: bool = False,
+        shard_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        backend: Optional[ExecutionBackend] = None
+    ):
+        """Initialize the extractor.
+
+        Args:
+            parallel: Extract page text in worker processes, one shard per task
+            shard_size: Pages per shard; defaults to an even split across workers
+            max_workers: Size of a private process pool; by default shards run
+                on the application's shared process pool
+            backend: Where page text and tables are extracted when not sharded;
+                read from the environment when not given
+        """
+        self.parallel = parallel
+        self.backend = backend or ExecutionBackend.from_env()
+        self.shard_size = shard_size
+        self.max_workers = max_workers or executor_pools.process_workers
+        self._own_pool = max_workers is not None
+        self._executor: Optional[TrackedProcessPoolExecutor] = None
+        self.table_detector = TableDetector(flavor='stream')
+    
+    async def extract(
+        self,
+        file_path: Path,
+        profile: Union[str, ExtractionProfile, None] = None,
+        tracker: Optional[BudgetTracker] = None
+    ) -> Dict[str, Any]:
         """Extract text and tables from a PDF document."""
         try:
-            doc = fitz.open(str(file_path))
-            
-            # Extract text content
             text_content = []
             tables = []
+            summary: Dict[str, Any] = {}
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text_content.append(page.get_text())
-                
-                # Extract tables using camelot
-                if page.get_text().strip():  # Only process pages with content
-                    try:
-                        page_tables = camelot.read_pdf(
-                            str(file_path),
-                            pages=str(page_num + 1),
-                            flavor='stream'
-                        )
-                        
-                        for table in page_tables:
-                            tables.append(PDFTable(
-                                page=page_num,
-                                content=table.data,
-                                bbox=table._bbox,
-                                confidence=table.parsing_report['accuracy']
-                            ).__dict__)
-                    except Exception as e:
-                        logger.warning(f"Table extraction failed for page {page_num + 1}: {str(e)}")
-            
-            # Extract metadata
-            metadata = doc.metadata
+            async for record in self.iter_pages(file_path, profile, tracker):
+                if record["type"] == "page":
+                    text_content.append(record["text"])
+                elif record["type"] == "tables":
+                    tables = record["tables"]
+                else:
+                    summary = record
             
             return {
                 "text_content": text_content,
                 "tables": tables,
-                "metadata": metadata,
-                "total_pages": len(doc),
-                "has_tables": len(tables) > 0
+                "metadata": summary["metadata"],
+                "total_pages": summary["total_pages"],
+                "has_tables": len(tables) > 0,
+                "table_detection": summary.get("table_detection"),
+                "session_stats": summary["session_stats"]
             }
             
         except Exception as e:
             logger.error(f"PDF extraction error: {str(e)}")
             raise
+    
+    async def iter_pages(
+        self,
+        file_path: Path,
+        profile: Union[str, ExtractionProfile, None] = None,
+        tracker: Optional[BudgetTracker] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream extraction results for a PDF document.
         
+        Yields a ``page`` record per page in page order, then a ``tables``
+        record when the profile enables tables, and finally a ``document``
+        record with metadata and counters. Page text is not retained once
+        yielded. With a ``tracker``, pages stop as soon as the budget runs
+        out and tables are only detected on the pages already yielded.
+        """
+        profile = get_profile(profile)
+        with PDFSession(file_path) as session:
+            # Opening parses the cross-reference table, which can be slow for large files
+            total_pages = await self.backend.run_local(lambda: session.page_count)
+            shards = plan_page_shards(total_pages, self.shard_size, self.max_workers)
+            deadline = tracker.deadline() if tracker else None
+            if self.parallel and len(shards) > 1:
+                page_texts = self._iter_text_sharded(session, shards, deadline)
+            else:
+                page_texts = self._iter_text(session, deadline)
+            
+            page_num = 0
+            try:
+                async for text in page_texts:
+                    if tracker and tracker.check(page_num):
+                        break
+                    yield {
+                        "type": "page",
+                        "page": page_num,
+                        "total_pages": total_pages,
+                        "text": text
+                    }
+                    page_num += 1
+            finally:
+                await page_texts.aclose()
+            
+            summary = {
+                "type": "document",
+                "metadata": session.metadata(),
+                "total_pages": total_pages
+            }
+            
+            # Extract tables from prefiltered candidate pages in one camelot pass
+            detection = None
+            if profile.tables:
+                detect = self.table_detector.detect(session, self.backend, page_num, deadline)
+                try:
+                    detection = await (tracker.run(detect) if tracker else detect)
+                except BudgetExceeded:
+                    pass
+            if detection is not None:
+                summary["table_detection"] = detection.summary()
+                yield {
+                    "type": "tables",
+                    "tables": [
+                        PDFTable(
+                            page=table.page - 1,
+                            content=table.data,
+                            bbox=table.bbox,
+                            confidence=round(table.accuracy, 2)
+                        ).__dict__
+                        for table in detection.tables
+                    ]
+                }
+            
+            summary["session_stats"] = dict(session.stats)
+            if tracker:
+                summary.update(tracker.summary())
+            yield summary
+    
+    def _iter_text(self, session: PDFSession, deadline: Optional[float] = None) -> AsyncIterator[str]:
+        """Yield page text in blocks of pages on the execution backend."""
+        return iter_page_texts(session, self.backend, cache=False, deadline=deadline)
+    
+    async def _iter_text_sharded(
+        self,
+        session: PDFSession,
+        shards: List[Tuple[int, int]],
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """Extract page text shard by shard on the process pool, in page order.
+
+        Large shards come back in shared memory, freed once their pages are
+        yielded; shards still running when iteration stops are freed when
+        they finish. Shards stop between pages once ``deadline`` has passed,
+        and iteration ends after the first short shard.
+        """
+        if self._own_pool:
+            if self._executor is None:
+                self._executor = TrackedProcessPoolExecutor(self.max_workers)
+            executor = self._executor
+        else:
+            executor = executor_pools.process
+        
+        session.record_open('page_shards', len(shards))
+        futures = [
+            executor.submit(extract_shared_page_range, str(session.file_path), start, end, deadline)
+            for start, end in shards
+        ]
+        
+        consumed = 0
+        try:
+            # Shards are awaited in submission order, so pages come back in sequence
+            for future, (start, end) in zip(futures, shards):
+                result = await asyncio.wrap_future(future)
+                consumed += 1
+                with received_texts(result) as texts:
+                    for text in texts:
+                        yield text
+                    if len(texts) < end - start:
+                        return
         finally:
-            if 'doc' in locals():
-                doc.close() 
\ No newline at end of file
+            for future in futures[consumed:]:
+                if not future.cancel():
+                    future.add_done_callback(release_abandoned)
+    
+    def shutdown(self):
+        """Shut down the private worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
\ No newline at end of file
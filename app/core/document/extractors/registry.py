@@ -0,0 +1,150 @@
+"""Lazy extractor registry keyed by document type.
+
+Extractors and their heavy dependencies (PyMuPDF, camelot, lxml,
+trafilatura, markdown) are only imported the first time a document of that
+type is processed, so importing the API does not pay for them. Each first
+load is timed and reported by ``import_report()``.
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+from dataclasses import dataclass
+import importlib
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ExtractorEntry:
+    """A document type's extractor and the modules it needs."""
+    doc_type: str
+    extractor: Optional[str] = None  # "module:ClassName"
+    modules: Tuple[str, ...] = ()
+    loaded: bool = False
+    import_seconds: Optional[float] = None
+    modules_imported: int = 0  # new entries in sys.modules caused by the load
+
+class ExtractorRegistry:
+    """Maps document types to lazily imported extractors.
+
+    Import time is attributed to whichever entry loads a shared dependency
+    first, so the report reflects the order documents arrived in.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, ExtractorEntry] = {}
+        self._aliases: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def register(
+        self,
+        doc_type: str,
+        extractor: Optional[str] = None,
+        modules: Iterable[str] = (),
+        aliases: Iterable[str] = ()
+    ):
+        """Register a document type without importing anything."""
+        self._entries[doc_type] = ExtractorEntry(doc_type, extractor, tuple(modules))
+        for alias in aliases:
+            self._aliases[alias] = doc_type
+
+    def _entry(self, doc_type: str) -> ExtractorEntry:
+        doc_type = self._aliases.get(doc_type, doc_type)
+        if doc_type not in self._entries:
+            raise KeyError(f"No extractor registered for document type: {doc_type}")
+        return self._entries[doc_type]
+
+    def __contains__(self, doc_type: str) -> bool:
+        return self._aliases.get(doc_type, doc_type) in self._entries
+
+    def load(self, doc_type: str) -> ExtractorEntry:
+        """Import the modules for a document type, timing the first load."""
+        entry = self._entry(doc_type)
+        if entry.loaded:
+            return entry
+        with self._lock:
+            if entry.loaded:
+                return entry
+            modules_before = len(sys.modules)
+            started = time.perf_counter()
+            for module in entry.modules:
+                importlib.import_module(module)
+            if entry.extractor:
+                importlib.import_module(entry.extractor.partition(":")[0])
+            entry.import_seconds = round(time.perf_counter() - started, 4)
+            entry.modules_imported = len(sys.modules) - modules_before
+            entry.loaded = True
+            logger.info(
+                f"Loaded {entry.doc_type} extractor in {entry.import_seconds:.3f}s "
+                f"({entry.modules_imported} modules)"
+            )
+        return entry
+
+    def extractor_class(self, doc_type: str) -> type:
+        """Get the extractor class for a document type, importing it on first use."""
+        entry = self.load(doc_type)
+        if not entry.extractor:
+            raise KeyError(f"Document type {entry.doc_type} has no standalone extractor")
+        module, _, name = entry.extractor.partition(":")
+        return getattr(sys.modules[module], name)
+
+    def create(self, doc_type: str, **kwargs) -> Any:
+        """Instantiate the extractor for a document type."""
+        return self.extractor_class(doc_type)(**kwargs)
+
+    def preload(self, doc_types: Optional[Iterable[str]] = None):
+        """Load extractors ahead of time, e.g. to warm a worker before serving."""
+        for doc_type in doc_types or list(self._entries):
+            self.load(doc_type)
+
+    def import_report(self) -> Dict[str, Any]:
+        """Get per-extractor import cost; unloaded entries have no timing yet."""
+        entries = list(self._entries.values())
+        return {
+            "extractors": {
+                entry.doc_type: {
+                    "loaded": entry.loaded,
+                    "import_seconds": entry.import_seconds,
+                    "modules_imported": entry.modules_imported,
+                    "extractor": entry.extractor,
+                    "modules": list(entry.modules)
+                }
+                for entry in entries
+            },
+            "total_import_seconds": round(sum(entry.import_seconds or 0 for entry in entries), 4)
+        }
+
+    def doc_types(self) -> List[str]:
+        return list(self._entries)
+
+# Global extractor registry instance
+extractor_registry = ExtractorRegistry()
+
+extractor_registry.register(
+    "pdf",
+    extractor="app.core.document.extractors.pdf:PDFExtractor",
+    modules=("app.core.document.session", "app.core.document.tables")
+)
+# camelot pulls in pandas and OpenCV; only loaded when tables are extracted
+extractor_registry.register("pdf_tables", modules=("camelot",))
+extractor_registry.register(
+    "markdown",
+    extractor="app.core.document.extractors.markdown:MarkdownExtractor",
+    modules=("app.core.document.markdown_pipeline",),
+    aliases=("md",)
+)
+extractor_registry.register(
+    "html",
+    extractor="app.core.document.extractors.html:HTMLExtractor",
+    modules=("app.core.document.html_tree",)
+)
+# trafilatura is only needed for main-content extraction
+extractor_registry.register("html_main_content", modules=("trafilatura",))
+extractor_registry.register(
+    "text",
+    modules=("app.core.document.text_layout",),
+    aliases=("txt",)
+)
+extractor_registry.register("code", modules=("app.core.document.code.parsers",))
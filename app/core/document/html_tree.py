@@ -0,0 +1,185 @@
+"""Single-parse HTML document access built on one lxml tree."""
+
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Union
+import codecs
+import logging
+import re
+import lxml.html
+from lxml import etree
+
+from app.core.document.extractors.registry import extractor_registry
+
+logger = logging.getLogger(__name__)
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+# Text nodes outside script, style and template elements
+_visible_text = etree.XPath(
+    "//text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+)
+
+_XML_ENCODING_RE = re.compile(rb"""^\s*<\?xml[^>]*?encoding\s*=\s*["']([A-Za-z0-9._:-]+)""")
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]*?charset\s*=\s*["']?([A-Za-z0-9._:-]+)""", re.IGNORECASE)
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16")
+)
+
+def declared_encoding(data: bytes, default: str = "utf-8") -> str:
+    """Find a document's encoding from its BOM, XML declaration or meta charset.
+
+    lxml's HTML parser ignores the XML declaration and assumes Latin-1
+    when no charset is given, so the encoding is passed to it explicitly.
+    Only the first kilobytes are searched.
+    """
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding
+    head = data[:4096]
+    match = _XML_ENCODING_RE.match(head) or _META_CHARSET_RE.search(head)
+    if match:
+        encoding = match.group(1).decode("ascii")
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            logger.debug(f"Unknown declared encoding {encoding}; using {default}")
+    return default
+
+class HTMLDocument:
+    """Parses an HTML document once and serves every extraction from that tree.
+
+    Metadata, headings, links, images, tables, plain text and the
+    trafilatura main-content pass all read the same ``lxml`` tree; the raw
+    markup is never parsed a second time.
+    """
+
+    def __init__(self, html_content: Union[str, bytes], source: Optional[str] = None):
+        if isinstance(html_content, str):
+            html_content = html_content.encode("utf-8")
+            self.encoding = "utf-8"
+        else:
+            self.encoding = declared_encoding(html_content)
+        self._raw = html_content
+        if html_content.strip():
+            self.tree = lxml.html.document_fromstring(
+                html_content, parser=lxml.html.HTMLParser(encoding=self.encoding)
+            )
+        else:
+            logger.warning(f"Empty HTML document{f' {source}' if source else ''}; extracting an empty tree")
+            self.tree = lxml.html.document_fromstring("<html></html>")
+        self._meta: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def from_file(cls, file_path: Path) -> "HTMLDocument":
+        """Parse a file from its bytes, so the declared encoding is honoured."""
+        with open(file_path, "rb") as f:
+            return cls(f.read(), source=str(file_path))
+
+    @property
+    def html_content(self) -> str:
+        """The markup as text, decoded with the document's encoding."""
+        return self._raw.decode(self.encoding, errors="replace")
+
+    @staticmethod
+    def text_of(element: etree._Element, separator: str = "") -> str:
+        """Concatenate the stripped text of an element, skipping empty strings."""
+        return separator.join(
+            text for text in (piece.strip() for piece in element.itertext()) if text
+        )
+
+    def title(self) -> Optional[str]:
+        title = self.tree.find(".//title")
+        return title.text_content() if title is not None else None
+
+    def meta(self) -> Dict[str, str]:
+        """Get ``<meta name=... content=...>`` pairs, collected in one pass."""
+        if self._meta is None:
+            self._meta = {}
+            for element in self.tree.iter("meta"):
+                name = element.get("name")
+                if name and name.lower() not in self._meta:
+                    self._meta[name.lower()] = element.get("content")
+        return self._meta
+
+    def metadata(self) -> Dict[str, Optional[str]]:
+        meta = self.meta()
+        return {
+            "title": self.title(),
+            "meta_description": meta.get("description"),
+            "meta_keywords": meta.get("keywords")
+        }
+
+    def headings(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "level": int(heading.tag[1]),
+                "text": self.text_of(heading),
+                "id": heading.get("id", "")
+            }
+            for heading in self.tree.iter(*HEADING_TAGS)
+        ]
+
+    def links(self) -> List[Dict[str, Any]]:
+        links = []
+        for link in self.tree.iter("a"):
+            href = link.get("href", "")
+            links.append({
+                "text": self.text_of(link),
+                "href": href,
+                "title": link.get("title", ""),
+                "is_external": href.startswith(("http", "https"))
+            })
+        return links
+
+    def images(self) -> List[Dict[str, str]]:
+        return [
+            {
+                "src": image.get("src", ""),
+                "alt": image.get("alt", ""),
+                "title": image.get("title", ""),
+                "width": image.get("width", ""),
+                "height": image.get("height", "")
+            }
+            for image in self.tree.iter("img")
+        ]
+
+    def tables(self) -> List[Dict[str, Any]]:
+        """Get headers, data rows and caption of every table."""
+        tables = []
+        for table in self.tree.iter("table"):
+            rows = []
+            for row in table.iter("tr"):
+                cells = [self.text_of(cell) for cell in row.iter("td")]
+                if cells:
+                    rows.append(cells)
+            caption = table.find(".//caption")
+            tables.append({
+                "headers": [self.text_of(header) for header in table.iter("th")],
+                "rows": rows,
+                "caption": self.text_of(caption) if caption is not None else None
+            })
+        return tables
+
+    def table_cells(self) -> List[List[List[str]]]:
+        """Get every table as a list of rows of header and data cell text."""
+        return [
+            [[self.text_of(cell) for cell in row.iter("td", "th")] for row in table.iter("tr")]
+            for table in self.tree.iter("table")
+        ]
+
+    def text(self, separator: str = "\n") -> str:
+        """Get the visible text of the document, one stripped string per line."""
+        return separator.join(
+            text for text in (node.strip() for node in _visible_text(self.tree)) if text
+        )
+
+    def main_content(self) -> Optional[str]:
+        """Extract the main article text with trafilatura, reusing the parsed tree."""
+        extractor_registry.load("html_main_content")
+        import trafilatura
+
+        return trafilatura.extract(self.tree)
@@ -0,0 +1,131 @@
+"""Lazy, memory-mapped PDF access with a byte-bounded page cache."""
+
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+import logging
+import mmap
+import sys
+import threading
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+BLOCK_TYPES = {0: "text", 1: "image"}
+
+class LazyPDFDocument:
+    """Read-only PDF opened over a memory map, decoding pages only on demand.
+
+    The file is mapped rather than read, and PyMuPDF parses it straight from
+    the mapping. Decoded page text and layout blocks are kept in an LRU cache
+    bounded by ``max_cache_bytes``.
+    """
+
+    def __init__(self, file_path: Path, max_cache_bytes: int = 32 * 1024 * 1024):
+        self.file_path = Path(file_path)
+        self.max_cache_bytes = max_cache_bytes
+        self._cache: OrderedDict[int, tuple[Dict[str, Any], int]] = OrderedDict()
+        self._cache_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.RLock()
+
+        self._file = open(self.file_path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+            self._doc = fitz.open(stream=self._view, filetype="pdf")
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def page_count(self) -> int:
+        return self._doc.page_count
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._doc.metadata or {}
+
+    def _load_page(self, page_num: int) -> Dict[str, Any]:
+        """Decode text and layout blocks of a zero-based page."""
+        page = self._doc[page_num]
+        blocks = [
+            {
+                "bbox": [x0, y0, x1, y1],
+                "text": text,
+                "type": BLOCK_TYPES.get(block_type, str(block_type))
+            }
+            for x0, y0, x1, y1, text, _, block_type in page.get_text("blocks")
+        ]
+        return {
+            "number": page_num + 1,
+            "text": page.get_text(),
+            "blocks": blocks
+        }
+
+    @staticmethod
+    def _estimate_size(page: Dict[str, Any]) -> int:
+        """Approximate the memory held by a decoded page."""
+        return sys.getsizeof(page["text"]) + sum(
+            sys.getsizeof(block["text"]) + 128 for block in page["blocks"]
+        )
+
+    def get_page(self, page_num: int) -> Dict[str, Any]:
+        """Get a decoded page by zero-based number, using the cache when possible."""
+        if not 0 <= page_num < self.page_count:
+            raise IndexError(f"Page {page_num + 1} out of range (1-{self.page_count})")
+
+        with self._lock:
+            if page_num in self._cache:
+                self._cache.move_to_end(page_num)
+                self._stats["hits"] += 1
+                return self._cache[page_num][0]
+
+            self._stats["misses"] += 1
+            page = self._load_page(page_num)
+            size = self._estimate_size(page)
+            if size <= self.max_cache_bytes:
+                self._cache[page_num] = (page, size)
+                self._cache_bytes += size
+                while self._cache_bytes > self.max_cache_bytes:
+                    _, (_, evicted_size) = self._cache.popitem(last=False)
+                    self._cache_bytes -= evicted_size
+                    self._stats["evictions"] += 1
+            return page
+
+    def get_pages(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """Get decoded pages in the zero-based range ``[start, end)``."""
+        end = min(end, self.page_count)
+        return [self.get_page(page_num) for page_num in range(max(start, 0), end)]
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Get page cache statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "bytes": self._cache_bytes,
+                "max_bytes": self.max_cache_bytes,
+                **self._stats
+            }
+
+    def close(self):
+        """Close the document and release the memory map."""
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+            if getattr(self, "_doc", None) is not None:
+                self._doc.close()
+                self._doc = None
+            if getattr(self, "_view", None) is not None:
+                self._view.release()
+                self._view = None
+            if getattr(self, "_mmap", None) is not None:
+                self._mmap.close()
+                self._mmap = None
+            self._file.close()
+
+    def __enter__(self) -> "LazyPDFDocument":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,167 @@
+"""Markdown conversion that collects document structure in the same pass."""
+
+from typing import Dict, List, Any, Iterable, Tuple
+from dataclasses import dataclass, field
+import re
+import threading
+import xml.etree.ElementTree as etree
+import frontmatter
+import markdown
+from markdown.extensions import Extension
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
+from markdown.preprocessors import Preprocessor
+from markdown.treeprocessors import Treeprocessor
+from markdown.util import HTML_PLACEHOLDER_RE
+
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+@dataclass
+class MarkdownResult:
+    """HTML and structure produced by one conversion."""
+    html: str
+    metadata: Dict[str, Any] = field(default_factory=dict)  # front matter
+    body: str = ""  # source without the front matter
+    headings: List[Dict[str, Any]] = field(default_factory=list)
+    code_blocks: List[Dict[str, str]] = field(default_factory=list)
+    links: List[Dict[str, str]] = field(default_factory=list)
+
+class _FrontMatterPreprocessor(Preprocessor):
+    """Strips YAML front matter from the source and records it."""
+
+    def run(self, lines: List[str]) -> List[str]:
+        if not lines or lines[0].strip() != "---":
+            self.collector.body = "\n".join(lines)
+            return lines
+        metadata, body = frontmatter.parse("\n".join(lines))
+        self.collector.metadata = metadata
+        self.collector.body = body
+        return body.split("\n")
+
+class _FencedCodePreprocessor(Preprocessor):
+    """Records fenced code blocks before ``fenced_code`` stashes them as raw HTML."""
+
+    def run(self, lines: List[str]) -> List[str]:
+        text = "\n".join(lines)
+        for match in FencedBlockPreprocessor.FENCED_BLOCK_RE.finditer(text):
+            language = match.group("lang")
+            if not language and match.group("attrs"):
+                classes = re.findall(r"\.([\w#+-]+)", match.group("attrs"))
+                language = classes[0] if classes else None
+            self.collector.code_blocks.append({
+                "language": language or "text",
+                "content": match.group("code")
+            })
+        return lines
+
+class _IndentedCodeTreeprocessor(Treeprocessor):
+    """Records indented code blocks before ``codehilite`` replaces them."""
+
+    def run(self, root: etree.Element):
+        for pre in root.iter("pre"):
+            code = pre.find("code")
+            if code is not None and code.text is not None:
+                self.collector.code_blocks.append({"language": "text", "content": code.text})
+
+class _StructureTreeprocessor(Treeprocessor):
+    """Records headings and links once inline markup and ``toc`` ids are in place."""
+
+    def _text(self, element: etree.Element) -> str:
+        """Get plain text, swapping raw HTML placeholders for their stripped text."""
+        text = "".join(element.itertext())
+        if "\x02" not in text:
+            return text
+
+        def replace(match: re.Match) -> str:
+            try:
+                raw = self.md.htmlStash.rawHtmlBlocks[int(match.group(1))]
+            except (IndexError, TypeError):
+                return match.group(0)
+            return re.sub(r"<[^>]+>", "", str(raw))
+
+        return HTML_PLACEHOLDER_RE.sub(replace, text)
+
+    def run(self, root: etree.Element):
+        for element in root.iter():
+            if element.tag in HEADING_TAGS:
+                self.collector.headings.append({
+                    "level": int(element.tag[1]),
+                    "text": self._text(element),
+                    "id": element.get("id", "")
+                })
+            elif element.tag == "a":
+                self.collector.links.append({
+                    "text": self._text(element),
+                    "href": element.get("href", "")
+                })
+
+class StructureExtension(Extension):
+    """Registers the collecting hooks on a converter.
+
+    Each hook writes into ``collector``, a ``MarkdownResult`` that is
+    replaced on every ``reset()``.
+    """
+
+    def extendMarkdown(self, md: markdown.Markdown):
+        self.md = md
+        self.collector = MarkdownResult(html="")
+        hooks = [
+            (md.preprocessors, _FrontMatterPreprocessor(md), "collect_front_matter", 40),
+            (md.preprocessors, _FencedCodePreprocessor(md), "collect_fenced_code", 26),
+            # codehilite runs at 30, toc at 5 and unescape at 0
+            (md.treeprocessors, _IndentedCodeTreeprocessor(md), "collect_code", 31),
+            (md.treeprocessors, _StructureTreeprocessor(md), "collect_structure", -1),
+        ]
+        self.hooks = [processor for _, processor, _, _ in hooks]
+        for registry, processor, name, priority in hooks:
+            registry.register(processor, name, priority)
+        self.reset()
+        md.registerExtension(self)
+
+    def reset(self):
+        self.collector = MarkdownResult(html="")
+        for processor in self.hooks:
+            processor.collector = self.collector
+
+class MarkdownPipeline:
+    """Reusable Markdown converter with structure collection.
+
+    Building a ``markdown.Markdown`` with extensions is expensive, so one
+    converter per thread is kept and reset between documents.
+    """
+
+    def __init__(self, extensions: Iterable[str]):
+        self.extensions = list(extensions)
+        self._local = threading.local()
+
+    def _converter(self) -> Tuple[markdown.Markdown, StructureExtension]:
+        converter = getattr(self._local, "converter", None)
+        if converter is None:
+            structure = StructureExtension()
+            md = markdown.Markdown(extensions=[*self.extensions, structure])
+            converter = self._local.converter = (md, structure)
+        return converter
+
+    def convert(self, text: str) -> MarkdownResult:
+        """Convert a document, returning the HTML with the collected structure."""
+        if not text.strip():
+            # Markdown returns early on blank input without running any hooks
+            return MarkdownResult(html="", body=text)
+        md, structure = self._converter()
+        try:
+            html = md.convert(text)
+            result = structure.collector
+            result.html = html
+            return result
+        finally:
+            md.reset()
+
+_pipelines: Dict[Tuple[str, ...], MarkdownPipeline] = {}
+_pipelines_lock = threading.Lock()
+
+def get_pipeline(extensions: Iterable[str]) -> MarkdownPipeline:
+    """Get the shared pipeline for an extension list."""
+    key = tuple(extensions)
+    with _pipelines_lock:
+        if key not in _pipelines:
+            _pipelines[key] = MarkdownPipeline(key)
+        return _pipelines[key]
@@ -1,17 +1,21 @@
 """Core document processing functionality."""
 
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Union
 from pathlib import Path
 import asyncio
 from datetime import datetime
 import logging
 from enum import Enum
 
-from app.core.document.extractors.pdf import PDFExtractor
-from app.core.document.extractors.markdown import MarkdownExtractor
-from app.core.document.extractors.html import HTMLExtractor
+from app.core.document.extractors.registry import extractor_registry
+from app.core.document.profiles import ExtractionProfile, get_profile, DEFAULT_PROFILE
+from app.core.document.budget import ExtractionBudget, BudgetExceeded
+from app.core.document.dedup import DedupConfig, MinHashIndex, DEDUP_OFF, DEDUP_SKIP, cluster_stats
+from app.core.document.chunking import ChunkingConfig, ChunkStore, document_text
+from app.core.document.execution import ExecutionBackend
+from app.core.document.scheduling import BatchScheduler, SchedulingConfig
 from app.utils.file_utils import get_file_type, cleanup_temp_files
-from app.utils.cache_utils import cache_result
+from app.utils.cache_utils import extraction_cache, file_sha256
 from app.utils.performance_utils import timer, memory_usage
 
 logger = logging.getLogger(__name__)
@@ -34,42 +38,116 @@ class DocumentProcessor:
     def __init__(
         self,
         max_concurrent: int = 5,
-        cache_enabled: bool = True
+        cache_enabled: bool = True,
+        parallel_pdf: bool = False,
+        pdf_shard_size: Optional[int] = None,
+        profile: str = DEFAULT_PROFILE,
+        budget: Optional[ExtractionBudget] = None,
+        dedup: Optional[DedupConfig] = None,
+        chunking: Optional[ChunkingConfig] = None,
+        backend: Optional[ExecutionBackend] = None,
+        scheduling: Optional[SchedulingConfig] = None
     ):
         self.max_concurrent = max_concurrent
         self.cache_enabled = cache_enabled
+        self.profile = get_profile(profile)
+        self.budget = budget or ExtractionBudget.from_env()
+        self.dedup = dedup or DedupConfig.from_env()
+        # Signatures of every document seen by this processor, across batches
+        self.dedup_index = MinHashIndex(self.dedup) if self.dedup.action != DEDUP_OFF else None
+        self.chunking = chunking or ChunkingConfig.from_env()
+        # Every extractor parses on this backend, keeping the event loop free
+        self.backend = backend or ExecutionBackend.from_env()
+        self.scheduling = scheduling or SchedulingConfig.from_env()
         self.semaphore = asyncio.Semaphore(max_concurrent)
         
-        # Initialize extractors
-        self.extractors = {
-            DocumentType.PDF: PDFExtractor(),
-            DocumentType.MARKDOWN: MarkdownExtractor(),
-            DocumentType.HTML: HTMLExtractor()
+        # Extractors are imported and created on first use of each type
+        self.extractors: Dict[DocumentType, Any] = {}
+        self._extractor_options = {
+            DocumentType.PDF: {
+                'parallel': parallel_pdf,
+                'shard_size': pdf_shard_size
+            }
         }
     
-    @cache_result
+    def _get_extractor(self, doc_type: DocumentType) -> Optional[Any]:
+        """Get the extractor for a document type, creating it on first use."""
+        extractor = self.extractors.get(doc_type)
+        if extractor is None:
+            try:
+                extractor = extractor_registry.create(
+                    doc_type.value, backend=self.backend, **self._extractor_options.get(doc_type, {})
+                )
+            except KeyError:
+                return None
+            self.extractors[doc_type] = extractor
+        return extractor
+    
     async def process_single_file(
         self,
         file_path: Path,
-        batch_id: Optional[str] = None
+        batch_id: Optional[str] = None,
+        profile: Union[str, ExtractionProfile, None] = None,
+        budget: Optional[ExtractionBudget] = None
     ) -> Dict[str, Any]:
-        """Process a single document file."""
+        """Process a single document file.
+        
+        Extraction results are cached by file content and extractor version,
+        so re-uploads of identical files skip extraction entirely. When the
+        budget runs out, PDFs return the pages completed so far and other
+        documents return no content; either way ``partial`` is set and the
+        result is not cached. ``chunks`` holds the extracted text split into
+        retrieval-sized chunks as offsets.
+        """
         try:
             doc_type = get_file_type(file_path)
-            if doc_type not in DocumentType.__members__:
+            profile = get_profile(profile) if profile else self.profile
+            tracker = self.budget.merge(budget).start()
+            extractor = self._get_extractor(DocumentType(doc_type))
+            if extractor is None:
                 raise ProcessingError(f"Unsupported file type: {doc_type}")
             
-            extractor = self.extractors[DocumentType[doc_type]]
-            with timer(), memory_usage():
-                content = await extractor.extract(file_path)
+            content = None
+            content_sha256 = None
+            if self.cache_enabled or self.dedup_index is not None:
+                content_sha256 = await asyncio.get_running_loop().run_in_executor(
+                    None, file_sha256, file_path
+                )
+            if self.cache_enabled:
+                cache_key = extraction_cache.key(
+                    content_sha256, f"{extractor.name}.{profile.name}", extractor.version
+                )
+                content = await extraction_cache.get(cache_key)
             
-            return {
+            cached = content is not None
+            if not cached:
+                with timer(), memory_usage():
+                    try:
+                        if doc_type == DocumentType.PDF.value:
+                            content = await extractor.extract(file_path, profile, tracker)
+                        else:
+                            content = await tracker.run(extractor.extract(file_path, profile))
+                    except BudgetExceeded:
+                        content = None
+                if self.cache_enabled and not tracker.partial:
+                    await extraction_cache.set(cache_key, content)
+            
+            result = {
                 "file_path": str(file_path),
+                "content_sha256": content_sha256,
                 "doc_type": doc_type,
+                "profile": profile.name,
                 "content": content,
+                "cached": cached,
+                **tracker.summary(),
                 "success": True,
                 "timestamp": datetime.utcnow().isoformat()
             }
+            if self.dedup_index is not None and content and not tracker.partial:
+                await self._check_duplicate(result)
+            if result["content"]:
+                result["chunks"] = await self._chunk(result)
+            return result
             
         except Exception as e:
             logger.error(f"Error processing {file_path}: {str(e)}")
@@ -80,33 +158,79 @@ class DocumentProcessor:
                 "timestamp": datetime.utcnow().isoformat()
             }
     
+    async def _check_duplicate(self, result: Dict[str, Any]):
+        """Mark a result that nearly duplicates an earlier document.
+
+        Documents are indexed by the SHA-256 of their file, so
+        ``duplicate_of`` names the earlier document by content rather than
+        by its upload's temporary path. With the ``skip`` action the
+        duplicate's content is dropped and ``skipped`` is set, so knowledge
+        extraction and tagging skip it.
+        """
+        text, _ = document_text(result["content"])
+        signature = await asyncio.get_running_loop().run_in_executor(
+            None, self.dedup_index.signature, text
+        )
+        if signature is None:
+            return
+        match = self.dedup_index.add(result["content_sha256"], signature)
+        if match is None:
+            return
+        result["duplicate_of"] = match.duplicate_of
+        result["similarity"] = match.similarity
+        if self.dedup.action == DEDUP_SKIP:
+            result["content"] = None
+            result["skipped"] = True
+    
+    async def _chunk(self, result: Dict[str, Any]) -> ChunkStore:
+        """Chunk a result's text into a single-document ``ChunkStore``."""
+        store = ChunkStore(self.chunking)
+        await asyncio.get_running_loop().run_in_executor(
+            None, store.add_content, result["content"], result["file_path"]
+        )
+        return store
+    
     async def process_batch(
         self,
         file_paths: List[Path],
         batch_id: str,
-        status_callback: Callable[[str, Dict[str, Any]], None]
+        status_callback: Callable[[str, Dict[str, Any]], None],
+        profile: Union[str, ExtractionProfile, None] = None,
+        budget: Optional[ExtractionBudget] = None
     ) -> Dict[str, Any]:
-        """Process a batch of documents with progress tracking."""
+        """Process a batch of documents with progress tracking.
+
+        Files are ordered by the processor's scheduling policy; the result
+        reports per-file completion latency under ``scheduling``.
+        """
         total_files = len(file_paths)
         processed = 0
         success_count = 0
         error_count = 0
+        partial_count = 0
+        duplicate_count = 0
         results = []
+        chunks = ChunkStore(self.chunking)
+        
+        scheduler = BatchScheduler(self.scheduling)
         
         try:
             async def process_with_semaphore(file_path: Path):
+                nonlocal processed, success_count, error_count, partial_count, duplicate_count
                 async with self.semaphore:
-                    return await self.process_single_file(file_path, batch_id)
-            
-            tasks = [process_with_semaphore(path) for path in file_paths]
-            for future in asyncio.as_completed(tasks):
-                result = await future
+                    result = await self.process_single_file(file_path, batch_id, profile, budget)
                 processed += 1
                 if result["success"]:
                     success_count += 1
+                    if result["partial"]:
+                        partial_count += 1
+                    if result.get("duplicate_of"):
+                        duplicate_count += 1
                 else:
                     error_count += 1
                 
+                if result.get("chunks") is not None:
+                    chunks.extend(result["chunks"])
                 results.append(result)
                 await status_callback(batch_id, {
                     "status": "processing",
@@ -114,16 +238,25 @@ class DocumentProcessor:
                     "processed_files": processed,
                     "success_count": success_count,
                     "error_count": error_count,
+                    "partial_count": partial_count,
+                    "duplicate_count": duplicate_count,
                     "current_file": result["file_path"],
                     "timestamp": datetime.utcnow().isoformat()
                 })
             
+            # Files run cheapest-first (or in order under FIFO) as workers free up
+            await scheduler.run(file_paths, process_with_semaphore, self.max_concurrent)
+            
             return {
                 "batch_id": batch_id,
                 "total_files": total_files,
                 "processed_files": processed,
                 "success_count": success_count,
                 "error_count": error_count,
+                "partial_count": partial_count,
+                "dedup": cluster_stats(results),
+                "chunks": chunks,
+                "scheduling": scheduler.stats(),
                 "results": results,
                 "timestamp": datetime.utcnow().isoformat()
             }
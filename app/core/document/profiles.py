@@ -0,0 +1,43 @@
+"""Named extraction profiles selecting which extraction stages run."""
+
+from typing import Dict, Union
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    """Switches for the optional stages of document extraction.
+
+    Text is always extracted. Disabled stages are skipped entirely rather
+    than computed and discarded.
+    """
+    name: str
+    structure: bool = True  # headings, links, code blocks, TOC
+    images: bool = True  # image inventory
+    image_bytes: bool = False  # raw image bytes, once per distinct image
+    tables: bool = True  # table detection
+    html: bool = True  # rendered or raw HTML in the output
+
+PROFILES: Dict[str, ExtractionProfile] = {
+    "fast": ExtractionProfile(
+        name="fast",
+        structure=False,
+        images=False,
+        tables=False,
+        html=False
+    ),
+    "standard": ExtractionProfile(name="standard"),
+    "full": ExtractionProfile(name="full", image_bytes=True),
+}
+
+DEFAULT_PROFILE = "standard"
+
+def get_profile(profile: Union[str, ExtractionProfile, None] = None) -> ExtractionProfile:
+    """Resolve a profile name or instance, defaulting to the standard profile."""
+    if isinstance(profile, ExtractionProfile):
+        return profile
+    name = profile or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown extraction profile: {name} (expected one of {', '.join(PROFILES)})"
+        )
+    return PROFILES[name]
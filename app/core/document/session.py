@@ -0,0 +1,251 @@
+"""Per-document PDF extraction session backed by a single PyMuPDF handle."""
+
+from pathlib import Path
+from typing import Dict, List, Any, Optional, AsyncIterator, Union
+import asyncio
+import logging
+import fitz  # PyMuPDF
+
+from app.core.document.execution import ExecutionBackend
+from app.core.document.transfer import SharedHandle, share_texts, received_texts
+from app.core.document.budget import deadline_passed
+
+logger = logging.getLogger(__name__)
+
+# Image formats implied by the PDF stream filter, read without decoding pixels
+IMAGE_FILTER_FORMATS = {
+    "DCTDecode": "jpeg",
+    "JPXDecode": "jpx",
+    "JBIG2Decode": "jb2",
+    "CCITTFaxDecode": "tiff",
+    "FlateDecode": "png",
+    "LZWDecode": "png",
+    "RunLengthDecode": "png",
+}
+
+def extract_page_range(
+    file_path: str,
+    start: int,
+    end: int,
+    deadline: Optional[float] = None
+) -> List[str]:
+    """Extract the text of pages ``[start, end)`` with a private fitz handle.
+
+    Stops before the next page once ``deadline`` has passed, so the result
+    may be shorter than the range. Runs inside worker processes, so it must
+    stay a picklable module-level function.
+    """
+    doc = fitz.open(file_path)
+    try:
+        texts = []
+        for page_num in range(start, end):
+            if deadline_passed(deadline):
+                break
+            texts.append(doc[page_num].get_text())
+        return texts
+    finally:
+        doc.close()
+
+def extract_shared_page_range(
+    file_path: str,
+    start: int,
+    end: int,
+    deadline: Optional[float] = None
+) -> Union[List[str], SharedHandle]:
+    """``extract_page_range`` for worker processes, returning large blocks in shared memory."""
+    return share_texts(extract_page_range(file_path, start, end, deadline))
+
+class PDFSession:
+    """Opens and parses a PDF once and shares the handle between extraction stages.
+
+    Validation, page text, images, TOC, metadata and table detection all read
+    from the same ``fitz.Document``. ``stats`` records how many times the file
+    was opened and how many full-document parses it triggered, including parses
+    performed by external tools such as camelot.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = Path(file_path)
+        self.stats: Dict[str, int] = {"opens": 0, "parses": 0}
+        self._doc: Optional[fitz.Document] = None
+        self._page_text: Dict[int, str] = {}
+        self._toc: Optional[List[list]] = None
+        self._metadata: Optional[Dict[str, Any]] = None
+        self._images: Dict[int, Dict[str, Any]] = {}
+
+    @property
+    def doc(self) -> fitz.Document:
+        """Return the open document, opening it on first access."""
+        if self._doc is None:
+            self._doc = fitz.open(str(self.file_path))
+            self.stats["opens"] += 1
+            self.stats["parses"] += 1
+        return self._doc
+
+    @property
+    def page_count(self) -> int:
+        return self.doc.page_count
+
+    @property
+    def is_encrypted(self) -> bool:
+        return self.doc.is_encrypted
+
+    def page_text(self, page_num: int, cache: bool = True) -> str:
+        """Get the plain text of a zero-based page, extracting it only once.
+
+        Streaming consumers pass ``cache=False`` so page text is not retained
+        for the lifetime of the session.
+        """
+        if page_num in self._page_text:
+            return self._page_text[page_num]
+        text = self.doc[page_num].get_text()
+        if cache:
+            self._page_text[page_num] = text
+        return text
+
+    def page_texts(
+        self,
+        start: int,
+        end: int,
+        cache: bool = True,
+        deadline: Optional[float] = None
+    ) -> List[str]:
+        """Get the text of pages ``[start, end)``, stopping early once ``deadline`` has passed; see ``page_text``."""
+        texts = []
+        for page_num in range(start, end):
+            if deadline_passed(deadline):
+                break
+            texts.append(self.page_text(page_num, cache))
+        return texts
+
+    def toc(self) -> List[list]:
+        """Get the document outline."""
+        if self._toc is None:
+            self._toc = self.doc.get_toc()
+        return self._toc
+
+    def metadata(self) -> Dict[str, Any]:
+        """Get the document information dictionary."""
+        if self._metadata is None:
+            self._metadata = self.doc.metadata or {}
+        return self._metadata
+
+    def page_images(self, page_num: int, include_bytes: bool = False) -> List[Dict[str, Any]]:
+        """List the images placed on a zero-based page.
+
+        Dimensions and format come from the image xref dictionary, so pixels
+        are never decoded. Each xref is inventoried once for the whole
+        document, together with the pages it appears on. Raw image bytes are
+        only extracted when ``include_bytes`` is set, once per xref.
+        """
+        refs = []
+        for index, img in enumerate(self.doc[page_num].get_images(full=True)):
+            xref, _, width, height, bpc, colorspace = img[:6]
+            filter_name = img[8]
+            entry = self._images.get(xref)
+            if entry is None:
+                entry = {
+                    "xref": xref,
+                    "width": width,
+                    "height": height,
+                    "bpc": bpc,
+                    "colorspace": colorspace,
+                    "format": IMAGE_FILTER_FORMATS.get(filter_name, filter_name or "raw"),
+                    "pages": []
+                }
+                if include_bytes:
+                    base_image = self.doc.extract_image(xref)
+                    if base_image:
+                        entry["format"] = base_image["ext"]
+                        entry["image"] = base_image["image"]
+                self._images[xref] = entry
+            if not entry["pages"] or entry["pages"][-1] != page_num + 1:
+                entry["pages"].append(page_num + 1)
+            refs.append({
+                "index": index,
+                "xref": xref,
+                "width": width,
+                "height": height,
+                "format": entry["format"]
+            })
+        return refs
+
+    def image_inventory(self) -> List[Dict[str, Any]]:
+        """Get every distinct image seen so far, in first-appearance order."""
+        return list(self._images.values())
+
+    def record_open(self, stage: str, count: int = 1):
+        """Record documents opened outside the shared handle, e.g. by worker processes."""
+        self.stats["opens"] += count
+        self.stats["parses"] += count
+        logger.debug(f"{self.file_path.name}: {count} external open(s) by {stage}")
+
+    def record_parse(self, stage: str):
+        """Record a full-document parse performed outside the shared handle."""
+        self.stats["parses"] += 1
+        logger.debug(f"{self.file_path.name}: external parse by {stage}")
+
+    def close(self):
+        """Close the underlying document and drop cached page data."""
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+        self._page_text.clear()
+        self._images.clear()
+
+    def __enter__(self) -> "PDFSession":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+async def iter_page_texts(
+    session: PDFSession,
+    backend: ExecutionBackend,
+    cache: bool = True,
+    deadline: Optional[float] = None
+) -> AsyncIterator[str]:
+    """Yield page text in page order, extracting ``backend.page_block`` pages per task.
+
+    With the process backend each block is read by a worker with its own
+    handle and the next block is already requested while the current one
+    is consumed; large blocks come back in shared memory, which is freed
+    as soon as the block's pages have been yielded. Otherwise blocks are read from the session handle one at a
+    time, since a fitz document must not be used by two threads at once.
+    Closing the iterator early cancels a block that has not started.
+    Blocks stop between pages once ``deadline`` has passed, and iteration
+    ends after the first block that came back short.
+    """
+    page_count = session.page_count
+    blocks = [
+        (start, min(start + backend.page_block, page_count))
+        for start in range(0, page_count, backend.page_block)
+    ]
+    if not backend.in_process:
+        for start, end in blocks:
+            texts = await backend.run_local(session.page_texts, start, end, cache, deadline)
+            for text in texts:
+                yield text
+            if len(texts) < end - start:
+                return
+        return
+
+    def request(block):
+        session.record_open('page_blocks')
+        return asyncio.ensure_future(
+            backend.run_shared(extract_shared_page_range, str(session.file_path), *block, deadline)
+        )
+
+    pending = request(blocks[0]) if blocks else None
+    try:
+        for index, (start, end) in enumerate(blocks):
+            result = await pending
+            pending = request(blocks[index + 1]) if index + 1 < len(blocks) else None
+            with received_texts(result) as texts:
+                for text in texts:
+                    yield text
+                if len(texts) < end - start:
+                    return
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -0,0 +1,114 @@
+"""Persistent storage for uploaded documents."""
+
+from pathlib import Path
+from typing import Dict, Optional, Set, TYPE_CHECKING
+from collections import OrderedDict
+import asyncio
+import logging
+import shutil
+import threading
+import uuid
+
+from app.core.document.extractors.registry import extractor_registry
+
+if TYPE_CHECKING:
+    from app.core.document.lazy import LazyPDFDocument
+
+logger = logging.getLogger(__name__)
+
+class DocumentStore:
+    """Keeps uploaded files on disk and serves lazy page access to stored PDFs."""
+
+    def __init__(
+        self,
+        root: Path,
+        max_open_documents: int = 16,
+        max_cache_bytes: int = 32 * 1024 * 1024
+    ):
+        self.root = root
+        self.max_open_documents = max_open_documents
+        self.max_cache_bytes = max_cache_bytes
+        self._open_documents: OrderedDict[str, 'LazyPDFDocument'] = OrderedDict()
+        # Requests using each checked-out document, and evicted ones waiting for them
+        self._users: Dict['LazyPDFDocument', int] = {}
+        self._evicted: Set['LazyPDFDocument'] = set()
+        self._lock = threading.Lock()
+
+    async def add(self, source: Path, filename: Optional[str] = None) -> str:
+        """Copy a file into the store and return its document ID."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        document_id = uuid.uuid4().hex
+        suffix = Path(filename).suffix if filename else source.suffix
+        destination = self.root / f"{document_id}{suffix.lower()}"
+
+        await asyncio.get_running_loop().run_in_executor(
+            None, shutil.copyfile, source, destination
+        )
+        return document_id
+
+    def path_for(self, document_id: str) -> Optional[Path]:
+        """Get the stored file for a document ID, if it exists."""
+        if not document_id.isalnum():
+            return None
+        return next(self.root.glob(f"{document_id}.*"), None)
+
+    def open_pdf(self, document_id: str) -> 'LazyPDFDocument':
+        """Check out a lazily opened stored PDF, keeping recently used ones open.
+
+        Every call must be paired with ``release``. A document evicted from
+        the open set while requests still use it is closed by its last
+        release rather than under them.
+        """
+        with self._lock:
+            document = self._open_documents.get(document_id)
+            if document is not None:
+                self._open_documents.move_to_end(document_id)
+            else:
+                path = self.path_for(document_id)
+                if path is None:
+                    raise KeyError(f"Unknown document: {document_id}")
+                if path.suffix != ".pdf":
+                    raise ValueError(f"Document {document_id} is not a PDF")
+
+                extractor_registry.load("pdf")
+                from app.core.document.lazy import LazyPDFDocument
+
+                document = LazyPDFDocument(path, self.max_cache_bytes)
+                self._open_documents[document_id] = document
+            self._users[document] = self._users.get(document, 0) + 1
+            while len(self._open_documents) > self.max_open_documents:
+                _, evicted = self._open_documents.popitem(last=False)
+                if evicted in self._users:
+                    self._evicted.add(evicted)
+                else:
+                    evicted.close()
+            return document
+
+    def release(self, document: 'LazyPDFDocument'):
+        """Return a document checked out with ``open_pdf``."""
+        with self._lock:
+            users = self._users.pop(document) - 1
+            if users:
+                self._users[document] = users
+            elif document in self._evicted:
+                self._evicted.discard(document)
+                document.close()
+
+    def close(self):
+        """Close every open document."""
+        with self._lock:
+            for document in (*self._open_documents.values(), *self._evicted):
+                document.close()
+            self._open_documents.clear()
+            self._evicted.clear()
+            self._users.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get open-document statistics."""
+        return {
+            "open_documents": len(self._open_documents),
+            "max_open_documents": self.max_open_documents
+        }
+
+# Global document store instance
+document_store = DocumentStore(Path("data/documents"))
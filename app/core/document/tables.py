@@ -0,0 +1,265 @@
+"""Document-level PDF table detection with a geometric per-page prefilter."""
+
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, field
+from collections import defaultdict, Counter
+import logging
+import fitz  # PyMuPDF
+
+from app.core.document.session import PDFSession
+from app.core.document.execution import ExecutionBackend
+from app.core.document.transfer import share_object, received_object
+from app.core.document.extractors.registry import extractor_registry
+from app.core.document.budget import deadline_passed
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class DetectedTable:
+    """A table read by camelot, as plain data that can leave a worker process."""
+    page: int  # one-based
+    data: List[List[str]]
+    bbox: tuple  # x1, y1, x2, y2
+    shape: tuple
+    accuracy: float
+    whitespace: float
+
+def read_table_records(
+    file_path: str,
+    pages: List[int],
+    flavor: str,
+    deadline: Optional[float] = None,
+    page_group: Optional[int] = None
+) -> List[DetectedTable]:
+    """Run camelot over the given zero-based pages.
+
+    camelot runs once over all pages, or once per ``page_group`` pages when
+    a group size is given; with a ``deadline``, groups not started before
+    it passed are skipped. Runs inside worker processes with the process
+    backend, so it must stay a picklable module-level function.
+    """
+    if not pages:
+        return []
+    # camelot (with pandas and OpenCV) is imported on the first table pass
+    extractor_registry.load("pdf_tables")
+    import camelot
+
+    page_group = page_group or len(pages)
+    records = []
+    for start in range(0, len(pages), page_group):
+        if deadline_passed(deadline):
+            break
+        records.extend(
+            DetectedTable(
+                page=int(table.page),
+                data=table.data,
+                bbox=table._bbox,
+                shape=table.shape,
+                accuracy=table.accuracy,
+                whitespace=table.whitespace
+            )
+            for table in camelot.read_pdf(
+                file_path,
+                pages=",".join(str(page_num + 1) for page_num in pages[start:start + page_group]),
+                flavor=flavor
+            )
+        )
+    return records
+
+def read_shared_table_records(
+    file_path: str,
+    pages: List[int],
+    flavor: str,
+    deadline: Optional[float] = None,
+    page_group: Optional[int] = None
+) -> Any:
+    """``read_table_records`` for worker processes, returning large results in shared memory."""
+    return share_object(read_table_records(file_path, pages, flavor, deadline, page_group))
+
+@dataclass
+class TableDetectionResult:
+    """Outcome of one table detection pass over a document."""
+    tables: List[DetectedTable] = field(default_factory=list)
+    candidate_pages: List[int] = field(default_factory=list)  # zero-based
+    skipped_pages: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        """Get detection counters for inclusion in extraction output."""
+        return {
+            "candidate_pages": [page_num + 1 for page_num in self.candidate_pages],
+            "skipped_pages": self.skipped_pages,
+            "tables_found": len(self.tables)
+        }
+
+class TableDetector:
+    """Runs camelot at most once per flavor and document, only on pages that look tabular.
+
+    Pages are prefiltered with data PyMuPDF already has: ruling lines from
+    ``page.get_drawings()`` and runs of rows whose word boxes from
+    ``page.get_text("words")`` start or end at the same columns. Everything
+    else, including plain prose, is skipped. Ruled pages are read with
+    ``flavor``; pages with aligned text but no rules are read with camelot's
+    ``stream`` flavor, because ``lattice`` only finds tables from their
+    ruling lines.
+
+    Under a time budget camelot reads ``deadline_page_group`` pages per
+    call, so the worker stops within one group of the deadline instead of
+    finishing every candidate page after the budget gave up on it.
+    """
+
+    def __init__(
+        self,
+        flavor: str = "lattice",
+        min_ruling_lines: int = 3,
+        min_aligned_rows: int = 4,
+        min_shared_columns: int = 3,
+        alignment_tolerance: float = 1.0,
+        deadline_page_group: int = 8
+    ):
+        self.flavor = flavor
+        self.deadline_page_group = deadline_page_group
+        self.min_ruling_lines = min_ruling_lines
+        self.min_aligned_rows = min_aligned_rows
+        self.min_shared_columns = min_shared_columns
+        self.alignment_tolerance = alignment_tolerance
+
+    def _count_ruling_lines(self, page: fitz.Page) -> Dict[str, int]:
+        """Count horizontal and vertical strokes drawn on the page."""
+        horizontal = vertical = 0
+        for drawing in page.get_drawings():
+            for item in drawing["items"]:
+                if item[0] == "l":
+                    start, end = item[1], item[2]
+                    if abs(start.y - end.y) < 1:
+                        horizontal += 1
+                    elif abs(start.x - end.x) < 1:
+                        vertical += 1
+                elif item[0] == "re":
+                    rect = item[1]
+                    if rect.height < 2:
+                        horizontal += 1
+                    elif rect.width < 2:
+                        vertical += 1
+                    else:
+                        horizontal += 2
+                        vertical += 2
+        return {"horizontal": horizontal, "vertical": vertical}
+
+    def _count_aligned_rows(self, page: fitz.Page) -> int:
+        """Count text rows in runs of consecutive rows whose words line up in columns.
+
+        Columns are positions where words start, for left-aligned cells, or
+        end, for right-aligned numbers. A run continues while the next row
+        shares at least ``min_shared_columns`` start columns, or as many end
+        columns, with every row of the run so far; only runs of
+        ``min_aligned_rows`` rows count. The text margins, the most common
+        row start and the rightmost word end, are not columns. Table cells
+        line up exactly, while words in prose, even justified, rarely line
+        up at three places on consecutive rows.
+        """
+        tolerance = self.alignment_tolerance
+        rows: Dict[int, tuple] = defaultdict(lambda: (set(), set()))
+        for x0, _, x1, y1, *_ in page.get_text("words"):
+            starts, ends = rows[round(y1 / tolerance)]
+            starts.add(round(x0 / tolerance))
+            ends.add(round(x1 / tolerance))
+        if not rows:
+            return 0
+
+        left = Counter(min(starts) for starts, _ in rows.values()).most_common(1)[0][0]
+        right = max(max(ends) for _, ends in rows.values())
+        margins = ({left - 1, left, left + 1}, {right - 1, right, right + 1})
+
+        def line_up(shared: set, columns: set) -> set:
+            # Columns of the run that this row also has, allowing one bucket of jitter
+            return {x for x in shared if x in columns or x - 1 in columns or x + 1 in columns}
+
+        aligned = run = 0
+        shared = (set(), set())
+        for y in sorted(rows):
+            columns = tuple(edges - margin for edges, margin in zip(rows[y], margins))
+            still_shared = tuple(line_up(edges, row_edges) for edges, row_edges in zip(shared, columns))
+            if any(len(edges) >= self.min_shared_columns for edges in still_shared):
+                run += 1
+                shared = still_shared
+                continue
+            if run >= self.min_aligned_rows:
+                aligned += run
+            run, shared = 1, columns
+        if run >= self.min_aligned_rows:
+            aligned += run
+        return aligned
+
+    def page_flavor(self, page: fitz.Page) -> Optional[str]:
+        """Cheap check for whether a page may contain a table, and the camelot flavor to read it with."""
+        lines = self._count_ruling_lines(page)
+        if lines["horizontal"] >= self.min_ruling_lines:
+            return self.flavor
+        if lines["horizontal"] >= 2 and lines["vertical"] >= 2:
+            return self.flavor
+        if self._count_aligned_rows(page) >= self.min_aligned_rows:
+            return "stream"
+        return None
+
+    def is_candidate(self, page: fitz.Page) -> bool:
+        """Cheap check for whether a page may contain a table."""
+        return self.page_flavor(page) is not None
+
+    def candidate_flavors(self, session: PDFSession, page_limit: Optional[int] = None) -> Dict[int, str]:
+        """Get the zero-based pages that pass the prefilter, with the flavor to read each with.
+
+        ``page_limit`` restricts detection to the first pages, e.g. the ones
+        completed before an extraction budget ran out.
+        """
+        doc = session.doc
+        page_count = session.page_count if page_limit is None else min(page_limit, session.page_count)
+        flavors = {}
+        for page_num in range(page_count):
+            flavor = self.page_flavor(doc[page_num])
+            if flavor is not None:
+                flavors[page_num] = flavor
+        return flavors
+
+    def candidate_pages(self, session: PDFSession, page_limit: Optional[int] = None) -> List[int]:
+        """Get the zero-based pages that pass the prefilter."""
+        return list(self.candidate_flavors(session, page_limit))
+
+    async def detect(
+        self,
+        session: PDFSession,
+        backend: Optional[ExecutionBackend] = None,
+        page_limit: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> TableDetectionResult:
+        """Prefilter pages, then extract tables from the candidates in one batch.
+
+        The prefilter reads the session handle, so it runs in this process;
+        camelot opens the file itself and runs on ``backend``. With a
+        ``deadline`` (see ``BudgetTracker.deadline``) candidates are read in
+        groups and the worker stops at the first group boundary after it.
+        """
+        backend = backend or ExecutionBackend()
+        flavors = await backend.run_local(self.candidate_flavors, session, page_limit)
+        result = TableDetectionResult(
+            candidate_pages=list(flavors),
+            skipped_pages=session.page_count - len(flavors)
+        )
+        if not flavors:
+            return result
+
+        pages_by_flavor: Dict[str, List[int]] = defaultdict(list)
+        for page_num, flavor in flavors.items():
+            pages_by_flavor[flavor].append(page_num)
+        read = read_shared_table_records if backend.in_process else read_table_records
+        page_group = self.deadline_page_group if deadline is not None else None
+        for flavor, pages in pages_by_flavor.items():
+            try:
+                session.record_parse("camelot")
+                result.tables.extend(received_object(await backend.run_shared(
+                    read, str(session.file_path), pages, flavor, deadline, page_group
+                )))
+            except Exception as e:
+                logger.warning(f"Table extraction ({flavor}) failed for {session.file_path}: {str(e)}")
+        result.tables.sort(key=lambda table: table.page)
+
+        return result
@@ -0,0 +1,177 @@
+"""Streaming, bounded-memory layout scan for plain-text files."""
+
+from pathlib import Path
+from typing import Dict, Any, Tuple
+from dataclasses import dataclass, field
+from array import array
+import mmap
+import re
+
+from app.utils.file_utils import chunk_reader
+
+# A run of lines that each contain something other than whitespace
+_PARAGRAPH_RE = re.compile(rb"(?:^[^\S\n]*\S[^\n]*\n)+", re.MULTILINE)
+
+@dataclass
+class TextLayout:
+    """Counts and, optionally, byte offsets of a text file, without holding its text.
+
+    Offsets are kept in ``array('Q')`` (8 bytes per entry) rather than as
+    lists of line and paragraph strings. They still grow with the file, so
+    extraction scans for counts only and span lookups scan again with
+    ``offsets=True`` when they need them.
+    """
+    size_bytes: int = 0
+    line_count: int = 0
+    word_count: int = 0
+    paragraph_count: int = 0
+    longest_line_bytes: int = 0
+    line_offsets: array = field(default_factory=lambda: array('Q'))  # start of each line
+    paragraph_offsets: array = field(default_factory=lambda: array('Q'))  # flat (start, end) pairs
+
+    def paragraph_span(self, index: int) -> Tuple[int, int]:
+        """Get the ``[start, end)`` byte span of a paragraph, without its final newline."""
+        return self.paragraph_offsets[2 * index], self.paragraph_offsets[2 * index + 1]
+
+    def line_span(self, index: int) -> Tuple[int, int]:
+        """Get the ``[start, end)`` byte span of a line, including its newline."""
+        start = self.line_offsets[index]
+        end = self.line_offsets[index + 1] if index + 1 < self.line_count else self.size_bytes
+        return start, end
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'size_bytes': self.size_bytes,
+            'line_count': self.line_count,
+            'word_count': self.word_count,
+            'paragraph_count': self.paragraph_count,
+            'longest_line_bytes': self.longest_line_bytes,
+            'mean_line_bytes': round(self.size_bytes / self.line_count, 1) if self.line_count else 0
+        }
+
+def _has_text(data: bytes) -> bool:
+    return bool(data) and not data.isspace()
+
+class _LayoutScanner:
+    """Feeds chunks through one pass, carrying only the state of the line in progress."""
+
+    def __init__(self, offsets: bool = True):
+        self.layout = TextLayout()
+        self.offsets = offsets
+        self._offset = 0  # file offset of the next chunk
+        self._in_word = False
+        self._line_start = 0
+        self._line_has_text = False
+        self._paragraph_open = False
+
+    def feed(self, chunk: bytes):
+        layout = self.layout
+        base = self._offset
+        self._offset += len(chunk)
+        layout.size_bytes += len(chunk)
+
+        # Words: split() counts runs of non-whitespace; join runs cut by the chunk boundary
+        words = len(chunk.split())
+        if words and self._in_word and not chunk[:1].isspace():
+            words -= 1
+        layout.word_count += words
+        self._in_word = not chunk[-1:].isspace()
+
+        first_newline = chunk.find(b'\n')
+        if first_newline == -1:
+            self._line_has_text = self._line_has_text or _has_text(chunk)
+            return
+
+        # Finish the line in progress, then the complete lines, then start the next one
+        self._line_has_text = self._line_has_text or _has_text(chunk[:first_newline])
+        self._end_line(base + first_newline)
+        last_newline = chunk.rfind(b'\n')
+        if last_newline > first_newline:
+            self._scan(chunk, first_newline + 1, last_newline + 1, base)
+        self._line_start = base + last_newline + 1
+        self._line_has_text = _has_text(chunk[last_newline + 1:])
+
+    def finish(self) -> TextLayout:
+        if self._line_start < self.layout.size_bytes:
+            self._end_line(self.layout.size_bytes)
+        return self.layout
+
+    def _end_line(self, end: int):
+        """Record the line in progress, which ends at ``end`` (its newline or EOF)."""
+        layout = self.layout
+        if self.offsets:
+            layout.line_offsets.append(self._line_start)
+        layout.line_count += 1
+        layout.longest_line_bytes = max(layout.longest_line_bytes, end - self._line_start)
+        if not self._line_has_text:
+            self._paragraph_open = False
+        elif self._paragraph_open:
+            if self.offsets:
+                layout.paragraph_offsets[-1] = end
+        else:
+            layout.paragraph_count += 1
+            if self.offsets:
+                layout.paragraph_offsets.extend((self._line_start, end))
+            self._paragraph_open = True
+
+    def _scan(self, chunk: bytes, start: int, end: int, base: int):
+        """Record the complete lines in ``chunk[start:end]``, which ends with a newline."""
+        layout = self.layout
+        position = start
+        longest = layout.longest_line_bytes
+        while position < end:
+            if self.offsets:
+                layout.line_offsets.append(base + position)
+            layout.line_count += 1
+            line_end = chunk.find(b'\n', position, end)
+            longest = max(longest, line_end - position)
+            position = line_end + 1
+        layout.longest_line_bytes = longest
+
+        paragraph_end = -1
+        for match in _PARAGRAPH_RE.finditer(chunk, start, end):
+            paragraph_start, paragraph_end = match.span()
+            stop = base + paragraph_end - 1  # before the newline
+            if self._paragraph_open and paragraph_start == start:
+                # Continues the paragraph that ran up to the start of this region
+                if self.offsets:
+                    layout.paragraph_offsets[-1] = stop
+            else:
+                layout.paragraph_count += 1
+                if self.offsets:
+                    layout.paragraph_offsets.extend((base + paragraph_start, stop))
+        self._paragraph_open = paragraph_end == end
+
+async def scan_text(file_path: Path, chunk_size: int = 1024 * 1024, offsets: bool = True) -> TextLayout:
+    """Compute line, word and paragraph counts, and optionally offsets, in one streaming pass.
+
+    Memory use is bounded by ``chunk_size``, plus the offset arrays when
+    ``offsets`` is set. Words are runs of non-ASCII-whitespace bytes;
+    paragraphs are runs of non-blank lines.
+    """
+    scanner = _LayoutScanner(offsets)
+    async for chunk in chunk_reader(file_path, chunk_size):
+        scanner.feed(chunk)
+    return scanner.finish()
+
+def scan_file(file_path: Path, chunk_size: int = 1024 * 1024, offsets: bool = True) -> TextLayout:
+    """Blocking version of ``scan_text`` for running on an executor."""
+    scanner = _LayoutScanner(offsets)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            scanner.feed(chunk)
+    return scanner.finish()
+
+def scan_bytes(data: bytes, offsets: bool = True) -> TextLayout:
+    """Compute the layout of text that is already in memory."""
+    scanner = _LayoutScanner(offsets)
+    scanner.feed(data)
+    return scanner.finish()
+
+def read_span(file_path: Path, start: int, end: int, encoding: str = 'utf-8') -> str:
+    """Read a byte span of a file through a memory map."""
+    with open(file_path, 'rb') as f:
+        if end <= start:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[start:end].decode(encoding, errors='replace')
@@ -0,0 +1,283 @@
+"""Shared-memory transfer of large extraction results from worker processes.
+
+A worker writes a large result into a ``multiprocessing.shared_memory``
+segment and returns only a small ``SharedHandle``; the parent maps the same
+segment instead of receiving the payload through the pool's pipe. Page
+text is stored as UTF-8 with end offsets, so the parent reads each page
+through a memoryview onto the segment and decodes it straight from shared
+memory. Other payloads (table records) are pickled with protocol 5 into
+the segment; buffers that support out-of-band pickling, such as NumPy
+arrays, are written next to the pickle rather than copied into the
+pickle stream first.
+
+The parent owns every segment: it unlinks a segment once the result has
+been consumed, or when the call that produced it was abandoned, and any
+segment still mapped at exit is unlinked then. Segment names start with
+the prefix of the pool that created them, so segments whose handle never
+reached the parent, e.g. because the worker failed after writing them,
+are unlinked when that pool shuts down.
+"""
+
+from typing import Dict, List, Any, Optional, Union, Iterator
+from dataclasses import dataclass
+from concurrent.futures import Future
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from array import array
+import atexit
+import logging
+import multiprocessing
+import os
+import pickle
+import secrets
+import threading
+
+logger = logging.getLogger(__name__)
+
+def _min_shared_bytes() -> int:
+    size = os.getenv("SHARED_RESULT_MIN_BYTES")
+    return int(size) if size else 64 * 1024
+
+# Results smaller than this are cheaper to pickle through the pipe
+SHARED_RESULT_MIN_BYTES = _min_shared_bytes()
+
+TEXTS = "texts"
+PICKLE = "pickle"
+
+SEGMENT_PREFIX = "veda_"
+
+# Where POSIX shared memory segments are listed; only Linux has one
+_SHM_DIR = Path("/dev/shm")
+
+@dataclass(frozen=True)
+class SharedHandle:
+    """Names a segment written by a worker; this is all that crosses the pipe."""
+    name: str
+    size: int
+    kind: str  # TEXTS or PICKLE
+    offsets: Optional[array] = None  # end offset of each text, or of the pickle and each buffer
+
+def _owner_prefix() -> str:
+    """Prefix of segments owned by the parent of this worker, or by this process."""
+    parent = multiprocessing.parent_process()
+    return f"{SEGMENT_PREFIX}{parent.pid if parent else os.getpid()}_"
+
+# Set in pool workers by ``init_worker_segments``
+_segment_prefix: Optional[str] = None
+
+def new_segment_prefix() -> str:
+    """Name prefix for the segments of one new pool of this process."""
+    return f"{SEGMENT_PREFIX}{os.getpid()}_{secrets.token_hex(3)}_"
+
+def init_worker_segments(prefix: str):
+    """Pool initializer: name the segments this worker creates after its pool."""
+    global _segment_prefix
+    _segment_prefix = prefix
+
+def _create_segment(size: int) -> shared_memory.SharedMemory:
+    name = (_segment_prefix or _owner_prefix()) + secrets.token_hex(4)
+    segment = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    # The parent unlinks the segment; the worker's tracker must not do it at exit
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+def share_texts(texts: List[str]) -> Union[List[str], SharedHandle]:
+    """Put a list of texts into shared memory if it is large enough to be worth it.
+
+    Called in the worker; returns the texts unchanged when they are small.
+    """
+    encoded = [text.encode("utf-8", "surrogatepass") for text in texts]
+    size = sum(len(data) for data in encoded)
+    if size < SHARED_RESULT_MIN_BYTES:
+        return texts
+    segment = _create_segment(size)
+    offsets = array('Q')
+    position = 0
+    try:
+        for data in encoded:
+            segment.buf[position:position + len(data)] = data
+            position += len(data)
+            offsets.append(position)
+    finally:
+        segment.close()
+    return SharedHandle(name=segment.name, size=size, kind=TEXTS, offsets=offsets)
+
+def share_object(obj: Any) -> Any:
+    """Pickle an object into shared memory if it is large enough to be worth it.
+
+    Out-of-band buffers are copied into the segment once, after the pickle,
+    instead of into the pickle stream first.
+    """
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    parts = [memoryview(data), *(buffer.raw() for buffer in buffers)]
+    size = sum(part.nbytes for part in parts)
+    if size < SHARED_RESULT_MIN_BYTES:
+        return obj
+    segment = _create_segment(size)
+    offsets = array('Q')
+    position = 0
+    try:
+        for part in parts:
+            segment.buf[position:position + part.nbytes] = part
+            position += part.nbytes
+            offsets.append(position)
+    finally:
+        segment.close()
+    return SharedHandle(name=segment.name, size=size, kind=PICKLE, offsets=offsets)
+
+class SharedResult:
+    """The parent's mapping of a worker's segment.
+
+    For text results it is a sequence: ``view(i)`` is a memoryview of the
+    i-th text's UTF-8 bytes in shared memory and ``result[i]`` decodes it.
+    ``release()`` unmaps and unlinks the segment; views must not be used
+    after that.
+    """
+
+    def __init__(self, handle: SharedHandle):
+        self.handle = handle
+        self._segment = shared_memory.SharedMemory(name=handle.name)
+        self.buffer: Optional[memoryview] = self._segment.buf[:handle.size]
+        _live.add(self)
+
+    def __len__(self) -> int:
+        return len(self.handle.offsets)
+
+    def view(self, index: int) -> memoryview:
+        offsets = self.handle.offsets
+        start = offsets[index - 1] if index else 0
+        return self.buffer[start:offsets[index]]
+
+    def __getitem__(self, index: int) -> str:
+        return str(self.view(index), "utf-8", "surrogatepass")
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def load(self) -> Any:
+        """Unpickle a pickled result directly from shared memory.
+
+        Out-of-band buffers are copied out once, as in-band data would be,
+        so the result does not pin the segment after ``release()``.
+        """
+        offsets = self.handle.offsets
+        if not offsets:
+            return pickle.loads(self.buffer)
+        buffers = [bytearray(self.buffer[start:end]) for start, end in zip(offsets, offsets[1:])]
+        return pickle.loads(self.buffer[:offsets[0]], buffers=buffers)
+
+    def release(self):
+        """Unlink the segment and unmap it once no views remain."""
+        if self.buffer is None:
+            return
+        _live.discard(self)
+        self.buffer.release()
+        self.buffer = None
+        try:
+            self._segment.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            self._segment.close()
+        except BufferError:
+            # A view is still referenced; the mapping goes when it does
+            logger.debug(f"Shared result {self.handle.name} unlinked with views still alive")
+
+    def __enter__(self) -> "SharedResult":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+@contextmanager
+def received_texts(result: Union[List[str], SharedHandle]) -> Iterator:
+    """Give a sequence of texts for a worker result, freeing shared memory afterwards."""
+    if not isinstance(result, SharedHandle):
+        yield result
+        return
+    shared = SharedResult(result)
+    try:
+        yield shared
+    finally:
+        shared.release()
+
+def received_object(result: Any) -> Any:
+    """Get the object a worker returned, unpickling and freeing shared memory if used."""
+    if not isinstance(result, SharedHandle):
+        return result
+    with SharedResult(result) as shared:
+        return shared.load()
+
+def release_handle(result: Any):
+    """Free the segment of a result that will never be consumed."""
+    if isinstance(result, SharedHandle):
+        SharedResult(result).release()
+
+def release_abandoned(future: Future):
+    """Done-callback for worker calls whose caller stopped waiting."""
+    if not future.cancelled() and future.exception() is None:
+        release_handle(future.result())
+
+class _LiveResults:
+    """Segments mapped by this process and not yet released."""
+
+    def __init__(self):
+        self._results: Dict[str, SharedResult] = {}
+        self._lock = threading.Lock()
+
+    def add(self, result: SharedResult):
+        with self._lock:
+            self._results[result.handle.name] = result
+
+    def discard(self, result: SharedResult):
+        with self._lock:
+            self._results.pop(result.handle.name, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            results = list(self._results.values())
+        return {"segments": len(results), "bytes": sum(result.handle.size for result in results)}
+
+    def names(self) -> set:
+        with self._lock:
+            return set(self._results)
+
+    def release_all(self):
+        with self._lock:
+            results = list(self._results.values())
+        for result in results:
+            result.release()
+        release_orphaned(f"{SEGMENT_PREFIX}{os.getpid()}_")
+
+_live = _LiveResults()
+atexit.register(_live.release_all)
+
+def release_orphaned(prefix: str) -> int:
+    """Unlink segments named with ``prefix`` that this process has not mapped.
+
+    Called once the pool that owns ``prefix`` has shut down, when no worker
+    can still hand over a handle. Segments are only listed where the
+    system exposes them (``/dev/shm``); returns the number unlinked.
+    """
+    if not _SHM_DIR.is_dir():
+        return 0
+    mapped = _live.names()
+    released = 0
+    for path in _SHM_DIR.glob(f"{prefix}*"):
+        if path.name in mapped:
+            continue
+        try:
+            path.unlink()
+            released += 1
+        except FileNotFoundError:
+            pass
+    if released:
+        logger.warning(f"Unlinked {released} shared result segments that were never received")
+    return released
+
+def shared_result_stats() -> Dict[str, int]:
+    """Count shared result segments currently mapped by this process."""
+    return _live.stats()
@@ -1,23 +1,27 @@
 """Document processor implementation for handling various document types."""
 
-import fitz  # PyMuPDF
 import logging
-from typing import Dict, List, Optional, BinaryIO, Set
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, AsyncIterator, AsyncIterable, Any, Union, TYPE_CHECKING
+from dataclasses import dataclass, asdict
 from enum import Enum
 import asyncio
 from pathlib import Path
 import tempfile
-import os
-import json
 from datetime import datetime
-import markdown
-from bs4 import BeautifulSoup
-import camelot  # For PDF table extraction
-from concurrent.futures import ThreadPoolExecutor
 import shutil
-import hashlib
-import aiofiles
+
+from app.core.document.profiles import ExtractionProfile, get_profile, DEFAULT_PROFILE
+from app.core.document.budget import ExtractionBudget, BudgetTracker, BudgetExceeded
+from app.core.document.extractors.registry import extractor_registry
+from app.core.document.execution import ExecutionBackend
+from app.core.document.scheduling import BatchScheduler, SchedulingConfig
+from app.core.admission import BatchAdmission
+from app.utils.cache_utils import extraction_cache
+
+if TYPE_CHECKING:
+    # Extraction backends are imported on first use through the registry
+    from app.core.document.session import PDFSession
+    from app.core.document.tables import TableDetector
 
 logger = logging.getLogger(__name__)
 
@@ -52,52 +56,470 @@ class BatchProcessingStatus:
     processed_files: int = 0
     success_count: int = 0
     error_count: int = 0
+    partial_count: int = 0
     current_file: Optional[str] = None
+    current_page: Optional[int] = None
+    current_total_pages: Optional[int] = None
     status: str = 'pending'  # pending, processing, completed, error
     errors: List[Dict[str, str]] = None
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
+    scheduling: Optional[Dict[str, Any]] = None  # policy and per-file completion latency
 
     def __post_init__(self):
         if self.errors is None:
             self.errors = []
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert status to a JSON-serializable dictionary."""
+        data = asdict(self)
+        data['start_time'] = self.start_time.isoformat() if self.start_time else None
+        data['end_time'] = self.end_time.isoformat() if self.end_time else None
+        return data
+
+# Content stages for the non-paginated types. They read the file themselves
+# and are module-level, so the process backend can run them in a worker.
+
+def _extract_markdown_file(file_path: Path, profile: ExtractionProfile) -> Dict:
+    """Extract content from Markdown document."""
+    content = {
+        'text': '',
+        'html': '',
+        'metadata': {},
+        'headers': [],
+        'links': [],
+        'code_blocks': []
+    }
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        markdown_text = f.read()
+
+    content['text'] = markdown_text
+    if not (profile.structure or profile.html):
+        return content
+
+    # Convert Markdown to HTML, collecting structure during conversion
+    extractor_registry.load('markdown')
+    from app.core.document.markdown_pipeline import get_pipeline
+
+    converted = get_pipeline(['fenced_code', 'tables']).convert(markdown_text)
+    content['metadata'] = converted.metadata
+    if profile.html:
+        content['html'] = converted.html
+    if not profile.structure:
+        return content
+
+    content['headers'] = [
+        {'level': heading['level'], 'text': heading['text']}
+        for heading in converted.headings
+    ]
+    content['links'] = [
+        {'text': link['text'], 'url': link['href'] or None}
+        for link in converted.links
+    ]
+    content['code_blocks'] = [
+        {'language': block['language'], 'code': block['content']}
+        for block in converted.code_blocks
+    ]
+
+    return content
+
+def _extract_html_file(file_path: Path, profile: ExtractionProfile) -> Dict:
+    """Extract content from HTML document."""
+    content = {
+        'text': '',
+        'title': '',
+        'headers': [],
+        'links': [],
+        'images': [],
+        'tables': []
+    }
+
+    extractor_registry.load('html')
+    from app.core.document.html_tree import HTMLDocument
+
+    document = HTMLDocument.from_file(file_path)
+    content['title'] = document.title() or ''
+    content['text'] = document.text()
+    if not profile.structure:
+        return content
+
+    content['headers'] = [
+        {'level': heading['level'], 'text': heading['text']}
+        for heading in document.headings()
+    ]
+    content['links'] = [
+        {'text': link['text'], 'url': link['href'] or None}
+        for link in document.links()
+    ]
+    content['images'] = [
+        {'src': image['src'] or None, 'alt': image['alt'], 'title': image['title']}
+        for image in document.images()
+    ]
+    content['tables'] = document.table_cells()
+
+    return content
+
+def _extract_text_file(file_path: Path, max_inline_text: int, chunk_size: int) -> Dict:
+    """Extract content from text document.
+
+    Line, word and paragraph counts and line-length statistics are computed
+    in a single pass that keeps no per-line state, so results stay small
+    for multi-gigabyte logs. Files larger than ``max_inline_text`` are
+    streamed in ``chunk_size`` reads and never held in memory, so ``text``
+    is None for them; line and paragraph spans are computed on demand with
+    ``text_layout.scan_file`` and read back with ``text_layout.read_span``.
+    """
+    extractor_registry.load('text')
+    from app.core.document.text_layout import scan_file, scan_bytes
+
+    if file_path.stat().st_size <= max_inline_text:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        layout = scan_bytes(data, offsets=False)
+        text = data.decode('utf-8')
+    else:
+        layout = scan_file(file_path, chunk_size, offsets=False)
+        text = None
+
+    return {
+        'text': text,
+        **layout.summary()
+    }
+
+def _extract_code_file(file_path: Path, profile: ExtractionProfile) -> Dict:
+    """Extract content from code document.
+
+    Uses the language parser registry for a symbol table with line spans;
+    whole repositories are indexed incrementally by ``code.index.CodeIndexer``.
+    """
+    content = {
+        'text': '',
+        'language': '',
+        'symbols': [],
+        'imports': [],
+        'functions': [],
+        'classes': [],
+        'comments': [],
+        'loc': 0  # Lines of code
+    }
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        code = f.read()
+
+    content['text'] = code
+    extractor_registry.load('code')
+    from app.core.document.code.parsers import parser_for
+
+    parser = parser_for(file_path)
+    if parser is None:
+        # Determine language from file extension
+        content['language'] = file_path.suffix[1:]  # Remove the dot
+        content['loc'] = len([line for line in code.splitlines() if line.strip()])
+        return content
+
+    parsed = parser.parse(code)
+    content['language'] = parsed.language
+    content['loc'] = parsed.loc
+    if not profile.structure:
+        return content
+
+    symbols = [asdict(symbol) for symbol in parsed.symbols]
+    content['symbols'] = symbols
+    content['imports'] = parsed.imports
+    content['functions'] = [symbol for symbol in symbols if symbol['kind'] in ('function', 'method')]
+    content['classes'] = [symbol for symbol in symbols if symbol['kind'] in ('class', 'type')]
+    content['comments'] = parsed.comments
+    if parsed.error:
+        content['parse_error'] = parsed.error
+
+    return content
+
+def assemble_document(records: List[Dict]) -> Dict:
+    """Combine the records of ``stream_document`` into one document result.
+
+    The ``document`` record is returned with its ``content``; for PDFs the
+    content is rebuilt from the ``page`` and ``tables`` records in the shape
+    ``process_document`` returns.
+    """
+    pages = [
+        {key: value for key, value in record.items() if key not in ('type', 'total_pages')}
+        for record in records if record['type'] == 'page'
+    ]
+    tables = next((record for record in records if record['type'] == 'tables'), None)
+    document = next(record for record in records if record['type'] == 'document')
+    result = {key: value for key, value in document.items() if key != 'type'}
+    if result['content'] is None and (pages or tables is not None):
+        content = {
+            'pages': pages,
+            'text': ''.join(page['text'] + "\n\n" for page in pages),
+            'images': document.get('images', []),
+            'tables': []
+        }
+        if tables is not None:
+            content['tables'] = tables['tables']
+            content['table_detection'] = {
+                key: value for key, value in tables.items() if key not in ('type', 'tables')
+            }
+        result['content'] = content
+    return result
+
 class DocumentProcessor:
     """Handles document processing and content extraction."""
 
-    def __init__(self, max_workers: int = 4, chunk_size: int = 1024*1024):
-        """Initialize the document processor."""
+    # Cache identity; bump the version whenever extraction output changes
+    name = "document_processor"
+    version = "8"
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        chunk_size: int = 1024*1024,
+        profile: str = DEFAULT_PROFILE,
+        cache_enabled: bool = True,
+        cache_record_limit: int = 64*1024*1024,
+        budget: Optional[ExtractionBudget] = None,
+        max_inline_text: int = 16*1024*1024,
+        backend: Optional[ExecutionBackend] = None,
+        scheduling: Optional[SchedulingConfig] = None
+    ):
+        """Initialize the document processor.
+
+        Args:
+            max_workers: Maximum number of documents processed concurrently
+            chunk_size: Read size for chunked file access
+            profile: Default extraction profile (fast, standard or full)
+            cache_enabled: Reuse extraction results for files with identical content
+            cache_record_limit: Text size above which streamed documents are not
+                cached, keeping streaming memory bounded
+            budget: Default per-document time/page budget; read from the
+                environment when not given
+            max_inline_text: Plain-text files up to this size also return their
+                full text; larger ones are streamed and return offsets only
+            backend: Where parsing runs (inline, thread or process pool); read
+                from the environment when not given
+            scheduling: Order in which batch files run (shortest estimated
+                job first or FIFO); read from the environment when not given
+        """
         self.max_workers = max_workers
         self.chunk_size = chunk_size
+        self.profile = get_profile(profile)
+        self.cache_enabled = cache_enabled
+        self.cache_record_limit = cache_record_limit
+        self.budget = budget or ExtractionBudget.from_env()
+        self.max_inline_text = max_inline_text
+        self.backend = backend or ExecutionBackend.from_env()
+        self.scheduling = scheduling or SchedulingConfig.from_env()
         self.stats = ProcessingStats()
         self._processing_tasks = {}
         self._cleanup_tasks = set()
         self._temp_dirs: Set[Path] = set()
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
         self._batch_statuses: Dict[str, BatchProcessingStatus] = {}
+        self._table_detector: Optional['TableDetector'] = None
+
+    def _open_pdf(self, file_path: Path) -> 'PDFSession':
+        """Open a PDF session, importing the PDF stack on first use."""
+        extractor_registry.load('pdf')
+        from app.core.document.session import PDFSession
+        return PDFSession(file_path)
+
+    def _get_table_detector(self) -> 'TableDetector':
+        if self._table_detector is None:
+            extractor_registry.load('pdf')
+            from app.core.document.tables import TableDetector
+            self._table_detector = TableDetector()
+        return self._table_detector
+
+    def _resolve_profile(self, profile: Union[str, ExtractionProfile, None] = None) -> ExtractionProfile:
+        """Resolve a per-call profile, falling back to the processor default."""
+        return get_profile(profile) if profile else self.profile
+
+    async def _cache_key(
+        self,
+        file_path: Path,
+        stage: str,
+        profile: ExtractionProfile
+    ) -> Optional[str]:
+        """Build the content-addressed cache key for a file, if caching applies."""
+        if not self.cache_enabled or not file_path.is_file():
+            return None
+        return await extraction_cache.key_for(
+            file_path, f"{self.name}.{stage}.{profile.name}", self.version
+        )
 
-    async def process_document(self, file_path: Path) -> Dict:
-        """Process a single document."""
+    async def process_document(
+        self,
+        file_path: Path,
+        profile: Union[str, ExtractionProfile, None] = None,
+        budget: Optional[ExtractionBudget] = None
+    ) -> Dict:
+        """Process a single document.
+
+        Results are cached by file content, so identical re-uploads return
+        without re-extracting; only the file-system metadata is refreshed.
+
+        Args:
+            file_path: Document to process
+            profile: Extraction profile name or instance; defaults to the
+                processor's profile
+            budget: Limits overriding the processor's default budget. When a
+                limit is hit the pages completed so far are returned with
+                ``partial`` set and the reason in ``partial_reason``.
+        """
+        session = None
         try:
             doc_type = self._determine_document_type(file_path)
+            profile = self._resolve_profile(profile)
+            tracker = self.budget.merge(budget).start()
+
+            cache_key = await self._cache_key(file_path, 'document', profile)
+            if cache_key:
+                cached = await extraction_cache.get(cache_key)
+                if cached is not None:
+                    return {
+                        **cached,
+                        'metadata': {**cached['metadata'], **self._file_metadata(file_path, doc_type)}
+                    }
+
+            # PDFs share one open handle across every stage
+            if doc_type == DocumentType.PDF:
+                session = self._open_pdf(file_path)
             
             # Validate document
-            validation_result = await self._validate_document(file_path, doc_type)
+            validation_result = await self._validate_document(file_path, doc_type, session, profile)
             if not validation_result['is_valid']:
                 raise ValueError(f"Document validation failed: {validation_result['error']}")
 
             # Extract content based on document type
-            content = await self._extract_content(file_path, doc_type)
+            try:
+                content = await self._extract_content(file_path, doc_type, session, profile, tracker)
+            except BudgetExceeded:
+                content = None
 
             # Extract metadata
-            metadata = await self._extract_metadata(file_path, doc_type)
+            metadata = await self._extract_metadata(file_path, doc_type, session)
 
-            return {
+            result = {
                 'content': content,
                 'metadata': metadata,
                 'doc_type': doc_type.value,
-                'validation': validation_result
+                'profile': profile.name,
+                'validation': validation_result,
+                **tracker.summary()
+            }
+            if session is not None:
+                result['session_stats'] = dict(session.stats)
+
+            if cache_key and not tracker.partial:
+                await extraction_cache.set(cache_key, result)
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Error processing document {file_path}: {str(e)}")
+            self.stats.failed_documents += 1
+            self.stats.errors.append(f"{file_path}: {str(e)}")
+            raise
+
+        finally:
+            if session is not None:
+                session.close()
+
+    async def stream_document(
+        self,
+        file_path: Path,
+        profile: Union[str, ExtractionProfile, None] = None,
+        budget: Optional[ExtractionBudget] = None
+    ) -> AsyncIterator[Dict]:
+        """Process a single document, yielding records as they are produced.
+
+        PDFs yield one ``page`` record per page followed by a ``tables``
+        record. Every document ends with a ``document`` record carrying
+        metadata, validation and the ``partial`` budget markers; for
+        non-paginated types it also carries the extracted content.
+        """
+        session = None
+        try:
+            doc_type = self._determine_document_type(file_path)
+            profile = self._resolve_profile(profile)
+            tracker = self.budget.merge(budget).start()
+
+            # Replay cached records for identical content
+            cache_key = await self._cache_key(file_path, 'stream', profile)
+            if cache_key:
+                cached_records = await extraction_cache.get(cache_key)
+                if cached_records is not None:
+                    for record in cached_records:
+                        if record['type'] == 'document':
+                            record = {
+                                **record,
+                                'metadata': {**record['metadata'], **self._file_metadata(file_path, doc_type)}
+                            }
+                        yield record
+                    return
+
+            # Records are kept for the cache only while they stay small
+            records: Optional[List[Dict]] = [] if cache_key else None
+            cached_bytes = 0
+
+            if doc_type == DocumentType.PDF:
+                session = self._open_pdf(file_path)
+
+            validation_result = await self._validate_document(file_path, doc_type, session, profile)
+            if not validation_result['is_valid']:
+                raise ValueError(f"Document validation failed: {validation_result['error']}")
+
+            content = None
+            pages_done = 0
+            if session is not None:
+                async for page_content in self._iter_pdf_pages(session, profile, tracker, cache=False):
+                    pages_done += 1
+                    record = {
+                        'type': 'page',
+                        'total_pages': session.page_count,
+                        **page_content
+                    }
+                    if records is not None:
+                        cached_bytes += len(record['text'])
+                        records = records if cached_bytes <= self.cache_record_limit else None
+                    if records is not None:
+                        records.append(record)
+                    yield record
+                if profile.tables:
+                    try:
+                        record = {
+                            'type': 'tables',
+                            **await tracker.run(self._extract_pdf_tables(session, pages_done, tracker.deadline()))
+                        }
+                        if records is not None:
+                            records.append(record)
+                        yield record
+                    except BudgetExceeded:
+                        pass
+            else:
+                try:
+                    content = await self._extract_content(
+                        file_path, doc_type, profile=profile, tracker=tracker
+                    )
+                except BudgetExceeded:
+                    pass
+
+            record = {
+                'type': 'document',
+                'content': content,
+                'metadata': await self._extract_metadata(file_path, doc_type, session),
+                'doc_type': doc_type.value,
+                'profile': profile.name,
+                'validation': validation_result,
+                **tracker.summary()
             }
+            if session is not None:
+                record['images'] = session.image_inventory()
+                record['session_stats'] = dict(session.stats)
+            if records is not None and not tracker.partial:
+                records.append(record)
+                await extraction_cache.set(cache_key, records)
+            yield record
 
         except Exception as e:
             logger.error(f"Error processing document {file_path}: {str(e)}")
@@ -105,7 +527,17 @@ class DocumentProcessor:
             self.stats.errors.append(f"{file_path}: {str(e)}")
             raise
 
-    async def _validate_document(self, file_path: Path, doc_type: DocumentType) -> Dict:
+        finally:
+            if session is not None:
+                session.close()
+
+    async def _validate_document(
+        self,
+        file_path: Path,
+        doc_type: DocumentType,
+        session: Optional['PDFSession'] = None,
+        profile: Optional[ExtractionProfile] = None
+    ) -> Dict:
         """Validate document before processing."""
         try:
             if not file_path.exists():
@@ -118,7 +550,11 @@ class DocumentProcessor:
 
             # Validate based on document type
             if doc_type == DocumentType.PDF:
-                return await self._validate_pdf(file_path)
+                profile = profile or self.profile
+                if session is not None:
+                    return await self._validate_pdf(session, profile)
+                with self._open_pdf(file_path) as session:
+                    return await self._validate_pdf(session, profile)
             # TODO: Add validation for other document types
 
             return {'is_valid': True}
@@ -126,32 +562,76 @@ class DocumentProcessor:
         except Exception as e:
             return {'is_valid': False, 'error': str(e)}
 
-    async def _validate_pdf(self, file_path: Path) -> Dict:
-        """Validate PDF document."""
+    async def _validate_pdf(self, session: 'PDFSession', profile: ExtractionProfile) -> Dict:
+        """Validate PDF document, opening the session handle off the event loop."""
+        return await self.backend.run_local(self._check_pdf, session, profile)
+
+    def _check_pdf(self, session: 'PDFSession', profile: ExtractionProfile) -> Dict:
         try:
-            doc = fitz.open(file_path)
-            if doc.is_encrypted:
+            if session.is_encrypted:
                 return {'is_valid': False, 'error': 'PDF is encrypted'}
-            if doc.page_count == 0:
+            if session.page_count == 0:
                 return {'is_valid': False, 'error': 'PDF has no pages'}
             
             # Basic structure validation
-            toc = doc.get_toc()
-            metadata = doc.metadata
-            
-            return {
+            metadata = session.metadata()
+            result = {
                 'is_valid': True,
-                'pages': doc.page_count,
-                'has_toc': len(toc) > 0,
+                'pages': session.page_count,
                 'has_metadata': bool(metadata)
             }
+            if profile.structure:
+                result['has_toc'] = len(session.toc()) > 0
+            
+            return result
 
         except Exception as e:
             return {'is_valid': False, 'error': f'PDF validation failed: {str(e)}'}
 
-    async def _extract_pdf_content(self, file_path: Path) -> Dict:
+    async def _iter_pdf_pages(
+        self,
+        session: 'PDFSession',
+        profile: ExtractionProfile,
+        tracker: Optional[BudgetTracker] = None,
+        cache: bool = True
+    ) -> AsyncIterator[Dict]:
+        """Yield the content of each PDF page in order, stopping when the budget runs out.
+
+        Page text is extracted in blocks on the execution backend; the image
+        inventory needs the session handle and is read on the thread pool.
+        """
+        extractor_registry.load('pdf')
+        from app.core.document.session import iter_page_texts
+
+        page_texts = iter_page_texts(session, self.backend, cache, tracker.deadline() if tracker else None)
+        page_num = 0
+        try:
+            async for text in page_texts:
+                if tracker and tracker.check(page_num):
+                    logger.warning(
+                        f"Stopping {session.file_path.name} after {page_num} pages: {tracker.reason}"
+                    )
+                    break
+                yield {
+                    'number': page_num + 1,
+                    'text': text,
+                    'images': (
+                        await self.backend.run_local(session.page_images, page_num, profile.image_bytes)
+                        if profile.images else []
+                    ),
+                    'tables': []
+                }
+                page_num += 1
+        finally:
+            await page_texts.aclose()
+
+    async def _extract_pdf_content(
+        self,
+        session: 'PDFSession',
+        profile: ExtractionProfile,
+        tracker: Optional[BudgetTracker] = None
+    ) -> Dict:
         """Extract content from PDF document."""
-        doc = fitz.open(file_path)
         content = {
             'pages': [],
             'text': '',
@@ -160,71 +640,73 @@ class DocumentProcessor:
             'metadata': {}
         }
 
-        try:
-            # Extract metadata
-            content['metadata'] = doc.metadata
-
-            # Process each page
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                page_content = {
-                    'number': page_num + 1,
-                    'text': page.get_text(),
-                    'images': [],
-                    'tables': []
-                }
-
-                # Extract images
-                for img_index, img in enumerate(page.get_images(full=True)):
-                    xref = img[0]
-                    base_image = doc.extract_image(xref)
-                    if base_image:
-                        image_info = {
-                            'index': img_index,
-                            'width': base_image['width'],
-                            'height': base_image['height'],
-                            'format': base_image['ext']
-                        }
-                        page_content['images'].append(image_info)
-                
-                content['pages'].append(page_content)
-                content['text'] += page_content['text'] + "\n\n"
-                content['images'].extend(page_content['images'])
-
-            # Extract tables using camelot
-            content['tables'] = await self._extract_pdf_tables(file_path)
+        # Extract metadata
+        content['metadata'] = session.metadata()
+
+        # Process each page, joining the text once at the end
+        page_texts = []
+        async for page_content in self._iter_pdf_pages(session, profile, tracker):
+            content['pages'].append(page_content)
+            page_texts.append(page_content['text'] + "\n\n")
+        content['text'] = ''.join(page_texts)
+        content['images'] = session.image_inventory()
+
+        # Extract tables using camelot
+        if profile.tables:
+            tables_stage = self._extract_pdf_tables(
+                session, len(content['pages']), tracker.deadline() if tracker else None
+            )
+            try:
+                table_result = await (tracker.run(tables_stage) if tracker else tables_stage)
+                content['tables'] = table_result.pop('tables')
+                content['table_detection'] = table_result
+            except BudgetExceeded:
+                pass
 
-            return content
+        return content
 
-        finally:
-            doc.close()
-
-    async def _extract_metadata(self, file_path: Path, doc_type: DocumentType) -> Dict:
+    async def _extract_metadata(
+        self,
+        file_path: Path,
+        doc_type: DocumentType,
+        session: Optional['PDFSession'] = None
+    ) -> Dict:
         """Extract metadata from document."""
-        metadata = {
-            'filename': file_path.name,
-            'file_size': file_path.stat().st_size,
-            'created_time': datetime.fromtimestamp(file_path.stat().st_ctime).isoformat(),
-            'modified_time': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
-            'doc_type': doc_type.value
-        }
+        metadata = self._file_metadata(file_path, doc_type)
 
         if doc_type == DocumentType.PDF:
-            doc = fitz.open(file_path)
+            owns_session = session is None
+            session = session or self._open_pdf(file_path)
             try:
-                pdf_metadata = doc.metadata
+                pdf_metadata = session.metadata()
                 metadata.update({
                     'title': pdf_metadata.get('title', ''),
                     'author': pdf_metadata.get('author', ''),
                     'subject': pdf_metadata.get('subject', ''),
                     'keywords': pdf_metadata.get('keywords', ''),
-                    'page_count': doc.page_count
+                    'page_count': session.page_count
                 })
             finally:
-                doc.close()
+                if owns_session:
+                    session.close()
 
         return metadata
 
+    def _file_metadata(self, file_path: Path, doc_type: DocumentType) -> Dict:
+        """Get file-system metadata, which is never cached."""
+        stat = file_path.stat()
+        return {
+            'filename': file_path.name,
+            'file_size': stat.st_size,
+            'created_time': datetime.fromtimestamp(stat.st_ctime).isoformat(),
+            'modified_time': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            'doc_type': doc_type.value
+        }
+
+    def supports(self, file_path: Path) -> bool:
+        """Check whether a file's type can be extracted, judging by its name."""
+        return self._determine_document_type(file_path) != DocumentType.UNKNOWN
+
     def _determine_document_type(self, file_path: Path) -> DocumentType:
         """Determine document type from file extension and content."""
         extension = file_path.suffix.lower()
@@ -244,240 +726,79 @@ class DocumentProcessor:
         """Get current processing statistics."""
         return self.stats
 
-    async def _extract_content(self, file_path: Path, doc_type: DocumentType) -> Dict:
-        """Extract content based on document type."""
+    async def _extract_content(
+        self,
+        file_path: Path,
+        doc_type: DocumentType,
+        session: Optional['PDFSession'] = None,
+        profile: Optional[ExtractionProfile] = None,
+        tracker: Optional[BudgetTracker] = None
+    ) -> Dict:
+        """Extract content based on document type.
+
+        PDFs stop between pages when the budget runs out; other types are
+        extracted in one stage that is abandoned with ``BudgetExceeded``.
+        """
+        profile = profile or self.profile
         if doc_type == DocumentType.PDF:
-            return await self._extract_pdf_content(file_path)
+            if session is not None:
+                return await self._extract_pdf_content(session, profile, tracker)
+            with self._open_pdf(file_path) as session:
+                return await self._extract_pdf_content(session, profile, tracker)
         elif doc_type == DocumentType.MARKDOWN:
-            return await self._extract_markdown_content(file_path)
+            stage = self._run_stage(_extract_markdown_file, 'Markdown', file_path, profile)
         elif doc_type == DocumentType.HTML:
-            return await self._extract_html_content(file_path)
+            stage = self._run_stage(_extract_html_file, 'HTML', file_path, profile)
         elif doc_type == DocumentType.TEXT:
-            return await self._extract_text_content(file_path)
+            stage = self._run_stage(
+                _extract_text_file, 'text', file_path, self.max_inline_text, self.chunk_size
+            )
         elif doc_type == DocumentType.CODE:
-            return await self._extract_code_content(file_path)
+            stage = self._run_stage(_extract_code_file, 'code', file_path, profile)
         else:
             raise ValueError(f"Unsupported document type: {doc_type}")
+        return await (tracker.run(stage) if tracker else stage)
 
-    async def _extract_markdown_content(self, file_path: Path) -> Dict:
-        """Extract content from Markdown document."""
-        content = {
-            'text': '',
-            'html': '',
-            'headers': [],
-            'links': [],
-            'code_blocks': []
-        }
-
-        try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                markdown_text = await f.read()
-
-            # Convert Markdown to HTML
-            html = markdown.markdown(markdown_text, extensions=['fenced_code', 'tables'])
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Extract headers
-            for header in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                content['headers'].append({
-                    'level': int(header.name[1]),
-                    'text': header.get_text()
-                })
-
-            # Extract links
-            for link in soup.find_all('a'):
-                content['links'].append({
-                    'text': link.get_text(),
-                    'url': link.get('href')
-                })
-
-            # Extract code blocks
-            for code in soup.find_all('code'):
-                content['code_blocks'].append({
-                    'language': code.get('class', ['text'])[0],
-                    'code': code.get_text()
-                })
-
-            content['text'] = markdown_text
-            content['html'] = html
-
-            return content
-
-        except Exception as e:
-            logger.error(f"Error processing Markdown file {file_path}: {str(e)}")
-            raise
-
-    async def _extract_html_content(self, file_path: Path) -> Dict:
-        """Extract content from HTML document."""
-        content = {
-            'text': '',
-            'title': '',
-            'headers': [],
-            'links': [],
-            'images': [],
-            'tables': []
-        }
-
-        try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                html_content = await f.read()
-
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # Extract title
-            title_tag = soup.find('title')
-            content['title'] = title_tag.get_text() if title_tag else ''
-
-            # Extract headers
-            for header in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                content['headers'].append({
-                    'level': int(header.name[1]),
-                    'text': header.get_text()
-                })
-
-            # Extract links
-            for link in soup.find_all('a'):
-                content['links'].append({
-                    'text': link.get_text(),
-                    'url': link.get('href')
-                })
-
-            # Extract images
-            for img in soup.find_all('img'):
-                content['images'].append({
-                    'src': img.get('src'),
-                    'alt': img.get('alt', ''),
-                    'title': img.get('title', '')
-                })
-
-            # Extract tables
-            for table in soup.find_all('table'):
-                table_data = []
-                for row in table.find_all('tr'):
-                    row_data = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
-                    table_data.append(row_data)
-                content['tables'].append(table_data)
-
-            # Extract text content
-            content['text'] = soup.get_text(separator='\n', strip=True)
-
-            return content
-
-        except Exception as e:
-            logger.error(f"Error processing HTML file {file_path}: {str(e)}")
-            raise
-
-    async def _extract_text_content(self, file_path: Path) -> Dict:
-        """Extract content from text document."""
-        content = {
-            'text': '',
-            'lines': [],
-            'paragraphs': [],
-            'word_count': 0,
-            'line_count': 0
-        }
-
-        try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                text = await f.read()
-
-            # Split into lines and paragraphs
-            lines = text.splitlines()
-            paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-
-            content['text'] = text
-            content['lines'] = lines
-            content['paragraphs'] = paragraphs
-            content['word_count'] = len(text.split())
-            content['line_count'] = len(lines)
-
-            return content
-
-        except Exception as e:
-            logger.error(f"Error processing text file {file_path}: {str(e)}")
-            raise
-
-    async def _extract_code_content(self, file_path: Path) -> Dict:
-        """Extract content from code document."""
-        content = {
-            'text': '',
-            'language': '',
-            'imports': [],
-            'functions': [],
-            'classes': [],
-            'comments': [],
-            'loc': 0  # Lines of code
-        }
-
+    async def _run_stage(self, stage, kind: str, file_path: Path, *args) -> Dict:
+        """Run a content stage on the execution backend, logging failures."""
         try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                code = await f.read()
-
-            # Determine language from file extension
-            content['language'] = file_path.suffix[1:]  # Remove the dot
-            content['text'] = code
-
-            lines = code.splitlines()
-            content['loc'] = len([line for line in lines if line.strip()])
-
-            # Basic parsing (can be extended based on language)
-            for line in lines:
-                line = line.strip()
-                if line.startswith('import ') or line.startswith('from '):
-                    content['imports'].append(line)
-                elif line.startswith('def '):
-                    content['functions'].append(line)
-                elif line.startswith('class '):
-                    content['classes'].append(line)
-                elif line.startswith('#') or line.startswith('//'):
-                    content['comments'].append(line)
-
-            return content
-
+            return await self.backend.run(stage, file_path, *args)
         except Exception as e:
-            logger.error(f"Error processing code file {file_path}: {str(e)}")
+            logger.error(f"Error processing {kind} file {file_path}: {str(e)}")
             raise
 
-    async def _extract_pdf_tables(self, file_path: Path) -> List[Dict]:
-        """Extract tables from PDF document using camelot."""
+    async def _extract_pdf_tables(
+        self,
+        session: 'PDFSession',
+        page_limit: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> Dict:
+        """Extract tables from PDF document using camelot on candidate pages."""
         tables = []
-        try:
-            # Run table extraction in thread pool to avoid blocking
-            def extract_tables():
-                return camelot.read_pdf(str(file_path), pages='all')
-
-            pdf_tables = await asyncio.get_event_loop().run_in_executor(
-                self._executor, extract_tables
-            )
-
-            for idx, table in enumerate(pdf_tables):
-                tables.append({
-                    'index': idx,
-                    'page': table.page,
-                    'data': table.data,
-                    'shape': table.shape,
-                    'accuracy': table.accuracy,
-                    'whitespace': table.whitespace
-                })
-
-        except Exception as e:
-            logger.error(f"Error extracting tables from PDF {file_path}: {str(e)}")
+        detection = await self._get_table_detector().detect(session, self.backend, page_limit, deadline)
+
+        for idx, table in enumerate(detection.tables):
+            tables.append({
+                'index': idx,
+                'page': table.page,
+                'data': table.data,
+                'shape': table.shape,
+                'accuracy': table.accuracy,
+                'whitespace': table.whitespace
+            })
 
-        return tables
+        return {'tables': tables, **detection.summary()}
 
     async def cleanup(self):
         """Clean up temporary files and resources."""
-        for temp_dir in self._temp_dirs:
+        for temp_dir in list(self._temp_dirs):
             try:
                 if temp_dir.exists():
                     shutil.rmtree(temp_dir)
-                self._temp_dirs.remove(temp_dir)
+                self._temp_dirs.discard(temp_dir)
             except Exception as e:
                 logger.error(f"Error cleaning up temporary directory {temp_dir}: {str(e)}")
 
-        # Shutdown thread pool executor
-        self._executor.shutdown(wait=True)
-
     def _create_temp_dir(self) -> Path:
         """Create a temporary directory for processing."""
         temp_dir = Path(tempfile.mkdtemp())
@@ -486,24 +807,52 @@ class DocumentProcessor:
 
     async def process_batch(
         self,
-        files: List[Path],
+        files: Union[List[Path], AsyncIterable[Path]],
         batch_id: str,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        result_sink: Optional[callable] = None,
+        profile: Optional[str] = None,
+        budget: Optional[ExtractionBudget] = None,
+        done_callback: Optional[callable] = None,
+        admission: Optional[BatchAdmission] = None,
+        window: Optional[int] = None
     ) -> BatchProcessingStatus:
         """Process a batch of documents with progress tracking.
         
+        Documents are streamed page by page, so only a handful of pages per
+        worker are held in memory at once. Files are ordered by the
+        processor's scheduling policy, cheapest first by default.
+
         Args:
-            files: List of file paths to process
+            files: List of file paths to process, or an async iterable that
+                produces them (e.g. archive members as they are unpacked).
+                Paths are pulled only a few ahead of the workers, and
+                ``total_files`` counts the paths received so far.
             batch_id: Unique identifier for the batch
             progress_callback: Optional callback function for progress updates
+            result_sink: Optional async callback receiving ``(file_path, record)``
+                for every record produced by ``stream_document``
+            profile: Extraction profile for every file in the batch
+            budget: Per-document budget for this batch, overriding the
+                processor default. A document that runs out of budget is
+                reported as partial and frees its worker slot immediately.
+            done_callback: Optional async callback receiving ``(file_path,
+                result, error)`` once each file is finished with
+            admission: The batch's admission from the process-wide
+                ``AdmissionController``; each file then also holds one of its
+                global slots, bounding extraction across concurrent batches
+            window: Streamed files pulled ahead of the workers, and so
+                ordered by the scheduler; defaults to the scheduling config
             
         Returns:
             BatchProcessingStatus object
         """
+        streamed = not isinstance(files, list)
+
         # Initialize batch status
         status = BatchProcessingStatus(
             batch_id=batch_id,
-            total_files=len(files),
+            total_files=0 if streamed else len(files),
             start_time=datetime.utcnow()
         )
         self._batch_statuses[batch_id] = status
@@ -513,20 +862,35 @@ class DocumentProcessor:
         temp_dir = self._create_temp_dir()
 
         try:
-            # Process files concurrently with semaphore to limit concurrency
-            semaphore = asyncio.Semaphore(self.max_workers)
-            tasks = []
-
-            async def process_with_semaphore(file_path: Path):
-                async with semaphore:
-                    return await self._process_batch_file(file_path, status, progress_callback)
-
-            for file_path in files:
-                task = asyncio.create_task(process_with_semaphore(file_path))
-                tasks.append(task)
-
-            # Wait for all tasks to complete
-            await asyncio.gather(*tasks)
+            async def process_file(file_path: Path):
+                result, error = None, None
+                try:
+                    if admission is None:
+                        result = await self._process_batch_file(
+                            file_path, status, progress_callback, result_sink, profile, budget
+                        )
+                    else:
+                        async with admission.slot():
+                            result = await self._process_batch_file(
+                                file_path, status, progress_callback, result_sink, profile, budget
+                            )
+                    return result
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    if done_callback:
+                        await done_callback(file_path, result, error)
+
+            def receive(file_path: Path):
+                status.total_files += 1
+
+            # max_workers workers take files cheapest-first (or in order under FIFO)
+            scheduler = BatchScheduler(self.scheduling)
+            try:
+                await scheduler.run(files, process_file, self.max_workers, on_receive=receive, window=window)
+            finally:
+                status.scheduling = scheduler.stats()
 
             # Update final status
             status.status = 'completed'
@@ -544,6 +908,8 @@ class DocumentProcessor:
             raise
 
         finally:
+            if admission is not None:
+                admission.close()
             # Cleanup temporary directory
             await self.cleanup()
 
@@ -551,17 +917,35 @@ class DocumentProcessor:
         self,
         file_path: Path,
         status: BatchProcessingStatus,
-        progress_callback: Optional[callable]
-    ) -> Dict:
-        """Process a single file in a batch."""
+        progress_callback: Optional[callable],
+        result_sink: Optional[callable] = None,
+        profile: Optional[str] = None,
+        budget: Optional[ExtractionBudget] = None
+    ) -> Optional[Dict]:
+        """Process a single file in a batch, forwarding records to the sink."""
         try:
             # Update status
             status.current_file = file_path.name
+            status.current_page = None
+            status.current_total_pages = None
             if progress_callback:
                 await progress_callback(status)
 
-            # Process document
-            result = await self.process_document(file_path)
+            # Stream document records; only the final summary is kept
+            result = None
+            async for record in self.stream_document(file_path, profile, budget):
+                if result_sink:
+                    await result_sink(file_path, record)
+                if record['type'] == 'page':
+                    status.current_file = file_path.name
+                    status.current_page = record['number']
+                    status.current_total_pages = record['total_pages']
+                    if progress_callback:
+                        await progress_callback(status)
+                elif record['type'] == 'document':
+                    result = record
+                    if record['partial']:
+                        status.partial_count += 1
 
             # Update status
             status.processed_files += 1
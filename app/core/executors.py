@@ -0,0 +1,187 @@
+"""Process-wide thread and process pools shared by all processors and agents."""
+
+from typing import Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+import logging
+import os
+import threading
+import time
+
+from app.core.document.transfer import new_segment_prefix, init_worker_segments, release_orphaned
+
+logger = logging.getLogger(__name__)
+
+def default_thread_workers() -> int:
+    """THREAD_POOL_SIZE, or enough threads to overlap I/O with every core busy."""
+    size = os.getenv("THREAD_POOL_SIZE")
+    return int(size) if size else min(32, (os.cpu_count() or 1) + 4)
+
+def default_process_workers() -> int:
+    """PROCESS_POOL_SIZE, or one worker per core."""
+    size = os.getenv("PROCESS_POOL_SIZE")
+    return int(size) if size else os.cpu_count() or 1
+
+class _TaskStats:
+    """Counts tasks submitted to an executor and how long they took.
+
+    Counters are updated from future callbacks, so task time covers
+    queueing as well as running.
+    """
+
+    def _init_stats(self, max_workers: int):
+        self.max_workers = max_workers
+        self.closed = False
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._task_seconds = 0.0
+        self._started_at = time.monotonic()
+
+    def _track(self, submit, fn, args, kwargs) -> Future:
+        submitted_at = time.monotonic()
+        with self._stats_lock:
+            self._submitted += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            future = submit(fn, *args, **kwargs)
+        except BaseException:
+            with self._stats_lock:
+                self._in_flight -= 1
+                self._failed += 1
+            raise
+
+        def done(future: Future):
+            with self._stats_lock:
+                self._in_flight -= 1
+                self._task_seconds += time.monotonic() - submitted_at
+                if future.cancelled() or future.exception() is not None:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+        future.add_done_callback(done)
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        """Get task counts and utilization.
+
+        ``utilization`` is the share of workers busy right now;
+        ``queued`` counts tasks waiting for a free worker.
+        """
+        with self._stats_lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.max_workers),
+                "peak_in_flight": self._peak_in_flight,
+                "utilization": round(min(self._in_flight, self.max_workers) / self.max_workers, 3),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "mean_task_seconds": round(self._task_seconds / finished, 4) if finished else None,
+                "uptime_seconds": round(time.monotonic() - self._started_at, 1)
+            }
+
+class TrackedThreadPoolExecutor(_TaskStats, ThreadPoolExecutor):
+    """Thread pool that reports its utilization; usable as the loop's default executor."""
+
+    def __init__(self, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix="veda-worker")
+        self._init_stats(max_workers)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return self._track(super().submit, fn, args, kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self.closed = True
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+class TrackedProcessPoolExecutor(_TaskStats, ProcessPoolExecutor):
+    """Process pool that reports its utilization.
+
+    Shared result segments created by its workers are named with the pool's
+    ``segment_prefix``; once the pool has shut down, the ones the parent
+    never received are unlinked.
+    """
+
+    def __init__(self, max_workers: int):
+        self.segment_prefix = new_segment_prefix()
+        super().__init__(
+            max_workers=max_workers,
+            initializer=init_worker_segments,
+            initargs=(self.segment_prefix,)
+        )
+        self._init_stats(max_workers)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return self._track(super().submit, fn, args, kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self.closed = True
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+        if wait:
+            release_orphaned(self.segment_prefix)
+
+class ExecutorPools:
+    """The application's shared thread and process pools.
+
+    Started with the application and shut down with it. Code that runs
+    outside the API (CLIs, benchmarks) gets a pool created on first use,
+    and a pool that was shut down is replaced the next time it is asked
+    for. Use ``thread`` for blocking I/O and work that releases the GIL
+    (PyMuPDF, lxml, hashing) and ``process`` for pure-Python CPU work.
+    """
+
+    def __init__(self, thread_workers: Optional[int] = None, process_workers: Optional[int] = None):
+        self.thread_workers = thread_workers or default_thread_workers()
+        self.process_workers = process_workers or default_process_workers()
+        self._thread: Optional[TrackedThreadPoolExecutor] = None
+        self._process: Optional[TrackedProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def thread(self) -> TrackedThreadPoolExecutor:
+        with self._lock:
+            if self._thread is None or self._thread.closed:
+                self._thread = TrackedThreadPoolExecutor(self.thread_workers)
+                logger.info(f"Started thread pool with {self.thread_workers} workers")
+            return self._thread
+
+    @property
+    def process(self) -> TrackedProcessPoolExecutor:
+        with self._lock:
+            if self._process is None or self._process.closed:
+                self._process = TrackedProcessPoolExecutor(self.process_workers)
+                logger.info(f"Started process pool with {self.process_workers} workers")
+            return self._process
+
+    def start(self):
+        """Create both pools; worker processes are spawned as tasks arrive."""
+        self.thread
+        self.process
+
+    def shutdown(self, wait: bool = True):
+        """Shut down both pools, cancelling tasks that have not started."""
+        with self._lock:
+            pools, self._thread, self._process = (self._thread, self._process), None, None
+        for pool in pools:
+            if pool is not None and not pool.closed:
+                pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Shut down executor pools")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get utilization of each pool; pools not started yet report None."""
+        with self._lock:
+            pools = {"thread": self._thread, "process": self._process}
+        return {
+            name: pool.stats() if pool is not None and not pool.closed else None
+            for name, pool in pools.items()
+        }
+
+# Global executor pools instance
+executor_pools = ExecutorPools()
@@ -0,0 +1,518 @@
+"""Durable queue of document jobs in a local SQLite file.
+
+Each uploaded batch is stored with its options and one job per file. A
+consumer leases a job for ``lease_seconds`` and keeps the lease alive with
+heartbeats while it works; a job whose lease runs out, because its
+consumer crashed or was killed, goes back to the queue. Completed jobs keep
+their result, so after a restart a batch resumes with the files that had
+not finished. Jobs that lose their lease ``max_attempts`` times are marked
+failed instead of being retried forever.
+
+The file is opened in WAL mode and every claim runs in an immediate
+transaction, so several consumers, in one process or several on the same
+host, can share one queue.
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Callable, AsyncIterator
+from array import array
+from dataclasses import dataclass
+from contextlib import contextmanager
+from datetime import datetime, date
+from enum import Enum
+from pathlib import Path
+import asyncio
+import json
+import logging
+import numbers
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "pending"
+JOB_LEASED = "leased"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+CONSUMERS_API = "api"  # the API process that accepted a batch extracts it
+CONSUMERS_WORKERS = "workers"  # only ``python -m app.worker`` processes extract
+JOB_CONSUMERS = (CONSUMERS_API, CONSUMERS_WORKERS)
+
+BATCH_QUEUED = "queued"
+BATCH_PROCESSING = "processing"
+BATCH_COMPLETED = "completed"
+
+_BYTE_FORMATS = ('B', 'b', 'c')  # memoryview formats of raw bytes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id TEXT PRIMARY KEY,
+    tenant TEXT,
+    options TEXT NOT NULL,
+    state TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL REFERENCES batches(batch_id),
+    position INTEGER NOT NULL,
+    file_path TEXT NOT NULL,
+    filename TEXT,
+    document_id TEXT,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs(state, lease_expires);
+CREATE INDEX IF NOT EXISTS jobs_by_batch ON jobs(batch_id, position);
+"""
+
+def _is_binary(value: Any) -> bool:
+    """Raw bytes, as opposed to a buffer of typed numbers."""
+    if isinstance(value, memoryview):
+        return value.format in _BYTE_FORMATS
+    return isinstance(value, (bytes, bytearray))
+
+def json_safe(value: Any) -> Any:
+    """Convert an extraction result to plain JSON types.
+
+    Binary data, such as raw image bytes, is left out: mappings drop such
+    keys and sequences drop such items. Typed buffers, such as the
+    ``array`` offsets of text layouts, become lists. Dates and paths become
+    strings; any other type raises ``TypeError`` rather than being stored
+    as its ``repr``.
+    """
+    if value is None or isinstance(value, (str, bool)):
+        return value
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return float(value)
+    if isinstance(value, dict):
+        return {
+            str(key): json_safe(item) for key, item in value.items()
+            if not _is_binary(item)
+        }
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value if not _is_binary(item)]
+    if isinstance(value, (array, memoryview)):
+        return value.tolist()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return json_safe(value.value)
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"Cannot store a value of type {type(value).__name__} in a job result")
+
+def default_owner() -> str:
+    """A consumer ID unique to this process: host, PID and a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+@dataclass
+class Job:
+    """One file of a queued batch, as leased by a consumer."""
+    job_id: int
+    batch_id: str
+    file_path: Path
+    filename: Optional[str]
+    document_id: Optional[str]
+    attempts: int
+    options: Dict[str, Any]
+
+class JobQueue:
+    """SQLite-backed batches and per-file jobs with leases."""
+
+    def __init__(self, path: Path, lease_seconds: float = 60.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    @classmethod
+    def from_env(cls) -> "JobQueue":
+        """Build the queue from JOB_QUEUE_PATH, JOB_LEASE_SECONDS and JOB_MAX_ATTEMPTS."""
+        lease_seconds = os.getenv("JOB_LEASE_SECONDS")
+        max_attempts = os.getenv("JOB_MAX_ATTEMPTS")
+        return cls(
+            Path(os.getenv("JOB_QUEUE_PATH") or "data/jobs.sqlite3"),
+            lease_seconds=float(lease_seconds) if lease_seconds else 60.0,
+            max_attempts=int(max_attempts) if max_attempts else 3
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, created on first use."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    db.executescript(_SCHEMA)
+                    self._schema_ready = True
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the database lock up front."""
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def enqueue_batch(
+        self,
+        batch_id: str,
+        files: List[Dict[str, Any]],
+        options: Dict[str, Any],
+        tenant: Optional[str] = None
+    ):
+        """Store a batch and one pending job per file.
+
+        Each file is a dict with ``file_path`` and optionally ``filename``
+        and ``document_id``; ``file_path`` must outlive a restart.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "INSERT INTO batches (batch_id, tenant, options, state, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (batch_id, tenant, json.dumps(options), BATCH_QUEUED, now, now)
+            )
+            db.executemany(
+                "INSERT INTO jobs (batch_id, position, file_path, filename, document_id, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (batch_id, position, str(file["file_path"]), file.get("filename"),
+                     file.get("document_id"), JOB_PENDING, now)
+                    for position, file in enumerate(files)
+                ]
+            )
+
+    def lease(self, owner: str, batch_id: Optional[str] = None) -> Optional[Job]:
+        """Claim the oldest available job, optionally only from one batch.
+
+        Available means pending, or leased with the lease run out. A job
+        that has already lost its lease ``max_attempts`` times is failed
+        here instead of being handed out again.
+        """
+        now = time.time()
+        batch_filter = " AND batch_id = ?" if batch_id else ""
+        batch_args = (batch_id,) if batch_id else ()
+        with self._transaction() as db:
+            expired = db.execute(
+                f"SELECT job_id, batch_id FROM jobs WHERE state = ? AND lease_expires < ? "
+                f"AND attempts >= ?{batch_filter}",
+                (JOB_LEASED, now, self.max_attempts, *batch_args)
+            ).fetchall()
+            for row in expired:
+                db.execute(
+                    "UPDATE jobs SET state = ?, lease_owner = NULL, error = ?, updated_at = ? WHERE job_id = ?",
+                    (JOB_FAILED, f"Lease expired {self.max_attempts} times", now, row["job_id"])
+                )
+                self._finish_batch_if_done(db, row["batch_id"], now)
+            row = db.execute(
+                f"SELECT jobs.*, batches.options FROM jobs JOIN batches USING (batch_id) "
+                f"WHERE (jobs.state = ? OR (jobs.state = ? AND jobs.lease_expires < ?)){batch_filter} "
+                f"ORDER BY jobs.job_id LIMIT 1",
+                (JOB_PENDING, JOB_LEASED, now, *batch_args)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET state = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE job_id = ?",
+                (JOB_LEASED, owner, now + self.lease_seconds, now, row["job_id"])
+            )
+            db.execute(
+                "UPDATE batches SET state = ?, updated_at = ? WHERE batch_id = ? AND state = ?",
+                (BATCH_PROCESSING, now, row["batch_id"], BATCH_QUEUED)
+            )
+        return Job(
+            job_id=row["job_id"],
+            batch_id=row["batch_id"],
+            file_path=Path(row["file_path"]),
+            filename=row["filename"],
+            document_id=row["document_id"],
+            attempts=row["attempts"] + 1,
+            options=json.loads(row["options"])
+        )
+
+    def heartbeat(self, owner: str) -> int:
+        """Extend every lease held by ``owner``; returns how many were extended."""
+        now = time.time()
+        with self._transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE state = ? AND lease_owner = ?",
+                (now + self.lease_seconds, now, JOB_LEASED, owner)
+            ).rowcount
+
+    def complete(self, job_id: int, owner: str, result: Optional[Dict[str, Any]]) -> bool:
+        """Store a job's result; False if the lease was lost to another consumer.
+
+        The result is stored as JSON without binary data, see ``json_safe``.
+        A result that cannot be stored fails the job instead.
+        """
+        try:
+            encoded = json.dumps(json_safe(result))
+        except (TypeError, ValueError) as e:
+            logger.error(f"Error storing result of job {job_id}: {str(e)}")
+            return self._finish(job_id, owner, JOB_FAILED, error=f"Result could not be stored: {str(e)}")
+        return self._finish(job_id, owner, JOB_DONE, result=encoded)
+
+    def fail(self, job_id: int, owner: str, error: str) -> bool:
+        """Mark a job failed; extraction errors are not retried."""
+        return self._finish(job_id, owner, JOB_FAILED, error=error)
+
+    def _finish(self, job_id: int, owner: str, state: str, result: Optional[str] = None,
+                error: Optional[str] = None) -> bool:
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT batch_id FROM jobs WHERE job_id = ? AND state = ? AND lease_owner = ?",
+                (job_id, JOB_LEASED, owner)
+            ).fetchone()
+            if row is None:
+                return False
+            db.execute(
+                "UPDATE jobs SET state = ?, result = ?, error = ?, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE job_id = ?",
+                (state, result, error, now, job_id)
+            )
+            self._finish_batch_if_done(db, row["batch_id"], now)
+        return True
+
+    def _finish_batch_if_done(self, db: sqlite3.Connection, batch_id: str, now: float):
+        remaining = db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE batch_id = ? AND state IN (?, ?)",
+            (batch_id, JOB_PENDING, JOB_LEASED)
+        ).fetchone()[0]
+        if not remaining:
+            db.execute(
+                "UPDATE batches SET state = ?, updated_at = ? WHERE batch_id = ?",
+                (BATCH_COMPLETED, now, batch_id)
+            )
+
+    def release(self, owner: str) -> int:
+        """Return ``owner``'s leased jobs to the queue, e.g. on shutdown, without charging an attempt."""
+        now = time.time()
+        with self._transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires = NULL, attempts = attempts - 1, "
+                "updated_at = ? WHERE state = ? AND lease_owner = ?",
+                (JOB_PENDING, now, JOB_LEASED, owner)
+            ).rowcount
+
+    def next_lease_expiry(self, batch_id: str, owner: str) -> Optional[float]:
+        """When the first lease held by another consumer on this batch runs out, if any."""
+        row = self._connection().execute(
+            "SELECT MIN(lease_expires) FROM jobs WHERE batch_id = ? AND state = ? AND lease_owner != ?",
+            (batch_id, JOB_LEASED, owner)
+        ).fetchone()
+        return row[0]
+
+    def backlog(self, window_seconds: float = 60.0) -> Dict[str, Any]:
+        """Files waiting and leased across all batches, and the recent finish rate."""
+        db = self._connection()
+        counts = dict(db.execute(
+            "SELECT state, COUNT(*) FROM jobs WHERE state IN (?, ?) GROUP BY state", (JOB_PENDING, JOB_LEASED)
+        ).fetchall())
+        finished = db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN (?, ?) AND updated_at > ?",
+            (JOB_DONE, JOB_FAILED, time.time() - window_seconds)
+        ).fetchone()[0]
+        return {
+            "pending": counts.get(JOB_PENDING, 0),
+            "leased": counts.get(JOB_LEASED, 0),
+            "files_per_second": round(finished / window_seconds, 3)
+        }
+
+    def unfinished_batches(self) -> List[Dict[str, Any]]:
+        """Batches with files still pending or leased, oldest first."""
+        rows = self._connection().execute(
+            "SELECT batch_id, tenant, options FROM batches WHERE state != ? ORDER BY created_at",
+            (BATCH_COMPLETED,)
+        ).fetchall()
+        return [
+            {"batch_id": row["batch_id"], "tenant": row["tenant"], "options": json.loads(row["options"])}
+            for row in rows
+        ]
+
+    def batch_status(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Per-state file counts of a batch, or None if it is unknown."""
+        db = self._connection()
+        batch = db.execute("SELECT * FROM batches WHERE batch_id = ?", (batch_id,)).fetchone()
+        if batch is None:
+            return None
+        counts = dict(db.execute(
+            "SELECT state, COUNT(*) FROM jobs WHERE batch_id = ? GROUP BY state", (batch_id,)
+        ).fetchall())
+        return {
+            "batch_id": batch_id,
+            "status": batch["state"],
+            "total_files": sum(counts.values()),
+            "processed_files": counts.get(JOB_DONE, 0) + counts.get(JOB_FAILED, 0),
+            "success_count": counts.get(JOB_DONE, 0),
+            "error_count": counts.get(JOB_FAILED, 0),
+            "pending_files": counts.get(JOB_PENDING, 0),
+            "leased_files": counts.get(JOB_LEASED, 0),
+            "updated_at": batch["updated_at"]
+        }
+
+    def batch_results(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Each file of a batch with its state and stored result or error."""
+        rows = self._connection().execute(
+            "SELECT * FROM jobs WHERE batch_id = ? ORDER BY position", (batch_id,)
+        ).fetchall()
+        return [
+            {
+                "filename": row["filename"],
+                "document_id": row["document_id"],
+                "state": row["state"],
+                "attempts": row["attempts"],
+                "result": json.loads(row["result"]) if row["result"] else None,
+                "error": row["error"]
+            }
+            for row in rows
+        ]
+
+    def close(self):
+        """Close this thread's connection."""
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+async def leased_files(
+    queue: JobQueue,
+    batch_id: str,
+    owner: str,
+    jobs: Dict[Path, Job]
+) -> AsyncIterator[Path]:
+    """Lease a batch's files one at a time, for ``process_batch`` to stream.
+
+    Leased jobs are recorded in ``jobs`` by path. Once nothing is left to
+    lease, waits for leases that other consumers hold on the batch, in case
+    one of them dies and its files come back.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        job = await loop.run_in_executor(None, queue.lease, owner, batch_id)
+        if job is not None:
+            jobs[job.file_path] = job
+            yield job.file_path
+            continue
+        expiry = await loop.run_in_executor(None, queue.next_lease_expiry, batch_id, owner)
+        if expiry is None:
+            return
+        await asyncio.sleep(min(max(expiry - time.time(), 0.1), queue.lease_seconds))
+
+async def keep_leases(queue: JobQueue, owner: str, stop: asyncio.Event):
+    """Heartbeat ``owner``'s leases every third of the lease time until ``stop`` is set."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), queue.lease_seconds / 3)
+        except asyncio.TimeoutError:
+            try:
+                await loop.run_in_executor(None, queue.heartbeat, owner)
+            except sqlite3.Error as e:
+                logger.error(f"Error renewing job leases: {str(e)}")
+
+async def run_queued_batch(
+    queue: JobQueue,
+    batch_id: str,
+    owner: str,
+    process_batch: Callable[..., Any],
+    done_callback: Optional[Callable] = None,
+    assemble: Optional[Callable[[List[Dict]], Dict]] = None,
+    **batch_options
+) -> Any:
+    """Run a queued batch through ``process_batch``, recording every file in the queue.
+
+    ``process_batch`` is a processor's ``process_batch``; files it finishes
+    are completed or failed in the queue before ``done_callback`` sees them.
+    For processors that stream records to a ``result_sink``, ``assemble``
+    combines each file's records into the result that is stored. Leasing is
+    cheap, so unless a ``window`` is given the scheduler may lease every
+    remaining file of the batch ahead of the workers and order all of them.
+    """
+    loop = asyncio.get_running_loop()
+    jobs: Dict[Path, Job] = {}
+    if "window" not in batch_options:
+        status = await loop.run_in_executor(None, queue.batch_status, batch_id)
+        if status is not None:
+            batch_options["window"] = max(1, status["pending_files"] + status["leased_files"])
+    records: Dict[Path, List[Dict]] = {}
+
+    if assemble is not None:
+        result_sink = batch_options.pop("result_sink", None)
+
+        async def collect(file_path: Path, file_record: Dict):
+            records.setdefault(file_path, []).append(file_record)
+            if result_sink:
+                await result_sink(file_path, file_record)
+
+        batch_options["result_sink"] = collect
+
+    async def record(file_path: Path, result: Optional[Dict], error: Optional[Exception]):
+        file_records = records.pop(file_path, None)
+        if error is None and file_records:
+            result = assemble(file_records)
+        job = jobs.pop(file_path, None)
+        if job is not None:
+            if error is None:
+                kept = await loop.run_in_executor(None, queue.complete, job.job_id, owner, result)
+            else:
+                kept = await loop.run_in_executor(None, queue.fail, job.job_id, owner, str(error))
+            if not kept:
+                logger.warning(f"Lease on {file_path} was lost; its result was discarded")
+        if done_callback:
+            await done_callback(file_path, result, error)
+
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(keep_leases(queue, owner, stop))
+    try:
+        return await process_batch(
+            leased_files(queue, batch_id, owner, jobs),
+            batch_id,
+            done_callback=record,
+            **batch_options
+        )
+    finally:
+        stop.set()
+        await heartbeat
+
+def _job_consumers() -> str:
+    consumers = os.getenv("JOB_CONSUMERS") or CONSUMERS_API
+    if consumers not in JOB_CONSUMERS:
+        raise ValueError(f"JOB_CONSUMERS must be one of {', '.join(JOB_CONSUMERS)}")
+    return consumers
+
+# Whether API processes extract queued batches themselves or leave them to workers
+API_CONSUMES_JOBS = _job_consumers() == CONSUMERS_API
+
+# Consumer ID of this process
+consumer_id = default_owner()
+
+# Global job queue instance
+job_queue = JobQueue.from_env()
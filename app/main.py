@@ -1,17 +1,48 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Dict
+import asyncio
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 
 from app.api.routes import processing, documents
+from app.api.routes.documents import resume_queued_batches
+from app.core.executors import executor_pools
+from app.core.document.extractors.registry import extractor_registry
+from app.core.document.store import document_store
+from app.core.document.transfer import shared_result_stats
+from app.core.admission import admission_controller
+from app.core.job_queue import job_queue, consumer_id
 from app.utils.logging_utils import setup_logging
 
 # Setup logging
 setup_logging()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared worker pools live as long as the app
+    executor_pools.start()
+    asyncio.get_running_loop().set_default_executor(executor_pools.thread)
+    # Extractors load on first use; list document types to load them up front
+    preload = [t.strip() for t in os.getenv("EXTRACTOR_PRELOAD", "").split(",") if t.strip()]
+    if preload:
+        extractor_registry.preload(preload)
+    # Batches interrupted by a crash or restart continue where they stopped
+    await resume_queued_batches()
+    yield
+    document_store.close()
+    # Hand unfinished files back to the queue for the next start
+    job_queue.release(consumer_id)
+    executor_pools.shutdown()
+
 app = FastAPI(
     title="Veda Base",
     description="A next-generation document processing and knowledge management platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -34,5 +65,20 @@ app.include_router(documents.router)
 async def root():
     return {
         "message": "Welcome to Veda Base API",
-        "status": "operational"
-    } 
\ No newline at end of file
+        "status": "operational",
+        "executors": executor_pools.stats(),
+        "admission": admission_controller.stats()
+    }
+
+@app.get("/api/health")
+async def health_check() -> Dict:
+    """Health check endpoint."""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "version": app.version,
+        "extractors": extractor_registry.import_report(),
+        "executors": executor_pools.stats(),
+        "shared_results": shared_result_stats(),
+        "admission": admission_controller.stats()
+    }
@@ -8,6 +8,10 @@ import asyncio
 import json
 from pathlib import Path
 import pickle
+import hashlib
+import os
+import tempfile
+import threading
 from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
@@ -69,7 +73,6 @@ class DiskCache:
     def __init__(self, cache_dir: Path, max_size_mb: int = 1000):
         self.cache_dir = cache_dir
         self.max_size_mb = max_size_mb
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.lock = asyncio.Lock()
         self.metadata: Dict[str, Dict[str, Any]] = self._load_metadata()
     
@@ -98,7 +101,7 @@ class DiskCache:
             
             meta = self.metadata[key]
             if meta.get("expiry") and datetime.now().timestamp() > meta["expiry"]:
-                await self.delete(key)
+                self._delete_unlocked(key)
                 return None
             
             try:
@@ -106,7 +109,7 @@ class DiskCache:
                     return pickle.load(f)
             except Exception as e:
                 logger.error(f"Error reading cache file: {str(e)}")
-                await self.delete(key)
+                self._delete_unlocked(key)
                 return None
     
     async def set(self, key: str, value: Any, ttl: Optional[int] = None):
@@ -115,6 +118,7 @@ class DiskCache:
             cache_path = self._get_cache_path(key)
             
             try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
                 with open(cache_path, 'wb') as f:
                     pickle.dump(value, f)
                 
@@ -126,7 +130,7 @@ class DiskCache:
                 self._save_metadata()
                 
                 # Check and enforce size limit
-                await self._enforce_size_limit()
+                self._enforce_size_limit()
                 
             except Exception as e:
                 logger.error(f"Error writing to cache: {str(e)}")
@@ -136,14 +140,18 @@ class DiskCache:
     async def delete(self, key: str):
         """Remove item from disk cache."""
         async with self.lock:
-            if key in self.metadata:
-                cache_path = self._get_cache_path(key)
-                if cache_path.exists():
-                    cache_path.unlink()
-                del self.metadata[key]
-                self._save_metadata()
+            self._delete_unlocked(key)
+    
+    def _delete_unlocked(self, key: str):
+        """Remove item from disk cache; caller must hold the lock."""
+        if key in self.metadata:
+            cache_path = self._get_cache_path(key)
+            if cache_path.exists():
+                cache_path.unlink()
+            del self.metadata[key]
+            self._save_metadata()
     
-    async def _enforce_size_limit(self):
+    def _enforce_size_limit(self):
         """Enforce cache size limit by removing old entries."""
         total_size = sum(meta["size"] for meta in self.metadata.values())
         max_size_bytes = self.max_size_mb * 1024 * 1024
@@ -157,7 +165,7 @@ class DiskCache:
             
             while total_size > max_size_bytes and sorted_entries:
                 key, meta = sorted_entries.pop(0)
-                await self.delete(key)
+                self._delete_unlocked(key)
                 total_size -= meta["size"]
 
 class CacheManager:
@@ -210,9 +218,178 @@ class CacheManager:
             "size": self.stats["size"]
         }
 
+def file_sha256(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ExtractionCache:
+    """Persistent cache of extraction results keyed by file content.
+    
+    Keys combine the SHA-256 of the file with the extractor name and
+    version, so identical uploads hit regardless of file name, temp path
+    or process restarts, and bumping an extractor version invalidates its
+    entries.
+    
+    Each entry is its own file, written to a temporary name and renamed
+    into place, so API and worker processes can share one directory without
+    an index to keep consistent. The directory is only created by the
+    first store.
+    
+    The directory size is kept as a running total: it is scanned on the
+    first store, then only when the total passes ``max_size_mb`` or every
+    ``rescan_writes`` stores, which picks up entries written or removed by
+    other processes.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: Optional[int] = None,
+        max_size_mb: int = 1000,
+        rescan_writes: int = 100
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size_mb = max_size_mb
+        self.rescan_writes = rescan_writes
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "scans": 0
+        }
+        self._size_lock = threading.Lock()
+        self._total_size: Optional[int] = None  # bytes at the last scan plus stores since
+        self._writes_since_scan = 0
+    
+    @classmethod
+    def from_env(cls) -> "ExtractionCache":
+        """Build the cache from EXTRACTION_CACHE_DIR, EXTRACTION_CACHE_TTL and EXTRACTION_CACHE_MAX_MB."""
+        ttl = os.getenv("EXTRACTION_CACHE_TTL")
+        max_size_mb = os.getenv("EXTRACTION_CACHE_MAX_MB")
+        return cls(
+            Path(os.getenv("EXTRACTION_CACHE_DIR") or "cache/extractions"),
+            ttl=int(ttl) if ttl else None,
+            max_size_mb=int(max_size_mb) if max_size_mb else 1000
+        )
+    
+    async def key_for(self, file_path: Path, extractor_name: str, extractor_version: str) -> str:
+        """Build the cache key for a file and extractor."""
+        content_hash = await asyncio.get_running_loop().run_in_executor(
+            None, file_sha256, file_path
+        )
+        return self.key(content_hash, extractor_name, extractor_version)
+    
+    @staticmethod
+    def key(content_hash: str, extractor_name: str, extractor_version: str) -> str:
+        """Build the cache key from an already computed content hash."""
+        return f"{extractor_name}-{extractor_version}-{content_hash}"
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.cache"
+    
+    def _read(self, key: str) -> Optional[Any]:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                expiry, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading cache file: {str(e)}")
+            entry_path.unlink(missing_ok=True)
+            return None
+        if expiry and datetime.now().timestamp() > expiry:
+            entry_path.unlink(missing_ok=True)
+            return None
+        return value
+    
+    def _write(self, key: str, value: Any):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        expiry = datetime.now().timestamp() + self.ttl if self.ttl else None
+        entry_path = self._entry_path(key)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((expiry, value), f)
+                size = f.tell()
+            try:
+                size -= entry_path.stat().st_size  # the entry it replaces
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_name, entry_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._account(size)
+    
+    def _account(self, added: int):
+        """Add a store to the running size total, scanning the directory only when due."""
+        with self._size_lock:
+            self._writes_since_scan += 1
+            if self._total_size is not None and self._writes_since_scan < self.rescan_writes:
+                self._total_size += added
+                if self._total_size <= self.max_size_mb * 1024 * 1024:
+                    return
+            self._total_size = self._enforce_size_limit()
+            self._writes_since_scan = 0
+    
+    def _enforce_size_limit(self) -> int:
+        """Remove the oldest entries while the directory is over ``max_size_mb``; returns the size left."""
+        self.stats["scans"] += 1
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".cache"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+        max_size_bytes = self.max_size_mb * 1024 * 1024
+        for _, size, path in sorted(entries):
+            if total_size <= max_size_bytes:
+                break
+            Path(path).unlink(missing_ok=True)
+            total_size -= size
+        return total_size
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached extraction result."""
+        result = await asyncio.get_running_loop().run_in_executor(None, self._read, key)
+        if result is not None:
+            self.stats["hits"] += 1
+        else:
+            self.stats["misses"] += 1
+        return result
+    
+    async def set(self, key: str, value: Any):
+        """Store an extraction result."""
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, key, value)
+        except Exception as e:
+            logger.error(f"Error writing to cache: {str(e)}")
+            return
+        self.stats["stores"] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        total = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": (self.stats["hits"] / total * 100) if total > 0 else 0
+        }
+
 # Global cache manager instance
 cache_manager = CacheManager()
 
+# Global extraction result cache instance
+extraction_cache = ExtractionCache.from_env()
+
 def cache_result(
     ttl: Optional[int] = None,
     use_disk: bool = False
@@ -27,7 +27,6 @@ class PerformanceMonitor:
     def __init__(self):
         self.process = psutil.Process()
         self.metrics_history: Dict[str, list] = {}
-        tracemalloc.start()
     
     def get_system_metrics(self) -> Dict[str, Any]:
         """Get current system metrics."""
@@ -94,7 +93,13 @@ class PerformanceMonitor:
         }
     
     def get_memory_snapshot(self) -> Dict[str, Any]:
-        """Get detailed memory usage snapshot."""
+        """Get detailed memory usage snapshot.
+
+        Allocation tracing slows every allocation in the process, so it is
+        only started by the first snapshot request rather than at import.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
         snapshot = tracemalloc.take_snapshot()
         top_stats = snapshot.statistics('lineno')
         
@@ -140,8 +145,17 @@ def timer(operation: Optional[str] = None):
 
 @contextmanager
 def memory_usage():
-    """Context manager for tracking memory usage."""
-    tracemalloc.start()
+    """Context manager for tracking memory usage.
+
+    Only traces allocations when debug logging is enabled, and leaves
+    tracing running if something else started it.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        yield
+        return
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
     
     try:
         yield
@@ -153,7 +167,8 @@ def memory_usage():
         for stat in top_stats[:3]:  # Log top 3 memory users
             logger.debug(f"{stat.size/1024:.1f} KB - {stat.traceback[0]}")
         
-        tracemalloc.stop()
+        if started:
+            tracemalloc.stop()
 
 def track_performance(operation: str):
     """Decorator for tracking function performance."""
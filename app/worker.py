@@ -0,0 +1,140 @@
+"""Standalone extraction worker.
+
+Pulls document jobs from the shared job queue, runs the existing
+extractors through ``DocumentProcessor`` and writes each file's full result
+back to the queue, which doubles as the result store. Run the API with
+``JOB_CONSUMERS=workers`` so that it only accepts uploads and serves status,
+then add extraction capacity by starting more workers on any host that
+sees the same queue and document store::
+
+    python -m app.worker --concurrency 4
+
+The SQLite queue at ``JOB_QUEUE_PATH`` is the local stand-in for a shared
+queue: every worker and API process on one machine can use the same file.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import time
+
+from app.core.document_processor import DocumentProcessor, assemble_document
+from app.core.document.budget import ExtractionBudget
+from app.core.executors import executor_pools
+from app.core.job_queue import JobQueue, Job, job_queue, default_owner, keep_leases
+
+logger = logging.getLogger(__name__)
+
+class Worker:
+    """Consumes jobs from any batch with ``concurrency`` concurrent extractions."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+        processor: Optional[DocumentProcessor] = None,
+        owner: Optional[str] = None
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.processor = processor or DocumentProcessor(max_workers=concurrency)
+        self.owner = owner or default_owner()
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self, stop: asyncio.Event, exit_when_idle: bool = False):
+        """Process jobs until ``stop`` is set, or until the queue is empty if ``exit_when_idle``.
+
+        Jobs already started are finished before returning; leases still
+        held afterwards are handed back to the queue.
+        """
+        heartbeat_stop = asyncio.Event()
+        heartbeat = asyncio.create_task(keep_leases(self.queue, self.owner, heartbeat_stop))
+        logger.info(f"Worker {self.owner} consuming {self.queue.path} with concurrency {self.concurrency}")
+        try:
+            await asyncio.gather(*(self._consume(stop, exit_when_idle) for _ in range(self.concurrency)))
+        finally:
+            heartbeat_stop.set()
+            await heartbeat
+            released = await asyncio.get_running_loop().run_in_executor(None, self.queue.release, self.owner)
+            if released:
+                logger.info(f"Returned {released} leased jobs to the queue")
+
+    async def _consume(self, stop: asyncio.Event, exit_when_idle: bool):
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            job = await loop.run_in_executor(None, self.queue.lease, self.owner)
+            if job is None:
+                if exit_when_idle:
+                    return
+                try:
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._process(job)
+
+    async def _process(self, job: Job):
+        """Extract one file and store its full result, pages and tables included, or its error."""
+        loop = asyncio.get_running_loop()
+        options = job.options
+        budget = ExtractionBudget(max_seconds=options.get("max_seconds"), max_pages=options.get("max_pages"))
+        started = time.perf_counter()
+        try:
+            records = [
+                record async for record in
+                self.processor.stream_document(job.file_path, options.get("profile"), budget)
+            ]
+            result = assemble_document(records)
+        except Exception as e:
+            logger.error(f"Error processing {job.filename or job.file_path} of batch {job.batch_id}: {str(e)}")
+            self.failed += 1
+            kept = await loop.run_in_executor(None, self.queue.fail, job.job_id, self.owner, str(e))
+        else:
+            self.completed += 1
+            kept = await loop.run_in_executor(None, self.queue.complete, job.job_id, self.owner, result)
+            logger.info(
+                f"Processed {job.filename or job.file_path.name} of batch {job.batch_id} "
+                f"in {time.perf_counter() - started:.2f} s"
+            )
+        if not kept:
+            logger.warning(f"Lease on {job.file_path} was lost; its result was discarded")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"owner": self.owner, "completed": self.completed, "failed": self.failed}
+
+async def _serve(worker: Worker, exit_when_idle: bool):
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(executor_pools.thread)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await worker.run(stop, exit_when_idle)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run an extraction worker on the shared job queue")
+    parser.add_argument("--concurrency", type=int, default=2, help="Files extracted at once")
+    parser.add_argument("--queue", type=Path, help="Job queue file (default: JOB_QUEUE_PATH)")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls when idle")
+    parser.add_argument("--exit-when-idle", action="store_true", help="Stop once no job is available")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    queue = job_queue
+    if args.queue is not None:
+        queue = JobQueue(args.queue, job_queue.lease_seconds, job_queue.max_attempts)
+    worker = Worker(queue, args.concurrency, args.poll_interval)
+    try:
+        asyncio.run(_serve(worker, args.exit_when_idle))
+    finally:
+        executor_pools.shutdown()
+    print(json.dumps(worker.stats()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""Offline benchmarks for the document extraction pipeline.
+
+Run ``python -m benchmarks.run --help`` from the repository root.
+"""
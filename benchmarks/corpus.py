@@ -0,0 +1,183 @@
+"""Deterministic synthetic corpus for extractor benchmarks.
+
+Every document is generated from a seeded ``random.Random``, so the same seed
+and scale always produce the same content and runs can be compared over time.
+Nothing is downloaded.
+"""
+
+from pathlib import Path
+from typing import Dict, List
+from dataclasses import dataclass
+import random
+import fitz  # PyMuPDF
+
+WORDS = (
+    "knowledge document extraction pipeline vector graph agent semantic index "
+    "query latency throughput memory page table image section summary context "
+    "retrieval embedding chunk token batch stream cache profile budget worker "
+    "schema metadata source archive parser render layout column row cell value"
+).split()
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+MARGIN = 50
+
+@dataclass
+class CorpusDocument:
+    """A generated document and what it contains."""
+    path: Path
+    kind: str  # corpus name, e.g. "pdf_text"
+    doc_type: str  # pdf, md or html
+    pages: int
+    size_bytes: int
+
+def _sentence(rng: random.Random, min_words: int = 6, max_words: int = 18) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+def _paragraph(rng: random.Random, sentences: int = 5) -> str:
+    return " ".join(_sentence(rng) for _ in range(sentences))
+
+def _new_pdf(title: str) -> fitz.Document:
+    doc = fitz.open()
+    doc.set_metadata({"title": title, "author": "benchmarks", "creator": "benchmarks.corpus"})
+    return doc
+
+def _save_pdf(doc: fitz.Document, path: Path):
+    # No garbage/ID randomisation options: output only depends on the content
+    doc.save(path, deflate=True)
+    doc.close()
+
+def make_text_pdf(path: Path, rng: random.Random, pages: int):
+    """PDF of dense running text, one text box per page."""
+    doc = _new_pdf("Text-heavy benchmark document")
+    rect = fitz.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN)
+    for _ in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        text = "\n\n".join(_paragraph(rng, 6) for _ in range(6))
+        page.insert_textbox(rect, text, fontsize=9)
+    _save_pdf(doc, path)
+
+def make_table_pdf(path: Path, rng: random.Random, pages: int, rows: int = 18, cols: int = 5):
+    """PDF with one ruled table per page plus a caption."""
+    doc = _new_pdf("Table-heavy benchmark document")
+    cell_width = (PAGE_WIDTH - 2 * MARGIN) / cols
+    cell_height = 22
+    for page_index in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        page.insert_text((MARGIN, MARGIN), f"Table {page_index + 1}: {_sentence(rng, 4, 8)}", fontsize=11)
+        top = MARGIN + 20
+        for row in range(rows + 1):
+            y = top + row * cell_height
+            page.draw_line((MARGIN, y), (PAGE_WIDTH - MARGIN, y))
+        for col in range(cols + 1):
+            x = MARGIN + col * cell_width
+            page.draw_line((x, top), (x, top + rows * cell_height))
+        for row in range(rows):
+            for col in range(cols):
+                value = rng.choice(WORDS) if row == 0 or col == 0 else f"{rng.uniform(0, 10000):.2f}"
+                page.insert_text(
+                    (MARGIN + col * cell_width + 4, top + row * cell_height + 15),
+                    value,
+                    fontsize=9
+                )
+    _save_pdf(doc, path)
+
+def make_image_pdf(path: Path, rng: random.Random, pages: int, images_per_page: int = 4):
+    """PDF with several raster images per page, some shared between pages."""
+    doc = _new_pdf("Image-heavy benchmark document")
+    shared = _pixmap(rng, 160, 120)
+    size = (PAGE_WIDTH - 3 * MARGIN) / 2
+    for _ in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        page.insert_text((MARGIN, MARGIN), _sentence(rng), fontsize=10)
+        for index in range(images_per_page):
+            x = MARGIN + (index % 2) * (size + MARGIN)
+            y = MARGIN + 20 + (index // 2) * (size + 20)
+            pixmap = shared if index == 0 else _pixmap(rng, 200, 150)
+            page.insert_image(fitz.Rect(x, y, x + size, y + size), pixmap=pixmap)
+    _save_pdf(doc, path)
+
+def _pixmap(rng: random.Random, width: int, height: int) -> fitz.Pixmap:
+    """Blocky RGB noise: compressible like a figure, but distinct per image."""
+    block = 10
+    colors = [
+        bytes(rng.randrange(256) for _ in range(3))
+        for _ in range((width // block + 1) * (height // block + 1))
+    ]
+    row_blocks = width // block + 1
+    samples = bytearray()
+    for y in range(height):
+        for x in range(width):
+            samples += colors[(y // block) * row_blocks + x // block]
+    return fitz.Pixmap(fitz.csRGB, width, height, bytes(samples), False)
+
+def make_markdown(path: Path, rng: random.Random, sections: int):
+    """Large Markdown file with front matter, headings, lists, code and tables."""
+    lines = ["---", "title: Markdown benchmark document", "tags: [benchmark, synthetic]", "---", ""]
+    for section in range(sections):
+        lines += [f"# Section {section + 1}", "", _paragraph(rng), ""]
+        lines += [f"## {_sentence(rng, 2, 5)[:-1]}", "", _paragraph(rng), ""]
+        lines += [f"- {_sentence(rng, 3, 8)} [ref](https://example.com/{section}/{item})" for item in range(5)]
+        lines += ["", "```python", f"def step_{section}(value):", "    return value * 2", "```", ""]
+        lines += ["| key | value | weight |", "| --- | --- | --- |"]
+        lines += [f"| {rng.choice(WORDS)} | {rng.choice(WORDS)} | {rng.random():.3f} |" for _ in range(6)]
+        lines += [""]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+def make_html(path: Path, rng: random.Random, sections: int):
+    """Large article-style HTML page with navigation, links and tables."""
+    parts = [
+        "<html><head><title>HTML benchmark document</title>",
+        '<meta name="description" content="Synthetic benchmark page">',
+        '<meta name="keywords" content="benchmark,synthetic"></head><body>',
+        "<nav>" + "".join(f'<a href="/nav/{i}">Nav {i}</a>' for i in range(20)) + "</nav><article>"
+    ]
+    for section in range(sections):
+        parts.append(f"<h1>Section {section + 1}</h1><h2>{_sentence(rng, 2, 5)}</h2>")
+        parts += [f"<p>{_paragraph(rng)}</p>" for _ in range(3)]
+        parts.append("<ul>" + "".join(
+            f'<li><a href="https://example.com/{section}/{item}">{_sentence(rng, 2, 4)}</a></li>'
+            for item in range(5)
+        ) + "</ul>")
+        parts.append("<table><tr><th>key</th><th>value</th></tr>" + "".join(
+            f"<tr><td>{rng.choice(WORDS)}</td><td>{rng.random():.3f}</td></tr>" for _ in range(6)
+        ) + "</table>")
+    parts.append("</article><footer>Generated corpus</footer></body></html>")
+    path.write_text("".join(parts), encoding="utf-8")
+
+# corpus name -> (doc_type, suffix, generator, size at scale 1)
+CORPORA = {
+    "pdf_text": ("pdf", ".pdf", make_text_pdf, 40),
+    "pdf_tables": ("pdf", ".pdf", make_table_pdf, 12),
+    "pdf_images": ("pdf", ".pdf", make_image_pdf, 12),
+    "markdown": ("md", ".md", make_markdown, 400),
+    "html": ("html", ".html", make_html, 400),
+}
+
+def generate_corpus(
+    root: Path,
+    seed: int = 0,
+    scale: float = 1.0,
+    documents_per_corpus: int = 3
+) -> Dict[str, List[CorpusDocument]]:
+    """Generate every corpus under ``root``, reusing files from an earlier run.
+
+    ``scale`` multiplies pages (PDF) or sections (Markdown, HTML) per document.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    corpus: Dict[str, List[CorpusDocument]] = {}
+    for kind, (doc_type, suffix, generator, base_size) in CORPORA.items():
+        size = max(1, int(base_size * scale))
+        corpus[kind] = []
+        for index in range(documents_per_corpus):
+            path = root / f"{kind}-s{seed}-x{size}-{index}{suffix}"
+            if not path.exists():
+                generator(path, random.Random(f"{seed}:{kind}:{index}"), size)
+            corpus[kind].append(CorpusDocument(
+                path=path,
+                kind=kind,
+                doc_type=doc_type,
+                pages=size if doc_type == "pdf" else 1,
+                size_bytes=path.stat().st_size
+            ))
+    return corpus
@@ -0,0 +1,144 @@
+"""Check that extraction leaves the event loop responsive.
+
+Processes one large PDF (1000 pages by default) with each execution
+backend while a probe coroutine measures how late the event loop wakes it,
+which is what websocket pings and ``/api/health`` experience. Exits
+non-zero when a ``--require`` backend (the process backend by default) lets
+the lag exceed ``--max-lag-ms``. The thread backend is bounded by the
+longest single call that holds the GIL, and the inline backend by the whole
+extraction; both are reported for comparison::
+
+    python -m benchmarks.loop_latency --pages 1000 --max-lag-ms 100
+"""
+
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Awaitable, Optional
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import make_text_pdf
+from benchmarks.run import percentile
+from app.core.document.execution import ExecutionBackend, EXECUTION_MODES, EXECUTION_PROCESS
+from app.core.executors import executor_pools
+
+logger = logging.getLogger(__name__)
+
+async def probe_loop(stop: asyncio.Event, interval: float, lags: List[float]):
+    """Sleep ``interval`` repeatedly, recording how late each wake-up is."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - started - interval))
+
+async def measure(extract: Callable[[], Awaitable[Any]], interval: float) -> Dict[str, Any]:
+    """Run ``extract`` once under the probe and summarize the loop lag."""
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop(stop, interval, lags))
+    await asyncio.sleep(interval * 2)  # let the probe start
+    started = time.perf_counter()
+    try:
+        await extract()
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+    return {
+        "extract_seconds": round(elapsed, 3),
+        "probes": len(lags),
+        "lag_ms": {
+            "p50": round(percentile(lags, 50) * 1000, 2),
+            "p99": round(percentile(lags, 99) * 1000, 2),
+            "max": round(max(lags, default=0.0) * 1000, 2)
+        }
+    }
+
+def build_targets(backend: ExecutionBackend, profile: str) -> Dict[str, Callable[[Path], Awaitable[Any]]]:
+    """Extraction calls for one backend, with caching disabled."""
+    from app.core.document.extractors.pdf import PDFExtractor
+    from app.core.document_processor import DocumentProcessor
+
+    extractor = PDFExtractor(backend=backend)
+    processor = DocumentProcessor(cache_enabled=False, profile=profile, backend=backend)
+    return {
+        "PDFExtractor.extract": lambda path: extractor.extract(path, profile),
+        "document_processor.DocumentProcessor.process_document": processor.process_document
+    }
+
+async def run_checks(
+    path: Path,
+    warmup_path: Path,
+    backends: List[str],
+    required: List[str],
+    profile: str,
+    interval: float,
+    max_lag_ms: float
+) -> Dict[str, Any]:
+    results = []
+    for mode in backends:
+        for target, extract in build_targets(ExecutionBackend(mode=mode), profile).items():
+            await extract(warmup_path)  # load extractors and start worker processes
+            result = {"target": target, "backend": mode, **await measure(lambda: extract(path), interval)}
+            result["bounded"] = mode not in required or result["lag_ms"]["max"] <= max_lag_ms
+            logger.info(
+                f"{target:<55} {mode:<8} {result['extract_seconds']:>7} s "
+                f"lag p50 {result['lag_ms']['p50']} ms p99 {result['lag_ms']['p99']} ms "
+                f"max {result['lag_ms']['max']} ms"
+            )
+            results.append(result)
+    return {
+        "max_lag_ms": max_lag_ms,
+        "probe_interval_ms": interval * 1000,
+        "profile": profile,
+        "results": results
+    }
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--pdf", type=Path, help="Use this PDF instead of generating one")
+    parser.add_argument("--backends", nargs="*", default=list(EXECUTION_MODES), choices=EXECUTION_MODES)
+    parser.add_argument("--require", nargs="*", default=[EXECUTION_PROCESS], choices=EXECUTION_MODES,
+                        help="Backends that must stay under --max-lag-ms")
+    parser.add_argument("--profile", default="standard", help="Extraction profile")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Probe sleep interval")
+    parser.add_argument("--max-lag-ms", type=float, default=100.0, help="Largest acceptable probe lag")
+    parser.add_argument("--output", type=Path, help="JSON results file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        warmup_path = Path(tmp) / "warmup.pdf"
+        make_text_pdf(warmup_path, random.Random(1), 2)
+        path = args.pdf
+        if path is None:
+            path = Path(tmp) / f"text_{args.pages}.pdf"
+            logger.info(f"Generating {args.pages}-page PDF")
+            make_text_pdf(path, random.Random(0), args.pages)
+        try:
+            report = asyncio.run(run_checks(
+                path, warmup_path, args.backends, args.require, args.profile,
+                args.interval_ms / 1000, args.max_lag_ms
+            ))
+        finally:
+            executor_pools.shutdown()
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+    failed = [f"{r['target']} ({r['backend']})" for r in report["results"] if not r["bounded"]]
+    if failed:
+        logger.error(f"Event-loop lag above {args.max_lag_ms} ms: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Benchmark the document extractors against the synthetic corpus.
+
+Measures throughput (pages/sec, MB/sec), per-document latency (p50/p99) and
+peak RSS for each extractor, the ``_extract_*_content`` methods of
+``app.core.document_processor`` and both ``DocumentProcessor``
+implementations, and writes the results as JSON::
+
+    python -m benchmarks.run --scale 0.5 --output results.json
+"""
+
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Awaitable, Optional
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import math
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import psutil
+
+from benchmarks.corpus import CorpusDocument, generate_corpus
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one target over one corpus."""
+    target: str
+    corpus: str
+    documents: int
+    pages: int
+    size_bytes: int
+    runs: int
+    total_seconds: float = 0.0
+    pages_per_second: float = 0.0
+    mb_per_second: float = 0.0
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    peak_rss_mb: float = 0.0
+    rss_growth_mb: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+class PeakRSSSampler:
+    """Samples the process RSS on a background thread and keeps the peak."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.baseline = self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "PeakRSSSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+async def run_target(
+    target: str,
+    corpus: str,
+    documents: List[CorpusDocument],
+    extract: Callable[[CorpusDocument], Awaitable[Any]],
+    runs: int = 3,
+    warmup: int = 1
+) -> BenchmarkResult:
+    """Time ``extract`` over every document, ``runs`` times after a warm-up.
+
+    A document that fails is recorded in ``errors`` and left out of the
+    timings: after a failed warm-up it is not timed at all, and a failed
+    timed run does not count towards throughput or latency.
+    """
+    result = BenchmarkResult(
+        target=target,
+        corpus=corpus,
+        documents=len(documents),
+        pages=sum(document.pages for document in documents),
+        size_bytes=sum(document.size_bytes for document in documents),
+        runs=runs
+    )
+
+    def record_error(document: CorpusDocument, error: Exception):
+        message = f"{document.path.name}: {str(error)}"
+        if message not in result.errors:
+            result.errors.append(message)
+
+    timed = list(documents)
+    for _ in range(warmup):
+        for document in list(timed):
+            try:
+                await extract(document)
+            except Exception as e:
+                record_error(document, e)
+                timed.remove(document)
+
+    gc.collect()
+    latencies = []
+    pages_done = bytes_done = 0
+    with PeakRSSSampler() as sampler:
+        for _ in range(runs):
+            for document in timed:
+                started = time.perf_counter()
+                try:
+                    await extract(document)
+                except Exception as e:
+                    record_error(document, e)
+                    continue
+                latencies.append(time.perf_counter() - started)
+                pages_done += document.pages
+                bytes_done += document.size_bytes
+
+    result.total_seconds = round(sum(latencies), 4)
+    if result.total_seconds:
+        result.pages_per_second = round(pages_done / result.total_seconds, 2)
+        result.mb_per_second = round(bytes_done / 1024 / 1024 / result.total_seconds, 3)
+    if latencies:
+        result.latency_ms = {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2)
+        }
+    result.peak_rss_mb = round(sampler.peak / 1024 / 1024, 1)
+    result.rss_growth_mb = round((sampler.peak - sampler.baseline) / 1024 / 1024, 1)
+    return result
+
+def build_targets() -> Dict[str, Dict[str, Callable[[CorpusDocument], Awaitable[Any]]]]:
+    """Map target name -> document type -> extraction call, with caching disabled."""
+    from app.core.document.extractors.pdf import PDFExtractor
+    from app.core.document.extractors.markdown import MarkdownExtractor
+    from app.core.document.extractors.html import HTMLExtractor
+    from app.core.document.processor import DocumentProcessor as AgentDocumentProcessor
+    from app.core.document_processor import DocumentProcessor, DocumentType
+    from benchmarks.legacy_html import LegacyHTMLExtractor
+
+    processor = DocumentProcessor(cache_enabled=False)
+    agent_processor = AgentDocumentProcessor(cache_enabled=False)
+    doc_types = {"pdf": DocumentType.PDF, "md": DocumentType.MARKDOWN, "html": DocumentType.HTML}
+
+    async def agent_process(document: CorpusDocument):
+        result = await agent_processor.process_single_file(document.path)
+        if not result["success"]:
+            raise RuntimeError(result["error"])
+        return result
+
+    return {
+        "PDFExtractor": {"pdf": lambda document: PDFExtractor().extract(document.path)},
+        "MarkdownExtractor": {"md": lambda document: MarkdownExtractor().extract(document.path)},
+        "HTMLExtractor": {"html": lambda document: HTMLExtractor().extract(document.path)},
+        "LegacyHTMLExtractor": {"html": lambda document: LegacyHTMLExtractor().extract(document.path)},
+        "document_processor._extract_content": {
+            doc_type: (lambda document: processor._extract_content(
+                document.path, doc_types[document.doc_type]
+            ))
+            for doc_type in doc_types
+        },
+        "document_processor.DocumentProcessor.process_document": {
+            doc_type: (lambda document: processor.process_document(document.path))
+            for doc_type in doc_types
+        },
+        "document.processor.DocumentProcessor.process_single_file": {
+            doc_type: agent_process for doc_type in doc_types
+        },
+    }
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+async def run_benchmarks(
+    corpus_dir: Path,
+    seed: int = 0,
+    scale: float = 1.0,
+    documents_per_corpus: int = 3,
+    runs: int = 3,
+    only: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Generate the corpus, run every target on the matching corpora and collect results."""
+    corpus = generate_corpus(corpus_dir, seed, scale, documents_per_corpus)
+    results = []
+    for target, extractors in build_targets().items():
+        if only and not any(name in target for name in only):
+            continue
+        for kind, documents in corpus.items():
+            extract = extractors.get(documents[0].doc_type)
+            if extract is None:
+                continue
+            logger.info(f"Benchmarking {target} on {kind}")
+            result = await run_target(target, kind, documents, extract, runs)
+            results.append(asdict(result))
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": psutil.cpu_count(),
+        "config": {
+            "seed": seed,
+            "scale": scale,
+            "documents_per_corpus": documents_per_corpus,
+            "runs": runs
+        },
+        "results": results
+    }
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="JSON results file (default: stdout)")
+    parser.add_argument("--corpus-dir", type=Path, help="Where to generate/reuse the corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for pages/sections per document")
+    parser.add_argument("--documents", type=int, default=3, help="Documents per corpus")
+    parser.add_argument("--runs", type=int, default=3, help="Timed passes over each corpus")
+    parser.add_argument("--only", nargs="*", help="Only run targets whose name contains one of these")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Extraction code logs timings at INFO for every document
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus_dir or Path(tmp)
+        report = asyncio.run(run_benchmarks(
+            corpus_dir, args.seed, args.scale, args.documents, args.runs, args.only
+        ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output)
+        for result in report["results"]:
+            logger.info(
+                f"{result['target']:<58} {result['corpus']:<10} "
+                f"{result['pages_per_second']:>9} pages/s {result['mb_per_second']:>8} MB/s "
+                f"p50 {result['latency_ms'].get('p50', '-')} ms p99 {result['latency_ms'].get('p99', '-')} ms "
+                f"peak {result['peak_rss_mb']} MB"
+            )
+    else:
+        sys.stdout.write(output + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compare batch completion latency under FIFO and shortest-job-first scheduling.
+
+Builds a mixed batch with one large PDF submitted first, followed by many
+small Markdown files, and runs it through ``process_batch`` of both
+``DocumentProcessor`` implementations once per policy. Reports mean, p50,
+p95, p99 and max per-file completion time measured from the batch start,
+plus the makespan::
+
+    python -m benchmarks.scheduling --pages 300 --small 200 --workers 2
+"""
+
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Awaitable, Optional
+import argparse
+import asyncio
+import json
+import logging
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.corpus import make_text_pdf, make_markdown
+from app.core.document.scheduling import SchedulingConfig, SCHEDULE_POLICIES
+from app.core.executors import executor_pools
+
+logger = logging.getLogger(__name__)
+
+def build_batch(directory: Path, pages: int, small: int, seed: int = 0) -> List[Path]:
+    """One large PDF followed by ``small`` Markdown files, in submission order."""
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    large = directory / f"large_{pages}.pdf"
+    make_text_pdf(large, rng, pages)
+    paths = [large]
+    for index in range(small):
+        path = directory / f"small_{index:04d}.md"
+        make_markdown(path, rng, 3)
+        paths.append(path)
+    return paths
+
+def copy_batch(paths: List[Path], directory: Path) -> List[Path]:
+    """Fresh copies of the batch; the agent processor deletes its inputs."""
+    directory.mkdir(parents=True)
+    copies = []
+    for path in paths:
+        copy = directory / path.name
+        shutil.copyfile(path, copy)
+        copies.append(copy)
+    return copies
+
+def build_targets(workers: int, profile: str) -> Dict[str, Callable[[List[Path], SchedulingConfig], Awaitable[Dict[str, Any]]]]:
+    """Batch calls per processor, returning the scheduler's stats; caching disabled."""
+    from app.core.document.processor import DocumentProcessor as AgentDocumentProcessor
+    from app.core.document_processor import DocumentProcessor
+
+    async def legacy(paths: List[Path], scheduling: SchedulingConfig) -> Dict[str, Any]:
+        processor = DocumentProcessor(
+            max_workers=workers, cache_enabled=False, profile=profile, scheduling=scheduling
+        )
+        status = await processor.process_batch(paths, "scheduling-benchmark")
+        return status.scheduling
+
+    async def agent(paths: List[Path], scheduling: SchedulingConfig) -> Dict[str, Any]:
+        processor = AgentDocumentProcessor(
+            max_concurrent=workers, cache_enabled=False, profile=profile, scheduling=scheduling
+        )
+
+        async def ignore_status(batch_id: str, status: Dict[str, Any]):
+            pass
+
+        result = await processor.process_batch(paths, "scheduling-benchmark", ignore_status)
+        return result["scheduling"]
+
+    return {
+        "document_processor.DocumentProcessor.process_batch": legacy,
+        "document.processor.DocumentProcessor.process_batch": agent
+    }
+
+async def run_comparison(
+    paths: List[Path],
+    work_dir: Path,
+    policies: List[str],
+    workers: int,
+    profile: str,
+    aging: float
+) -> Dict[str, Any]:
+    results = []
+    for target, run_batch in build_targets(workers, profile).items():
+        await run_batch(copy_batch(paths[1:3], work_dir / "warmup" / target), SchedulingConfig())
+        for policy in policies:
+            batch = copy_batch(paths, work_dir / policy / target)
+            started = time.perf_counter()
+            stats = await run_batch(batch, SchedulingConfig(policy=policy, aging=aging))
+            result = {
+                "target": target,
+                "policy": policy,
+                "makespan_seconds": round(time.perf_counter() - started, 3),
+                **stats
+            }
+            latency = result["latency_seconds"]
+            logger.info(
+                f"{target:<52} {policy:<5} mean {latency['mean']:>7} s p50 {latency['p50']:>7} s "
+                f"p95 {latency['p95']:>7} s p99 {latency['p99']:>7} s max {latency['max']:>7} s"
+            )
+            results.append(result)
+    return {"workers": workers, "profile": profile, "files": len(paths), "results": results}
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300, help="Pages in the large PDF")
+    parser.add_argument("--small", type=int, default=200, help="Number of small Markdown files")
+    parser.add_argument("--workers", type=int, default=2, help="Files processed concurrently")
+    parser.add_argument("--policies", nargs="*", default=list(SCHEDULE_POLICIES), choices=SCHEDULE_POLICIES)
+    parser.add_argument("--aging", type=float, default=1.0, help="Aging rate for the sjf policy")
+    parser.add_argument("--profile", default="fast", help="Extraction profile")
+    parser.add_argument("--output", type=Path, help="JSON results file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logger.info(f"Generating a {args.pages}-page PDF and {args.small} Markdown files")
+        paths = build_batch(Path(tmp) / "batch", args.pages, args.small)
+        try:
+            report = asyncio.run(run_comparison(
+                paths, Path(tmp) / "runs", args.policies, args.workers, args.profile, args.aging
+            ))
+        finally:
+            executor_pools.shutdown()
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
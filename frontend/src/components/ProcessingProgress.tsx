@@ -134,6 +134,9 @@ export default function ProcessingProgress({
       {status.current_file && (
         <div className="text-sm text-gray-600">
           Processing: {status.current_file}
+          {status.current_page && status.current_total_pages && (
+            <span> (page {status.current_page} of {status.current_total_pages})</span>
+          )}
         </div>
       )}
 
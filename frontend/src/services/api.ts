@@ -78,6 +78,8 @@ export interface ProcessingStatus {
   success_count: number;
   error_count: number;
   current_file?: string;
+  current_page?: number;
+  current_total_pages?: number;
   status: 'pending' | 'processing' | 'completed' | 'error';
   errors: Array<{
     file: string;
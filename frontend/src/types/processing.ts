@@ -10,6 +10,8 @@ export interface BatchProcessingStatus {
   success_count: number;
   error_count: number;
   current_file?: string;
+  current_page?: number;
+  current_total_pages?: number;
   status: 'pending' | 'processing' | 'completed' | 'error' | 'cancelled';
   errors: ProcessingError[];
   start_time?: string;
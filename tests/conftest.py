@@ -0,0 +1,13 @@
+"""Fixtures shared by tests that start the served app."""
+
+import pytest
+
+from app.core.job_queue import job_queue
+
+@pytest.fixture
+def served_job_queue(tmp_path, monkeypatch):
+    """Point the app's job queue at a fresh database; startup resumes batches from it."""
+    monkeypatch.setattr(job_queue, "path", tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(job_queue, "_schema_ready", False)
+    yield job_queue
+    job_queue.close()
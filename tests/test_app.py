@@ -0,0 +1,14 @@
+"""The served app preloads configured extractors and reports import costs."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+def test_health_reports_preloaded_extractors(served_job_queue, monkeypatch):
+    monkeypatch.setenv("EXTRACTOR_PRELOAD", "html")
+    with TestClient(app) as client:
+        health = client.get("/api/health").json()
+    extractors = health["extractors"]["extractors"]
+    assert extractors["html"]["loaded"]
+    assert extractors["html"]["import_seconds"] is not None
+    assert "executors" in health and "admission" in health
@@ -0,0 +1,55 @@
+"""Archive uploads are admitted with their member count, not as empty batches."""
+
+import io
+import tarfile
+import zipfile
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.admission import admission_controller
+from app.core.document import archives
+from app.core.document.archives import ArchiveReader
+
+def _zip(names) -> bytes:
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w") as archive:
+        for name in names:
+            archive.writestr(name, f"# {name}\n\nSome text.\n")
+    return data.getvalue()
+
+def test_zip_members_are_counted_from_the_central_directory():
+    data = io.BytesIO(_zip(["a.md", "docs/b.md", "c.exe", "d.md"]))
+    reader = ArchiveReader(data, "zip", accept=lambda name: name.endswith(".md"))
+    try:
+        assert reader.estimate_members() == 3
+        assert data.tell() == 0
+        # Counting leaves the archive readable from the start
+        assert len(list(reader._iter_members())) == 3
+    finally:
+        reader.close()
+
+def test_streamed_archives_are_estimated_from_their_size(monkeypatch):
+    monkeypatch.setattr(archives, "ESTIMATED_MEMBER_BYTES", 1024)
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode="w") as archive:
+        for index in range(4):
+            info = tarfile.TarInfo(f"{index}.md")
+            info.size = 2000
+            archive.addfile(info, io.BytesIO(b"x" * 2000))
+    reader = ArchiveReader(data, "tar", accept=lambda name: True, max_members=5)
+    try:
+        assert reader.estimate_members() == 5  # bounded by max_members
+        assert data.tell() == 0
+    finally:
+        reader.close()
+
+def test_archive_upload_is_refused_when_its_members_do_not_fit(served_job_queue, monkeypatch):
+    monkeypatch.setattr(admission_controller, "_queued", admission_controller.max_queued - 2)
+    with TestClient(app) as client:
+        response = client.post(
+            "/documents/upload-archive",
+            files={"archive": ("docs.zip", _zip(["a.md", "b.md", "c.md"]), "application/zip")}
+        )
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
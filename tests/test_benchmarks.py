@@ -0,0 +1,32 @@
+"""Benchmark runs record failing documents and keep timing the rest."""
+
+import asyncio
+from pathlib import Path
+
+from benchmarks.corpus import CorpusDocument
+from benchmarks.run import run_target
+
+def _documents():
+    return [
+        CorpusDocument(path=Path(f"{name}.pdf"), kind="pdf_text", doc_type="pdf", pages=10, size_bytes=1000)
+        for name in ("good", "flaky", "broken")
+    ]
+
+def test_failed_documents_are_recorded_and_skipped():
+    calls = {"flaky": 0}
+
+    async def extract(document: CorpusDocument):
+        name = document.path.stem
+        if name == "broken":
+            raise ValueError("cannot parse")
+        if name == "flaky":
+            calls["flaky"] += 1
+            if calls["flaky"] == 3:  # fails in the second timed run only
+                raise RuntimeError("worker crashed")
+        await asyncio.sleep(0.01)
+
+    result = asyncio.run(run_target("fake", "pdf_text", _documents(), extract, runs=2))
+    assert result.errors == ["broken.pdf: cannot parse", "flaky.pdf: worker crashed"]
+    # good twice and flaky once were timed
+    assert result.latency_ms["mean"] >= 10
+    assert result.pages_per_second == round(30 / result.total_seconds, 2)
@@ -0,0 +1,45 @@
+"""Pool work given a budget deadline stops at its next page or table boundary."""
+
+import asyncio
+import random
+import time
+
+from benchmarks.corpus import make_text_pdf, make_table_pdf
+from app.core.document import session as session_module
+from app.core.document.session import PDFSession, extract_page_range, iter_page_texts
+from app.core.document.tables import read_table_records
+from app.core.document.execution import ExecutionBackend
+from app.core.document.budget import ExtractionBudget
+
+def test_deadline_follows_the_time_budget():
+    assert ExtractionBudget().start().deadline() is None
+    deadline = ExtractionBudget(max_seconds=30).start().deadline()
+    assert 29 < deadline - time.time() <= 30
+
+def test_page_range_stops_once_the_deadline_has_passed(tmp_path):
+    path = tmp_path / "text.pdf"
+    make_text_pdf(path, random.Random(0), 5)
+    assert len(extract_page_range(str(path), 0, 5)) == 5
+    assert extract_page_range(str(path), 0, 5, deadline=time.time() - 1) == []
+
+def test_tables_are_not_read_after_the_deadline(tmp_path):
+    path = tmp_path / "tables.pdf"
+    make_table_pdf(path, random.Random(0), 2)
+    assert read_table_records(str(path), [0, 1], "lattice", deadline=time.time() - 1, page_group=1) == []
+
+def test_page_texts_end_after_a_short_block(tmp_path, monkeypatch):
+    path = tmp_path / "text.pdf"
+    make_text_pdf(path, random.Random(0), 20)
+    checks = iter(range(100))
+    # Only the check before the seventh page, in the second block, sees the deadline;
+    # later blocks must not be read, or their pages would follow on from page six
+    monkeypatch.setattr(session_module, "deadline_passed", lambda deadline: next(checks) == 6)
+
+    async def collect(session):
+        return [text async for text in iter_page_texts(
+            session, ExecutionBackend(mode="inline", page_block=4), cache=False, deadline=0
+        )]
+
+    with PDFSession(path) as session:
+        texts = asyncio.run(collect(session))
+        assert texts == [session.doc[page_num].get_text() for page_num in range(6)]
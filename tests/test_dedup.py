@@ -0,0 +1,27 @@
+"""Near-duplicate detection labels documents by content, not by upload path."""
+
+import asyncio
+import hashlib
+import random
+
+from benchmarks.corpus import WORDS
+from app.core.document.dedup import DedupConfig
+from app.core.document.processor import DocumentProcessor
+
+def test_duplicate_of_names_the_earlier_document_by_content(tmp_path):
+    rng = random.Random(0)
+    words = [rng.choice(WORDS) for _ in range(2000)]
+    original = tmp_path / "upload-1" / "report.md"
+    revision = tmp_path / "upload-2" / "report.md"
+    for path, text in ((original, words), (revision, words[:-5] + ["revised"] * 5)):
+        path.parent.mkdir()
+        path.write_text(" ".join(text))
+
+    processor = DocumentProcessor(cache_enabled=False, dedup=DedupConfig(threshold=0.9))
+    first = asyncio.run(processor.process_single_file(original))
+    second = asyncio.run(processor.process_single_file(revision))
+
+    assert first["content_sha256"] == hashlib.sha256(original.read_bytes()).hexdigest()
+    assert "duplicate_of" not in first
+    assert second["duplicate_of"] == first["content_sha256"]
+    assert second["similarity"] >= 0.9
@@ -0,0 +1,48 @@
+"""Stored PDFs: eviction never closes a document in use, page ranges are validated."""
+
+import asyncio
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.corpus import make_text_pdf
+from app.core.document.store import DocumentStore, document_store
+
+@pytest.fixture
+def stored_pdfs(tmp_path):
+    store = DocumentStore(tmp_path / "store", max_open_documents=1)
+    source = tmp_path / "source.pdf"
+    make_text_pdf(source, random.Random(0), 3)
+    ids = [asyncio.run(store.add(source)) for _ in range(2)]
+    yield store, ids
+    store.close()
+
+def test_evicted_document_stays_open_until_released(stored_pdfs):
+    store, (first_id, second_id) = stored_pdfs
+    first = store.open_pdf(first_id)
+    second = store.open_pdf(second_id)  # evicts the first from the open set
+
+    assert first.get_page(0)["number"] == 1
+    store.release(first)
+    with pytest.raises(Exception):
+        first.get_page(1)
+    assert second.get_page(1)["number"] == 2
+    store.release(second)
+
+def test_page_range_past_the_end_is_not_found(tmp_path, monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(document_store, "root", tmp_path)
+    source = tmp_path / "source.pdf"
+    make_text_pdf(source, random.Random(0), 3)
+    document_id = asyncio.run(document_store.add(source))
+    client = TestClient(app)
+
+    pages = client.get(f"/documents/{document_id}/pages", params={"start": 2, "end": 9})
+    assert pages.status_code == 200
+    assert [page["number"] for page in pages.json()["pages"]] == [2, 3]
+    assert client.get(f"/documents/{document_id}/pages", params={"start": 5}).status_code == 404
+    assert client.get(f"/documents/{document_id}/pages", params={"start": 3, "end": 2}).status_code == 400
+    assert client.get(f"/documents/{document_id}/pages/4").status_code == 404
+    document_store.close()
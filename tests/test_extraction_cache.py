@@ -0,0 +1,44 @@
+"""Extraction cache: no side effects until used, entries round-trip, size is bounded."""
+
+import asyncio
+
+from app.utils.cache_utils import ExtractionCache
+
+def test_directory_is_created_by_first_store(tmp_path):
+    cache = ExtractionCache(tmp_path / "extractions")
+    assert asyncio.run(cache.get("missing")) is None
+    assert not cache.cache_dir.exists()
+
+    asyncio.run(cache.set("key", {"content": "text", "metadata": {}}))
+    assert asyncio.run(cache.get("key")) == {"content": "text", "metadata": {}}
+    assert [p.name for p in cache.cache_dir.iterdir()] == ["key.cache"]
+
+def test_oldest_entries_are_removed_over_the_size_limit(tmp_path):
+    cache = ExtractionCache(tmp_path, max_size_mb=1)
+    for i in range(3):
+        asyncio.run(cache.set(f"key{i}", b"x" * 400_000))
+    assert asyncio.run(cache.get("key0")) is None
+    assert asyncio.run(cache.get("key2")) is not None
+
+def test_directory_is_scanned_only_when_due(tmp_path):
+    cache = ExtractionCache(tmp_path, max_size_mb=1, rescan_writes=10)
+    for i in range(10):
+        asyncio.run(cache.set(f"key{i}", b"x" * 1000))
+    assert cache.stats["scans"] == 1  # the first store
+
+    # Another process sharing the directory fills it past the limit
+    other = ExtractionCache(tmp_path, max_size_mb=1)
+    asyncio.run(other.set("other", b"x" * 1_100_000))
+    asyncio.run(cache.set("key10", b"x" * 1000))
+    assert cache.stats["scans"] == 2
+    assert asyncio.run(cache.get("key0")) is None
+
+def test_running_total_triggers_the_sweep(tmp_path):
+    cache = ExtractionCache(tmp_path, max_size_mb=1)
+    for i in range(3):
+        asyncio.run(cache.set(f"key{i}", b"x" * 400_000))
+    assert cache.stats["scans"] == 2  # first store, then the store that went over
+    # Rewriting an entry replaces its size rather than adding to it
+    for _ in range(3):
+        asyncio.run(cache.set("key2", b"x" * 400_000))
+    assert cache.stats["scans"] == 2
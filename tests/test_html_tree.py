@@ -0,0 +1,35 @@
+"""HTML parsing honours the declared encoding and only falls back for empty input."""
+
+import logging
+
+from app.core.document.html_tree import HTMLDocument
+
+XHTML = """<?xml version="1.0" encoding="{encoding}"?>
+<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml">
+<head><title>Café menu</title></head>
+<body><h1>Crème brûlée</h1><p>Dessert of the day.</p></body>
+</html>
+"""
+
+def test_xhtml_with_xml_declaration_is_extracted(tmp_path):
+    for encoding in ("UTF-8", "ISO-8859-1"):
+        path = tmp_path / f"{encoding}.xhtml"
+        path.write_bytes(XHTML.format(encoding=encoding).encode(encoding))
+        document = HTMLDocument.from_file(path)
+        assert document.title() == "Café menu"
+        assert [heading["text"] for heading in document.headings()] == ["Crème brûlée"]
+        assert "Dessert of the day." in document.text()
+
+def test_utf8_without_charset_is_not_read_as_latin1(tmp_path):
+    path = tmp_path / "plain.html"
+    path.write_bytes("<html><head><title>Café</title></head><body></body></html>".encode("utf-8"))
+    assert HTMLDocument.from_file(path).title() == "Café"
+
+def test_empty_document_falls_back_with_a_warning(tmp_path, caplog):
+    path = tmp_path / "empty.html"
+    path.write_bytes(b"  \n")
+    with caplog.at_level(logging.WARNING):
+        document = HTMLDocument.from_file(path)
+    assert document.text() == ""
+    assert "Empty HTML document" in caplog.text
@@ -0,0 +1,82 @@
+"""Job queue results: stored as plain JSON, with the full extraction of every file."""
+
+from array import array
+import asyncio
+from datetime import datetime
+from pathlib import Path
+import random
+
+import pytest
+
+from benchmarks.corpus import make_table_pdf
+from app.core.document_processor import DocumentProcessor, assemble_document
+from app.core.executors import executor_pools
+from app.core.job_queue import JobQueue, json_safe, run_queued_batch, default_owner
+from app.worker import Worker
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    yield queue
+    queue.close()
+    executor_pools.shutdown()
+
+@pytest.fixture
+def table_pdf(tmp_path) -> Path:
+    path = tmp_path / "tables.pdf"
+    make_table_pdf(path, random.Random(0), 3)
+    return path
+
+def _enqueue(queue: JobQueue, batch_id: str, path: Path):
+    queue.enqueue_batch(batch_id, [{"file_path": path, "filename": path.name}], {"profile": "standard"})
+
+def _assert_full_result(result):
+    content = result["content"]
+    assert [page["number"] for page in content["pages"]] == [1, 2, 3]
+    assert content["text"].startswith(content["pages"][0]["text"])
+    assert "table_detection" in content
+    assert result["validation"]["is_valid"]
+
+def test_json_safe_drops_binary_data():
+    value = {"images": [{"xref": 5, "image": b"\x89PNG"}], "raw": [b"x", 1], "at": datetime(2024, 1, 2)}
+    assert json_safe(value) == {"images": [{"xref": 5}], "raw": [1], "at": "2024-01-02T00:00:00"}
+
+def test_json_safe_converts_typed_buffers():
+    offsets = array('Q', [0, 12, 40])
+    value = {"offsets": offsets, "view": memoryview(offsets), "pixels": memoryview(b"\x00\x01")}
+    assert json_safe(value) == {"offsets": [0, 12, 40], "view": [0, 12, 40]}
+    with pytest.raises(TypeError):
+        json_safe({"value": object()})
+
+def test_worker_stores_pages_and_tables(queue, table_pdf):
+    _enqueue(queue, "batch", table_pdf)
+    worker = Worker(queue, concurrency=1, processor=DocumentProcessor(max_workers=1, cache_enabled=False))
+    asyncio.run(worker.run(asyncio.Event(), exit_when_idle=True))
+
+    [job] = queue.batch_results("batch")
+    assert job["state"] == "done"
+    _assert_full_result(job["result"])
+
+def test_text_files_are_stored(queue, tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("first line\nsecond line\n\nnext paragraph\n")
+    _enqueue(queue, "batch", path)
+    processor = DocumentProcessor(max_workers=1, cache_enabled=False)
+    asyncio.run(run_queued_batch(
+        queue, "batch", default_owner(), processor.process_batch, assemble=assemble_document, profile="standard"
+    ))
+
+    [job] = queue.batch_results("batch")
+    assert job["state"] == "done", job["error"]
+    assert job["result"]["content"]["text"].startswith("first line")
+
+def test_api_consumer_stores_the_same_result(queue, table_pdf):
+    _enqueue(queue, "batch", table_pdf)
+    processor = DocumentProcessor(max_workers=1, cache_enabled=False)
+    asyncio.run(run_queued_batch(
+        queue, "batch", default_owner(), processor.process_batch, assemble=assemble_document, profile="standard"
+    ))
+
+    [job] = queue.batch_results("batch")
+    assert job["state"] == "done"
+    _assert_full_result(job["result"])
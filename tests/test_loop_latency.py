@@ -0,0 +1,40 @@
+"""Process-backend extraction keeps the event loop responsive."""
+
+import asyncio
+import random
+
+import pytest
+
+from benchmarks.corpus import make_text_pdf
+from benchmarks.loop_latency import build_targets, measure
+from app.core.document.execution import ExecutionBackend, EXECUTION_PROCESS
+from app.core.executors import executor_pools
+
+PAGES = 1000
+MAX_LAG_MS = 100.0
+
+@pytest.fixture
+def pools():
+    yield executor_pools
+    executor_pools.shutdown()
+
+@pytest.fixture(scope="module")
+def pdfs(tmp_path_factory):
+    """A small PDF to warm up with and the large one to measure, shared by both targets."""
+    directory = tmp_path_factory.mktemp("loop_latency")
+    make_text_pdf(directory / "warmup.pdf", random.Random(1), 2)
+    make_text_pdf(directory / "text.pdf", random.Random(0), PAGES)
+    return directory / "warmup.pdf", directory / "text.pdf"
+
+@pytest.mark.parametrize("target", ["PDFExtractor.extract", "document_processor.DocumentProcessor.process_document"])
+def test_process_backend_bounds_loop_lag(pdfs, pools, target):
+    warmup_path, path = pdfs
+    extract = build_targets(ExecutionBackend(mode=EXECUTION_PROCESS), "standard")[target]
+
+    async def run():
+        await extract(warmup_path)  # load extractors and start worker processes
+        return await measure(lambda: extract(path), 0.005)
+
+    result = asyncio.run(run())
+    assert result["probes"] > 0
+    assert result["lag_ms"]["max"] <= MAX_LAG_MS, result
@@ -0,0 +1,91 @@
+"""Batch scheduling: aging lets an old expensive file through a stream of cheap ones."""
+
+import asyncio
+from pathlib import Path
+import random
+
+from benchmarks.corpus import make_text_pdf
+from app.core.document.scheduling import BatchScheduler, SchedulingConfig
+from app.core.document_processor import DocumentProcessor
+from app.core.executors import executor_pools
+from app.core.job_queue import JobQueue, run_queued_batch, default_owner
+
+class FixedCostScheduler(BatchScheduler):
+    """Takes each file's cost from its name instead of opening it."""
+
+    async def estimate(self, file_path: Path) -> float:
+        return 10.0 if file_path.name == "large.pdf" else 0.001
+
+def _run_order(aging: float, cheap_files: int = 100):
+    async def arrivals():
+        yield Path("small-0.md")
+        yield Path("large.pdf")
+        for i in range(1, cheap_files):
+            await asyncio.sleep(0.001)
+            yield Path(f"small-{i}.md")
+
+    order = []
+
+    async def handle(file_path: Path):
+        await asyncio.sleep(0.005)
+        order.append(file_path.name)
+
+    scheduler = FixedCostScheduler(SchedulingConfig(aging=aging, window=5))
+    asyncio.run(scheduler.run(arrivals(), handle, workers=1))
+    return order
+
+def test_old_expensive_file_runs_before_newer_cheap_ones():
+    order = _run_order(aging=100.0)
+    assert len(order) == 101
+    assert order.index("large.pdf") < 50
+
+def test_without_aging_cheap_files_always_go_first():
+    order = _run_order(aging=0.0)
+    assert order[-1] == "large.pdf"
+
+def test_list_batches_age_by_submission_order():
+    files = [Path("large.pdf")] + [Path(f"small-{i}.md") for i in range(1, 200)]
+
+    def run_order(aging: float):
+        order = []
+
+        async def handle(file_path: Path):
+            order.append(file_path.name)
+
+        scheduler = FixedCostScheduler(SchedulingConfig(aging=aging))
+        asyncio.run(scheduler.run(list(files), handle, workers=1))
+        return order
+
+    assert run_order(0.0)[-1] == "large.pdf"
+    # Mean cost is about 0.05 s, so the large file is overtaken for roughly 10 / 0.05 / aging arrivals
+    assert run_order(2.0).index("large.pdf") < 150
+
+def test_queued_batches_schedule_every_leased_file(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    first = tmp_path / "first.md"
+    first.write_text("\n\n".join(f"# Section {i}\n\n" + "word " * 200 for i in range(300)))
+    large = tmp_path / "large.pdf"
+    make_text_pdf(large, random.Random(0), 40)
+    small = []
+    for i in range(20):
+        path = tmp_path / f"small-{i}.md"
+        path.write_text(f"# Note {i}\n\nshort")
+        small.append(path)
+    files = [first, large, *small]
+    queue.enqueue_batch("batch", [{"file_path": path, "filename": path.name} for path in files], {})
+
+    order = []
+
+    async def done(file_path: Path, result, error):
+        order.append(file_path.name)
+
+    processor = DocumentProcessor(max_workers=1, cache_enabled=False, scheduling=SchedulingConfig(aging=0.0))
+    try:
+        asyncio.run(run_queued_batch(queue, "batch", default_owner(), processor.process_batch, done_callback=done))
+    finally:
+        queue.close()
+        executor_pools.shutdown()
+
+    assert order[0] == "first.md"
+    assert order[-1] == "large.pdf"
+    assert queue.batch_status("batch")["success_count"] == len(files)
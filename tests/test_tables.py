@@ -0,0 +1,84 @@
+"""Table prefilter: prose pages are skipped, ruled and aligned tables are kept."""
+
+from pathlib import Path
+import asyncio
+import random
+
+import fitz
+
+from benchmarks.corpus import make_text_pdf, make_table_pdf, WORDS, PAGE_WIDTH, PAGE_HEIGHT, MARGIN
+from app.core.document.session import PDFSession
+from app.core.document.tables import TableDetector
+from app.core.document.execution import ExecutionBackend
+
+def _candidates(path: Path) -> list:
+    with PDFSession(path) as session:
+        return TableDetector().candidate_pages(session)
+
+def _flavors(path: Path) -> set:
+    with PDFSession(path) as session:
+        return set(TableDetector().candidate_flavors(session).values())
+
+def make_borderless_table_pdf(path: Path, rng: random.Random, pages: int):
+    """A paragraph of prose above an unruled table of left-aligned cells."""
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        prose = " ".join(rng.choice(WORDS) for _ in range(120))
+        page.insert_textbox(fitz.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, 200), prose, fontsize=9)
+        for row in range(12):
+            for col in range(4):
+                value = rng.choice(WORDS) if col == 0 else f"{rng.uniform(0, 10000):.2f}"
+                page.insert_text((MARGIN + col * 120, 240 + row * 16), value, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+def make_right_aligned_table_pdf(path: Path, rng: random.Random, pages: int):
+    """Prose above an unruled table of labels and right-aligned amounts of varying width."""
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        prose = " ".join(rng.choice(WORDS) for _ in range(120))
+        page.insert_textbox(fitz.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, 200), prose, fontsize=9)
+        for row in range(12):
+            y = 240 + row * 16
+            page.insert_text((MARGIN, y), rng.choice(WORDS), fontsize=9)
+            for col in range(1, 4):
+                value = f"{rng.uniform(0, 10 ** rng.randint(1, 5)):.2f}"
+                page.insert_text((MARGIN + col * 110 - fitz.get_text_length(value, fontsize=9), y), value, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+class NoPoolBackend(ExecutionBackend):
+    async def run_shared(self, fn, *args):
+        raise AssertionError("camelot was run without candidate pages")
+
+def test_text_only_pdf_has_no_candidate_pages(tmp_path):
+    path = tmp_path / "text.pdf"
+    make_text_pdf(path, random.Random(0), 20)
+    assert _candidates(path) == []
+
+def test_ruled_tables_are_candidates(tmp_path):
+    path = tmp_path / "tables.pdf"
+    make_table_pdf(path, random.Random(0), 3)
+    assert _candidates(path) == [0, 1, 2]
+    assert _flavors(path) == {"lattice"}
+
+def test_aligned_columns_without_rules_are_candidates(tmp_path):
+    path = tmp_path / "borderless.pdf"
+    make_borderless_table_pdf(path, random.Random(1), 3)
+    assert _candidates(path) == [0, 1, 2]
+    # lattice needs ruling lines, so unruled tables are read with stream
+    assert _flavors(path) == {"stream"}
+
+def test_right_aligned_numeric_columns_are_candidates(tmp_path):
+    path = tmp_path / "amounts.pdf"
+    make_right_aligned_table_pdf(path, random.Random(2), 3)
+    assert _candidates(path) == [0, 1, 2]
+
+def test_detect_skips_camelot_without_candidates(tmp_path):
+    path = tmp_path / "text.pdf"
+    make_text_pdf(path, random.Random(0), 3)
+    with PDFSession(path) as session:
+        result = asyncio.run(TableDetector().detect(session, NoPoolBackend()))
+    assert result.tables == [] and result.skipped_pages == 3
@@ -0,0 +1,35 @@
+"""Text extraction reports counts only; offsets are computed on demand."""
+
+from app.core.document.text_layout import scan_bytes, scan_file, read_span
+from app.core.document_processor import _extract_text_file
+
+TEXT = b"first line\nsecond line\n\n\nnext paragraph\nlast line without newline"
+
+def test_counts_match_with_and_without_offsets(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_bytes(TEXT)
+    with_offsets = scan_file(path, chunk_size=7)
+    without_offsets = scan_file(path, chunk_size=7, offsets=False)
+    assert with_offsets.summary() == without_offsets.summary() == scan_bytes(TEXT, offsets=False).summary()
+    assert without_offsets.summary()["line_count"] == 6
+    assert without_offsets.summary()["paragraph_count"] == 2
+    assert without_offsets.summary()["longest_line_bytes"] == len(b"last line without newline")
+    assert len(without_offsets.line_offsets) == len(without_offsets.paragraph_offsets) == 0
+    assert len(with_offsets.paragraph_offsets) == 4
+
+def test_spans_are_read_from_on_demand_offsets(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_bytes(TEXT)
+    layout = scan_file(path)
+    start, end = layout.paragraph_offsets[2:4]
+    assert read_span(path, start, end) == "next paragraph\nlast line without newline"
+
+def test_extraction_result_has_no_offsets(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_bytes(TEXT)
+    for max_inline_text in (1024, 8):
+        content = _extract_text_file(path, max_inline_text, chunk_size=7)
+        assert "line_offsets" not in content and "paragraph_offsets" not in content
+        assert content["line_count"] == 6
+        assert content["paragraph_count"] == 2
+    assert content["text"] is None
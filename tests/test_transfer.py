@@ -0,0 +1,42 @@
+"""Shared-memory results: out-of-band pickle buffers and cleanup of unreceived segments."""
+
+import pickle
+
+import pytest
+
+from app.core.document import transfer
+from app.core.document.transfer import SharedHandle, share_object, received_object, shared_result_stats
+from app.core.executors import TrackedProcessPoolExecutor
+
+class Block:
+    """A payload that pickles its bytes out of band, like a NumPy array."""
+
+    def __init__(self, data: bytearray):
+        self.data = data
+
+    def __reduce_ex__(self, protocol):
+        return Block, (pickle.PickleBuffer(self.data),)
+
+def share_and_fail(size: int):
+    """Write a result into shared memory, then fail before handing it back."""
+    transfer.share_object({"payload": "x" * size})
+    raise RuntimeError("worker failed after writing its result")
+
+def test_out_of_band_buffers_are_written_after_the_pickle(monkeypatch):
+    monkeypatch.setattr(transfer, "SHARED_RESULT_MIN_BYTES", 0)
+    handle = share_object({"block": Block(bytearray(b"abc" * 1000)), "name": "table"})
+    assert isinstance(handle, SharedHandle)
+    assert len(handle.offsets) == 2 and handle.offsets[-1] - handle.offsets[0] == 3000
+    result = received_object(handle)
+    assert result["name"] == "table"
+    assert bytes(result["block"].data) == b"abc" * 1000
+    assert shared_result_stats()["segments"] == 0
+
+@pytest.mark.skipif(not transfer._SHM_DIR.is_dir(), reason="segments cannot be listed on this system")
+def test_segments_never_received_are_unlinked_at_pool_shutdown():
+    pool = TrackedProcessPoolExecutor(1)
+    with pytest.raises(RuntimeError):
+        pool.submit(share_and_fail, 2 * transfer.SHARED_RESULT_MIN_BYTES).result()
+    assert list(transfer._SHM_DIR.glob(f"{pool.segment_prefix}*"))
+    pool.shutdown()
+    assert not list(transfer._SHM_DIR.glob(f"{pool.segment_prefix}*"))